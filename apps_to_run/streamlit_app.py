@@ -3,24 +3,23 @@ import time
 
 import streamlit as st
 
-from simple_agent.chat_orchestration import ChatbotOrchestrator
-from format_streamlit_responses.job_listing_format import display_jobs_interactive
-from utils.feature_extractor.extract_job_details import JobRequirementsExtractor
-from utils.llm_client.llm_interaction import LLMInteraction
-from utils.locanto_scraper.locanto_scraper import LocantoScraper
-from utils.resume_extractor.resume_parser import CVParser
-from utils.vector_storage.qdrant_storage import QdrantStorage
+from simple_agent.chat_orchestration import BatchGapAnalysis, JobSearchInProgress
+from simple_agent.config.config import scrape_poll_seconds
+from simple_agent.shared_resources import SharedResources
+from format_streamlit_responses.job_listing_format import (
+    display_jobs_interactive,
+    display_fit_table,
+)
+
+
+@st.cache_resource
+def load_shared_resources() -> SharedResources:
+    """Models and clients are loaded once per process and shared by all sessions"""
+    return SharedResources.load()
 
 
 class JobChatApp:
-    def __init__(
-        self,
-        feature_extractor_rqmt: JobRequirementsExtractor,
-        vector_storage_rqmt: QdrantStorage,
-        llm_client_rqmt: LLMInteraction,
-        scraper_rqmt: LocantoScraper,
-        resume_parser_rqmt: CVParser,
-    ):
+    def __init__(self, shared_resources: SharedResources):
         """Initialize app state and chatbot."""
         if "messages" not in st.session_state:
             st.session_state.messages = []
@@ -33,23 +32,11 @@ class JobChatApp:
 
         if "resume_text" not in st.session_state:
             st.session_state.resume_text = None
-        self.feature_extractor = feature_extractor_rqmt
-        self.vector_storage = vector_storage_rqmt
-        self.llm_client = llm_client_rqmt
-        self.resume_parser = resume_parser_rqmt
-        self.scraper = scraper_rqmt
-        self.agent = self.init_agent()
-
-    @st.cache_resource
-    def init_agent(_self):
-        """Create and cache chatbot agent."""
-        return ChatbotOrchestrator(
-            feature_extractor=_self.feature_extractor,
-            vector_storage=_self.vector_storage,
-            llm_client=_self.llm_client,
-            scraper=_self.scraper,
-            resume_parser=_self.resume_parser,
-        )
+
+        # each browser session gets its own conversation state
+        if "agent" not in st.session_state:
+            st.session_state.agent = shared_resources.new_session()
+        self.agent = st.session_state.agent
 
     def sidebar(self):
         """Sidebar for uploading resume."""
@@ -89,8 +76,16 @@ class JobChatApp:
         for message in st.session_state.messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
-                if "jobs_data" in message:
+                if "job_search" in message:
+                    self.display_job_search_progress(message)
+                elif "jobs_data" in message:
                     display_jobs_interactive(message["jobs_data"])
+                if message.get("job_search_failed"):
+                    st.warning(
+                        "The job search stopped early, showing the jobs found so far."
+                    )
+                if "fit_table" in message:
+                    display_fit_table(message["fit_table"])
 
     def handle_user_input(self, prompt: str):
         """Process user input and generate response."""
@@ -101,9 +96,32 @@ class JobChatApp:
 
         # Process input
         with st.chat_message("assistant"):
-            response = self.agent.start_chat(prompt)
+            response = self.agent.start_chat(prompt, stream=True)
 
-            if isinstance(response, list):
+            if isinstance(response, JobSearchInProgress):
+                text_response = "Here are the latest jobs posted in the past week, new ones are added as they are found:"
+                st.markdown(text_response)
+                # stored before the crawl finishes, so a new message cannot lose the reply
+                message = {
+                    "role": "assistant",
+                    "content": text_response,
+                    "jobs_data": response.jobs(),
+                    "job_search": response,
+                }
+                st.session_state.messages.append(message)
+                self.display_job_search_progress(message)
+            elif isinstance(response, BatchGapAnalysis):
+                text_response = f"Here is how your resume compares with the top {response.total} matching jobs:"
+                st.markdown(text_response)
+                fit_rows = self.display_batch_gap_analysis(response)
+                st.session_state.messages.append(
+                    {
+                        "role": "assistant",
+                        "content": text_response,
+                        "fit_table": fit_rows,
+                    }
+                )
+            elif isinstance(response, list):
                 text_response = (
                     "Here are jobs filtered based on your resume:"
                     if st.session_state.resume_ready and st.session_state.resume_text
@@ -122,11 +140,58 @@ class JobChatApp:
                     st.markdown(
                         "👉 If you upload your resume, I can filter and show you jobs that best match your skills and experience."
                     )
-            else:
+            elif isinstance(response, str) or response is None:
                 st.markdown(response)
                 st.session_state.messages.append(
                     {"role": "assistant", "content": response}
                 )
+            else:
+                streamed_response = st.write_stream(response)
+                st.session_state.messages.append(
+                    {"role": "assistant", "content": streamed_response}
+                )
+
+    @staticmethod
+    @st.fragment(run_every=scrape_poll_seconds)
+    def display_job_search_progress(message: dict):
+        """Redraws the job table of a message as the background crawl parses new
+        listings. Runs as a fragment on a timer, so the script is never blocked, until
+        the crawl is done and the whole app reruns to draw the final table once."""
+        job_search = message.get("job_search")
+        if job_search is None:
+            display_jobs_interactive(message["jobs_data"])
+            return
+        progress = job_search.progress
+        crawl_done = progress.done
+        message["jobs_data"] = job_search.jobs()
+        if crawl_done:
+            del message["job_search"]
+            if progress.error:
+                message["job_search_failed"] = True
+            # the chat history no longer draws this fragment, which stops its timer
+            st.rerun()
+        display_jobs_interactive(message["jobs_data"])
+        st.progress(
+            progress.fraction,
+            text=f"Checked {progress.ads_parsed} of {progress.ads_found} new listings",
+        )
+
+    @staticmethod
+    def display_batch_gap_analysis(batch: BatchGapAnalysis) -> list[dict]:
+        """Redraws the ranked fit table as each job's analysis finishes"""
+        fit_table = st.empty()
+        progress_bar = st.progress(0.0, text=f"Analysing {batch.total} jobs...")
+        fit_rows = []
+        for row in batch.rows:
+            fit_rows.append(row)
+            with fit_table.container():
+                display_fit_table(fit_rows)
+            progress_bar.progress(
+                len(fit_rows) / batch.total,
+                text=f"Analysed {len(fit_rows)} of {batch.total} jobs",
+            )
+        progress_bar.empty()
+        return fit_rows
 
     def run(self):
         """Main entry point for the app."""
@@ -140,16 +205,5 @@ class JobChatApp:
 
 
 if __name__ == "__main__":
-    feature_extractor = JobRequirementsExtractor()
-    vector_storage = QdrantStorage()
-    llm_client = LLMInteraction()
-    scraper = LocantoScraper()
-    resume_parser = CVParser()
-    app = JobChatApp(
-        feature_extractor_rqmt=feature_extractor,
-        vector_storage_rqmt=vector_storage,
-        llm_client_rqmt=llm_client,
-        scraper_rqmt=scraper,
-        resume_parser_rqmt=resume_parser,
-    )
+    app = JobChatApp(shared_resources=load_shared_resources())
     app.run()
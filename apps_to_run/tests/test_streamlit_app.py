@@ -0,0 +1,59 @@
+from streamlit.testing.v1 import AppTest
+
+from simple_agent.chat_orchestration import JobSearchInProgress
+from utils.locanto_scraper.locanto_scraper import ScrapeProgress
+
+JOB = {
+    "job_position": "nurse",
+    "url": "https://jobs/1",
+    "company_name": "Acme",
+    "posted_date": "today",
+}
+
+
+def chat_history_script():
+    from types import SimpleNamespace
+
+    from apps_to_run.streamlit_app import JobChatApp
+
+    JobChatApp(
+        shared_resources=SimpleNamespace(new_session=lambda: None)
+    ).display_chat_history()
+
+
+def run_chat_history(job_search: JobSearchInProgress) -> tuple[AppTest, dict]:
+    message = {
+        "role": "assistant",
+        "content": "Here are the latest jobs",
+        "jobs_data": [],
+        "job_search": job_search,
+    }
+    app = AppTest.from_function(chat_history_script)
+    app.session_state["messages"] = [message]
+    app.run()
+    return app, message
+
+
+def test_job_search_keeps_polling_while_the_crawl_runs():
+    progress = ScrapeProgress()
+    progress.add_ads(2)
+    app, message = run_chat_history(JobSearchInProgress([JOB], progress))
+    assert "job_search" in message
+    assert message["jobs_data"] == [JOB]
+    assert app.get("progress")
+
+
+def test_finished_crawl_stops_polling_and_draws_its_final_table():
+    progress = ScrapeProgress()
+    progress.add_listing({**JOB, "url": "https://jobs/2"})
+    progress.finish(error="blocked")
+    app, message = run_chat_history(JobSearchInProgress([JOB], progress))
+    assert "job_search" not in message
+    assert [job["url"] for job in message["jobs_data"]] == [
+        "https://jobs/1",
+        "https://jobs/2",
+    ]
+    assert not app.get("progress")
+    assert [warning.value for warning in app.warning] == [
+        "The job search stopped early, showing the jobs found so far."
+    ]
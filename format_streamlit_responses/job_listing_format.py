@@ -39,3 +39,45 @@ def display_jobs_interactive(jobs_list: list[dict]):
             ),
         },
     )
+
+
+def display_fit_table(fit_rows: list[dict]):
+    """
+    Display gap analyses of several jobs as a table ranked by fit, with the analyses below
+    """
+    if not fit_rows:
+        st.warning("No jobs to compare")
+        return
+
+    ranked_rows = sorted(
+        fit_rows, key=lambda row: (-row["fit_score"], row.get("match_rank", 0))
+    )
+    display_df = pd.DataFrame(
+        {
+            "Job Position": [row["job_position"] for row in ranked_rows],
+            "Company Name": [row["company_name"] for row in ranked_rows],
+            "Fit": [row["fit_score"] for row in ranked_rows],
+            "Missing Skills": [
+                ", ".join(row["missing_skills"]) or "-" for row in ranked_rows
+            ],
+            "Apply Link": [row["url"] for row in ranked_rows],
+        }
+    )
+
+    st.markdown("#### Fit Against Your Resume")
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Fit": st.column_config.ProgressColumn(
+                "Fit", min_value=0.0, max_value=1.0, format="%.2f"
+            ),
+            "Apply Link": st.column_config.LinkColumn(
+                "Apply", width="small", display_text="View Job"
+            ),
+        },
+    )
+    for row in ranked_rows:
+        with st.expander(f"{row['job_position']} - {row['company_name']}"):
+            st.markdown(row["gap_analysis"])
@@ -12,3 +12,18 @@ Hi there! I'd love to help you find the perfect job opportunities,
   Once I have your resume, I'll be able to match you with suitable positions based on your skills and experience! 📄✨"""
 
 default_response_for_gap_analysis = "Sorry, I couldn’t find the job you’re looking for. Could you please share the exact link to the job page?"
+
+default_response_for_scrape_in_progress = (
+    "I'm already searching for {job_position} jobs in {location}. "
+    "Ask me again in a minute and I'll show you what I've found."
+)
+
+default_response_for_no_recent_jobs = (
+    "I couldn't find recent {job_position} jobs in {location}. Listings from the last search "
+    "may still be indexing, try again shortly or search for a different job or location."
+)
+
+default_response_for_no_resume_matches = (
+    "I couldn't find recent jobs matching your resume yet. Try searching for a job title and location first, "
+    "and I'll rank the results against your skills."
+)
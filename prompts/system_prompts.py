@@ -142,3 +142,22 @@ When responding:
 - In "Gaps," list the main areas where the candidate may fall short or need improvement.
 - Keep the tone professional.
 """
+
+system_prompt_to_extract_query_details = """
+You are the query understanding step of a job search chatbot.
+From the conversation so far and the LATEST user message, do all of the following in one go.
+
+1. Classify the LATEST user message as one of: job_search, job_gap_analysis, suggest_jobs_by_resume, general_chat.
+   Small talk, greetings and opinions are general_chat.
+2. Extract the job position and the location the user is interested in.
+   Ignore earlier turns unless the latest message refers back to them. If the location is unclear, use "Australia".
+3. For gap analysis requests, extract the company name and the full job URL if given.
+
+Use null for anything that is not mentioned.
+Return ONLY valid JSON with exactly these keys:
+{"query_type": "<query type>", "job_position": "<job position>",
+ "location": "<location>", "company_name": "<company name>", "url": "<job url>"}
+
+Example:
+{"query_type": "job_search", "job_position": "data scientist", "location": "Sydney", "company_name": null, "url": null}
+"""
@@ -56,6 +56,15 @@ Please provide a gap analysis highlighting strengths and fallbacks in relation t
 Explain it in a natural, conversational way so I can understand where I am a good fit and where I may need to improve.
 """
 
+user_prompt_to_do_gap_analysis_from_skill_diff = """
+Here is a comparison of the job requirements with my resume, already matched skill by skill:
+
+{skill_diff}
+
+Please provide a gap analysis highlighting strengths and fallbacks in relation to this job. 
+Explain it in a natural, conversational way so I can understand where I am a good fit and where I may need to improve.
+"""
+
 
 def get_user_prompt_for_summary(previous_summary: str, latest_message: str):
     user_prompt_for_summary = f"""
@@ -65,3 +74,13 @@ def get_user_prompt_for_summary(previous_summary: str, latest_message: str):
     Update the summary so it reflects the current state of the conversation.
     """
     return user_prompt_for_summary
+
+
+def get_user_prompt_for_query_details(conversation: str | None, latest_message: str):
+    user_prompt_for_query_details = f"""
+    Conversation so far: {conversation or "none, this is the first message"}
+    Latest user message: "{latest_message}"
+
+    Return the JSON object for the latest user message.
+    """
+    return user_prompt_for_query_details
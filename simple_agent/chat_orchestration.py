@@ -1,5 +1,8 @@
 import logging
-from typing import Dict, List, Any, BinaryIO
+import time
+import uuid
+from typing import Dict, List, Any, BinaryIO, Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from enum import Enum
 
@@ -9,29 +12,64 @@ from prompts.default_prompt_responses import (
     default_response_for_feature_not_added,
     default_response_for_resume_not_uploaded,
     default_response_for_gap_analysis,
+    default_response_for_no_resume_matches,
+    default_response_for_scrape_in_progress,
+    default_response_for_no_recent_jobs,
+)
+from simple_agent.conversation_memory import ConversationMemory
+from simple_agent.config.config import (
+    recent_postings,
+    recent_posting_max_age_seconds,
+    keys_to_display_jobs,
+    concurrent_execution,
+    scraped_jobs_ttl_seconds,
+    scraped_jobs_limit,
+    background_scraping,
+    shared_step_workers,
+    shared_scrape_workers,
+    resume_recommendation_candidates,
+    resume_recommendations_to_show,
+    skill_overlap_weight,
+    nationwide_locations,
+    batch_gap_analysis,
+    gap_analysis_top_n,
+    gap_analysis_max_concurrency,
 )
-from simple_agent.config.config import recent_postings, keys_to_display_jobs
 from prompts.system_prompts import (
     system_prompt_to_identify_query_type,
     system_prompt_to_identify_job,
     system_prompt_to_identify_location,
-    system_prompt_to_summarise_queries,
     system_prompt_to_extract_job_details_for_gap_analysis,
     system_prompt_to_do_gap_analysis,
+    system_prompt_to_extract_query_details,
 )
 from prompts.user_prompts import (
     user_prompt_to_identify_query_type,
     user_prompt_to_identify_job,
     user_prompt_to_identify_location,
-    get_user_prompt_for_summary,
     user_prompt_to_extract_job_details_for_gap_analysis,
     user_prompt_to_do_gap_analysis,
+    user_prompt_to_do_gap_analysis_from_skill_diff,
+    get_user_prompt_for_query_details,
 )
 from utils.feature_extractor.extract_job_details import JobRequirementsExtractor
+from utils.gap_analysis.skill_diff import (
+    GapAnalysisCache,
+    SkillDiff,
+    compute_skill_diff,
+    resume_hash,
+)
+from utils.intent_classifier.intent_classifier import IntentClassifier
 from utils.llm_client.llm_interaction import LLMInteraction
 from utils.locanto_scraper.config import DEFAULT_LOCATION, DEFAULT_JOB_TO_SEARCH
-from utils.locanto_scraper.locanto_scraper import LocantoScraper
+from utils.locanto_scraper.locanto_scraper import LocantoScraper, ScrapeProgress
+from utils.locanto_scraper.scrape_history import ScrapeHistory
 from utils.resume_extractor.resume_parser import CVParser
+from utils.skill_vocabulary.config import SKILL_IDS_KEY
+from utils.skill_vocabulary.skill_vocabulary import (
+    SkillVocabulary,
+    skill_overlap_score,
+)
 from utils.vector_storage.qdrant_storage import QdrantStorage
 
 
@@ -39,6 +77,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+RESUME_COLLECTION = "resumes_extracted"
+
+
 class EnumeratedQueryType(Enum):
     JOB_SEARCH = "job_search"
     JOB_GAP_ANALYSIS = "job_gap_analysis"
@@ -65,6 +106,51 @@ class JobData:
     salary_range: str = None
 
 
+@dataclass
+class QueryDetails:
+    summary: str
+    query_type: str
+    job_position: str | None = None
+    location: str | None = None
+    company_name: str | None = None
+    url: str | None = None
+
+    def gap_analysis_filters(self) -> dict:
+        return {
+            "job_position": self.job_position,
+            "company_name": self.company_name,
+            "suburb": self.location,
+            "url": self.url,
+        }
+
+
+@dataclass
+class JobSearchInProgress:
+    """Jobs already in the index, plus the listings of a crawl still running on a worker"""
+
+    indexed_jobs: list
+    progress: ScrapeProgress
+
+    def jobs(self) -> list:
+        urls_shown = {job["url"] for job in self.indexed_jobs}
+        scraped_jobs = [
+            job
+            for job in ChatbotOrchestrator.format_jobs_to_display(
+                job_listings=self.progress.listings()
+            )
+            if job["url"] not in urls_shown
+        ]
+        return self.indexed_jobs + scraped_jobs
+
+
+@dataclass
+class BatchGapAnalysis:
+    """Gap analyses of the resume against several jobs, rows are yielded as they finish"""
+
+    rows: Iterator[dict]
+    total: int
+
+
 class ChatbotOrchestrator:
     def __init__(
         self,
@@ -73,29 +159,71 @@ class ChatbotOrchestrator:
         vector_storage: QdrantStorage,
         llm_client: LLMInteraction,
         resume_parser: CVParser,
+        concurrent: bool = concurrent_execution,
+        scraped_jobs_ttl: float = scraped_jobs_ttl_seconds,
+        scrape_in_background: bool = background_scraping,
+        intent_classifier: IntentClassifier | None = None,
+        executor: ThreadPoolExecutor | None = None,
+        scrape_executor: ThreadPoolExecutor | None = None,
+        gap_analysis_cache: GapAnalysisCache | None = None,
+        batch_gap_analyses: bool = batch_gap_analysis,
+        scrape_history: ScrapeHistory | None = None,
     ):
+        """Holds the conversation state of one chat session. Models, clients and
+        executors are shared between sessions, see SharedResources."""
         self.scraper = scraper
         self.feature_extractor = feature_extractor
         self.vector_storage = vector_storage
         self.llm_client = llm_client
-        self.scraped_jobs_history = {}
+        # shared with every other session and process scraping on this host
+        self.scrape_history = scrape_history or ScrapeHistory()
+        self.scraped_jobs_ttl = scraped_jobs_ttl
+        self.scrape_in_background = scrape_in_background
         self.resume_parser = resume_parser
-        self.user_query_summary = None
         self.location = None
         self.job_position = None
-
-    def start_chat(self, user_message: str) -> str | None:
-        """"""
-        user_query = self.summarise_user_query(user_query=f"user_query:{user_message}")
-
-        query_type = self.identify_user_query_type(user_query)
+        self.concurrent = concurrent
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=shared_step_workers, thread_name_prefix="orchestrator-step"
+        )
+        self.scrape_executor = scrape_executor or ThreadPoolExecutor(
+            max_workers=shared_scrape_workers, thread_name_prefix="orchestrator-scrape"
+        )
+        self.intent_classifier = intent_classifier
+        self.memory = ConversationMemory(
+            llm_client=self.llm_client, executor=self.executor
+        )
+        self.resume_point_id = None
+        self.resume_point = None
+        self.resume_details = None
+        self.skill_vocabulary = SkillVocabulary()
+        self.gap_analysis_cache = gap_analysis_cache or GapAnalysisCache()
+        self.batch_gap_analyses = batch_gap_analyses
+
+    @property
+    def user_query_summary(self) -> str | None:
+        """Conversation so far: a compacted summary followed by the recent messages"""
+        return self.memory.text
+
+    def start_chat(
+        self, user_message: str, stream: bool = False
+    ) -> str | list | Iterator[str] | JobSearchInProgress | None:
+        """Answers a user message. With stream=True, long text answers such as the
+        gap analysis are returned as an iterator of text chunks. New job searches
+        scraped in the background are returned as a JobSearchInProgress."""
+        query_details = self.classify_locally(
+            user_message=user_message
+        ) or self.extract_query_details(user_message=user_message)
+        user_query = query_details.summary
+        query_type = query_details.query_type
 
         if EnumeratedQueryType(query_type) in [
             EnumeratedQueryType.JOB_SEARCH,
             EnumeratedQueryType.SUGGEST_JOBS_BY_RESUME,
         ]:
-            self.location = self.identify_location(user_query)
-            self.job_position = self.identify_job_name(user_query)
+            self.location, self.job_position = self.identify_location_and_job(
+                query_details=query_details
+            )
             scraping_done = self.job_already_scraped(
                 job_position=self.job_position, location=self.location
             )
@@ -105,11 +233,17 @@ class ChatbotOrchestrator:
                 == EnumeratedQueryType.SUGGEST_JOBS_BY_RESUME
             ):
                 return self.handle_resume_queries(
-                    user_query=user_query, query_type=query_type
+                    user_query=user_query,
+                    query_type=query_type,
+                    location=self.location,
                 )
 
             if scraping_done:
-                return "Already scraped and displayed"  # Implement functionality to retrieve jobs from qdrant
+                scraped_jobs = self.retrieve_scraped_jobs(
+                    job_position=self.job_position, location=self.location
+                )
+                if scraped_jobs:
+                    return scraped_jobs
             job_search_update = self.scrape_jobs_and_save_them(
                 job_position=self.job_position, location=self.location
             )
@@ -120,10 +254,74 @@ class ChatbotOrchestrator:
             return general_chat
         if EnumeratedQueryType(query_type) == EnumeratedQueryType.JOB_GAP_ANALYSIS:
             return self.handle_resume_queries(
-                user_query=user_query, query_type=query_type
+                user_query=user_query,
+                query_type=query_type,
+                stream=stream,
+                job_key_details=query_details.gap_analysis_filters(),
             )
         return default_response_for_feature_not_added
 
+    def classify_locally(self, user_message: str) -> QueryDetails | None:
+        """Greetings are answered from the local intent classifier without any LLM call.
+        Every other query type needs its slots, which the combined LLM call extracts
+        together with the query type, so those return None."""
+        if self.intent_classifier is None:
+            return None
+        query_type = self.intent_classifier.classify(user_message)
+        if query_type != EnumeratedQueryType.GENERAL_CHAT.value:
+            return None
+        summary = self.summarise_user_query(user_query=f"user_query:{user_message}")
+        return QueryDetails(summary=summary, query_type=query_type)
+
+    def extract_query_details(self, user_message: str) -> QueryDetails:
+        """Records the message and extracts query type, job, location and gap analysis
+        keys in a single LLM call. Missing fields fall back to the single purpose prompts.
+        The summary is the conversation memory, which the LLM does not rewrite."""
+        try:
+            details = self.llm_client.ask_llm(
+                system_prompt=system_prompt_to_extract_query_details,
+                user_prompt=get_user_prompt_for_query_details(
+                    conversation=self.user_query_summary,
+                    latest_message=user_message,
+                ),
+                prompt_name="extract_query_details",
+            )
+        except Exception as e:
+            logging.warning(f"Combined query extraction failed: {e}")
+            details = {}
+        if not isinstance(details, dict):
+            details = {}
+
+        summary = self.summarise_user_query(user_query=f"user_query:{user_message}")
+        query_type = clean_slot(details.get("query_type"))
+        if query_type not in [query_type.value for query_type in EnumeratedQueryType]:
+            query_type = self.identify_user_query_type(summary)
+        return QueryDetails(
+            summary=summary,
+            query_type=query_type,
+            job_position=clean_slot(details.get("job_position")),
+            location=clean_slot(details.get("location")),
+            company_name=clean_slot(details.get("company_name")),
+            url=clean_slot(details.get("url")),
+        )
+
+    def identify_location_and_job(self, query_details: QueryDetails) -> tuple[str, str]:
+        """Fills in the location and job position missing from the combined query call.
+        Both only depend on the summary, so in concurrent mode they are asked in parallel.
+        """
+        location, job_position = query_details.location, query_details.job_position
+        if self.concurrent and location is None and job_position is None:
+            location_future = self.executor.submit(
+                self.identify_location, query_details.summary
+            )
+            job_position_future = self.executor.submit(
+                self.identify_job_name, query_details.summary
+            )
+            return location_future.result(), job_position_future.result()
+        location = location or self.identify_location(query_details.summary)
+        job_position = job_position or self.identify_job_name(query_details.summary)
+        return location, job_position
+
     def identify_user_query_type(self, user_query: str):
         """ "Identifies user query type - if user wants to scrape jobs
         or wants to retrieve details of the job or a general chat"""
@@ -134,6 +332,7 @@ class ChatbotOrchestrator:
             system_prompt=system_prompt_to_identify_query_type,
             user_prompt=user_prompt,
             json_key="query_type",
+            prompt_name="identify_query_type",
         )
         return query_type
 
@@ -147,6 +346,7 @@ class ChatbotOrchestrator:
                 system_prompt=system_prompt_to_identify_job,
                 user_prompt=user_prompt,
                 json_key="job_position",
+                prompt_name="identify_job_name",
             )
         except:
             return DEFAULT_JOB_TO_SEARCH
@@ -161,6 +361,7 @@ class ChatbotOrchestrator:
                 system_prompt=system_prompt_to_identify_location,
                 user_prompt=user_prompt,
                 json_key="location",
+                prompt_name="identify_location",
             )
         except:
             location = DEFAULT_LOCATION
@@ -171,12 +372,34 @@ class ChatbotOrchestrator:
         job_position: str,
         location: str,
     ) -> Any:
-        """Identify the job details, and scrape them."""
-        logging.info("Extracting location and job details")
-        self.update_scraped_history(job_position=job_position, location=location)
+        """Scrapes the search, unless another session or process is already scraping
+        it or scraped it within scraped_jobs_ttl"""
+        if not self.scrape_history.claim_stale(
+            job_position=job_position,
+            location=location,
+            ttl_seconds=self.scraped_jobs_ttl,
+        ):
+            return self.search_already_claimed(
+                job_position=job_position, location=location
+            )
+        if self.scrape_in_background:
+            return self.start_background_scrape(
+                job_position=job_position, location=location
+            )
         self.scraper.job_to_search = job_position
         self.scraper.location = location
-        self.scraper.scrape()
+        try:
+            self.scraper.scrape()
+        except Exception:
+            self.scrape_history.release_claim(
+                job_position=job_position, location=location
+            )
+            raise
+        self.scrape_history.record_result_count(
+            job_position=job_position,
+            location=location,
+            result_count=len(self.scraper.job_listings),
+        )
         display_job_list = self.retrieve_latest_jobs()
         self.summarise_user_query(
             user_query=f"computer response: The user previously requested jobs for '{self.scraper.job_to_search}' in"
@@ -184,46 +407,154 @@ class ChatbotOrchestrator:
         )
         return display_job_list
 
+    def start_background_scrape(
+        self, job_position: str, location: str
+    ) -> JobSearchInProgress:
+        """Starts the crawl on a worker and returns at once with the matching jobs
+        already in the index. The UI adds new listings as the crawl parses them."""
+        progress = ScrapeProgress()
+        self.scrape_executor.submit(
+            self.scrape_on_worker,
+            job_position=job_position,
+            location=location,
+            progress=progress,
+        )
+        indexed_jobs = self.retrieve_indexed_jobs(
+            job_position=job_position, location=location
+        )
+        self.summarise_user_query(
+            user_query=f"computer response: The user previously requested jobs for '{job_position}' in"
+            f" '{location}', and the results are being retrieved and shown."
+        )
+        return JobSearchInProgress(
+            indexed_jobs=self.format_jobs_to_display(job_listings=indexed_jobs),
+            progress=progress,
+        )
+
+    def search_already_claimed(self, job_position: str, location: str) -> str:
+        """Answers a search another crawl is running for, or that was scraped within
+        scraped_jobs_ttl without recent jobs to show"""
+        record = self.scrape_history.last_scrape(
+            job_position=job_position, location=location
+        )
+        if record is not None and record.result_count is None:
+            response = default_response_for_scrape_in_progress
+            outcome = "another search for them is still running"
+        else:
+            response = default_response_for_no_recent_jobs
+            outcome = "no recent jobs were found"
+        self.summarise_user_query(
+            user_query=f"computer response: The user requested jobs for '{job_position}' in"
+            f" '{location}', and {outcome}."
+        )
+        return response.format(job_position=job_position, location=location)
+
     def retrieve_latest_jobs(self) -> list:
+        return self.format_jobs_to_display(job_listings=self.scraper.job_listings)
+
+    @staticmethod
+    def format_jobs_to_display(job_listings: list[dict]) -> list:
         job_list_to_display = [
             {key: item[key] for key in keys_to_display_jobs}
-            for item in self.scraper.job_listings
+            for item in job_listings
             if item.get("posted_date", "No date").strip() in recent_postings
         ]
         return job_list_to_display
 
-    def summarise_user_query(self, user_query: str) -> str:
-        if self.user_query_summary is None:
-            self.user_query_summary = user_query
-            return user_query
-        self.user_query_summary = self.llm_client.ask_llm(
-            system_prompt=system_prompt_to_summarise_queries,
-            user_prompt=get_user_prompt_for_summary(
-                previous_summary=self.user_query_summary, latest_message=user_query
-            ),
-            response_type="text",
+    def retrieve_scraped_jobs(self, job_position: str, location: str) -> list:
+        """Serves a previously scraped search from qdrant, re-scraping it in the
+        background when it is older than scraped_jobs_ttl"""
+        job_listings = self.retrieve_indexed_jobs(
+            job_position=job_position, location=location
         )
-        return self.user_query_summary
+        if not job_listings:
+            return []
+        scraped_at = self.scraped_at(job_position=job_position, location=location)
+        if (
+            scraped_at is not None
+            and time.time() - scraped_at > self.scraped_jobs_ttl
+            # another session or process may already be re-scraping this search
+            and self.scrape_history.claim_stale(
+                job_position=job_position,
+                location=location,
+                ttl_seconds=self.scraped_jobs_ttl,
+            )
+        ):
+            self.scrape_executor.submit(
+                self.scrape_on_worker, job_position=job_position, location=location
+            )
+        self.summarise_user_query(
+            user_query=f"computer response: The user requested jobs for '{job_position}' in"
+            f" '{location}' again, and the previously scraped results have been shown."
+        )
+        return self.format_jobs_to_display(job_listings=job_listings)
 
-    def update_scraped_history(self, job_position: str, location: str):
-        """Keeps track of scraped jobs and locations"""
-        job_position = job_position.lower().replace(" ", "_")
-        location = location.lower().replace(" ", "_")
+    def retrieve_indexed_jobs(self, job_position: str, location: str) -> list[dict]:
+        """Recent jobs matching the search, newest first. Recency is filtered by
+        qdrant on the posted_at timestamp, so the limit is not used up by old postings.
+        """
+        try:
+            return self.vector_storage.retrieve_payloads_based_on_text_match(
+                collection_name=PARSED_JOB_TOPIC,
+                text_filters={"job_position": job_position},
+                query_filter=self.vector_storage.create_location_and_recency_filter(
+                    location=suburb_to_match(location),
+                    max_age_seconds=recent_posting_max_age_seconds,
+                ),
+                order_by="posted_at",
+                limit=scraped_jobs_limit,
+            )
+        except Exception as e:
+            logging.warning(f"Could not retrieve scraped jobs from qdrant: {e}")
+            return []
+
+    def scrape_on_worker(
+        self,
+        job_position: str,
+        location: str,
+        progress: ScrapeProgress | None = None,
+    ):
+        """Scrapes with its own scraper, so background crawls never race each other
+        or the scraper used to answer the user"""
+        try:
+            scraper = LocantoScraper(
+                job_to_search=job_position,
+                location=location,
+                bootstrap_servers=self.scraper.bootstrap_servers,
+            )
+            scraper.scrape(progress=progress)
+            if progress is not None and progress.error is not None:
+                self.scrape_history.release_claim(
+                    job_position=job_position, location=location
+                )
+                return
+            self.scrape_history.record_result_count(
+                job_position=job_position,
+                location=location,
+                result_count=len(scraper.job_listings),
+            )
+        except Exception as e:
+            logging.warning(f"Background scrape of {job_position} failed: {e}")
+            self.scrape_history.release_claim(
+                job_position=job_position, location=location
+            )
+            if progress is not None:
+                progress.finish(error=str(e))
 
-        if job_position not in self.scraped_jobs_history:
-            self.scraped_jobs_history[job_position] = []
+    def summarise_user_query(self, user_query: str) -> str:
+        """Adds a user query or computer response to the conversation memory"""
+        self.memory.add(user_query)
+        return self.user_query_summary
 
-        if location not in self.scraped_jobs_history[job_position]:
-            self.scraped_jobs_history[job_position].append(location)
+    def scraped_at(self, job_position: str, location: str) -> float | None:
+        record = self.scrape_history.last_scrape(
+            job_position=job_position, location=location
+        )
+        return record.scraped_at if record else None
 
     def job_already_scraped(self, job_position: str, location: str) -> bool:
         try:
-            job_position = job_position.lower().replace(" ", "_")
-            location = location.lower().replace(" ", "_")
-            jobs_scraped = (
-                job_position in self.scraped_jobs_history
-                and location in self.scraped_jobs_history[job_position]
-            )
+            jobs_scraped = self.scraped_at(job_position, location) is not None
         except:
             jobs_scraped = False
         return jobs_scraped
@@ -232,60 +563,99 @@ class ChatbotOrchestrator:
         """Extracts key skills and experience from the resume"""
         self.resume_parser.parse_resume(resume)
         resume_dict = self.resume_parser.extract_resume_details()
-        resume_collection_name = "resumes_extracted"
+        self.resume_details = resume_dict or None
         self.vector_storage.create_collection(
-            collection_name=resume_collection_name, create_indexes=False
+            collection_name=RESUME_COLLECTION, create_indexes=False
         )
+        self.resume_point_id = str(uuid.uuid4())
+        self.resume_point = None
         self.vector_storage.upload_points(
             points=[resume_dict],
             key_to_encode="RAW_TEXT",
-            collection_name=resume_collection_name,
+            collection_name=RESUME_COLLECTION,
+            given_ids=[self.resume_point_id],
         )
 
     def handle_resume_queries(
         self,
         query_type: str,
         user_query: str,
-    ) -> str:
+        stream: bool = False,
+        job_key_details: dict | None = None,
+        location: str | None = None,
+    ) -> str | list | Iterator[str]:
         """Job gap analysis and suggestions based on resume is handled here"""
         if not self.resume_parser.resume_uploaded:
             return default_response_for_resume_not_uploaded
         if EnumeratedQueryType(query_type) == EnumeratedQueryType.JOB_GAP_ANALYSIS:
-            return self.job_gap_analysis(user_query=user_query)
+            return self.job_gap_analysis(
+                user_query=user_query, stream=stream, job_key_details=job_key_details
+            )
         if (
             EnumeratedQueryType(query_type)
             == EnumeratedQueryType.SUGGEST_JOBS_BY_RESUME
         ):
-
-            return "WIP"
+            suggested_jobs = self.suggest_jobs_by_resume(location=location)
+            if not suggested_jobs:
+                return default_response_for_no_resume_matches
+            self.summarise_user_query(
+                user_query="computer response: Jobs matching the user's resume"
+                f" in '{location}' have been retrieved and shown."
+            )
+            return suggested_jobs
         self.summarise_user_query(
             user_query="computer response: The user previously requested a resume-related feature, "
             "but it has not been implemented yet."
         )
         return default_response_for_feature_not_added
 
-    def job_gap_analysis(self, user_query: str) -> str:
-
-        user_prompt = (
-            f"{user_prompt_to_extract_job_details_for_gap_analysis} {user_query}"
+    def job_gap_analysis(
+        self,
+        user_query: str,
+        stream: bool = False,
+        job_key_details: dict | None = None,
+    ) -> str | Iterator[str] | BatchGapAnalysis:
+        """job_key_details already extracted by the combined query call are used
+        when they identify the job, otherwise they are extracted here. A job title
+        without company or url is analysed against the top matching jobs."""
+        identifies_job = job_key_details and any(
+            job_key_details.get(key) for key in ["job_position", "company_name", "url"]
         )
-        job_key_details = self.llm_client.ask_llm(
-            system_prompt=system_prompt_to_extract_job_details_for_gap_analysis,
-            user_prompt=user_prompt,
+        if not identifies_job:
+            user_prompt = (
+                f"{user_prompt_to_extract_job_details_for_gap_analysis} {user_query}"
+            )
+            job_key_details = self.llm_client.ask_llm(
+                system_prompt=system_prompt_to_extract_job_details_for_gap_analysis,
+                user_prompt=user_prompt,
+                prompt_name="extract_job_details_for_gap_analysis",
+            )
+        names_one_job = job_key_details and (
+            job_key_details.get("url") or job_key_details.get("company_name")
         )
+        if (
+            self.batch_gap_analyses
+            and job_key_details
+            and job_key_details.get("job_position")
+            and not names_one_job
+        ):
+            batch = self.batch_gap_analysis(job_key_details=job_key_details)
+            if batch is not None:
+                return batch
+        job_points = []
         if job_key_details:
-            job_description = (
-                self.vector_storage.retrieve_docs_based_on_keyword_filters(
-                    keyword_filters=job_key_details,
-                    limit=1,
-                    collection_name="parsed_job.topic",
-                )
+            job_points = self.vector_storage.retrieve_points_based_on_keyword_filters(
+                keyword_filters=job_key_details,
+                limit=1,
+                collection_name=PARSED_JOB_TOPIC,
             )
-            gap_analysis = self.llm_gap_analysis(job_description=job_description)
-            self.summarise_user_query(
-                user_query=f"computer response: The user requested a gap analysis of {job_key_details} "
+        if job_points:
+            gap_analysis_done_message = (
+                f"computer response: The user requested a gap analysis of {job_key_details} "
                 "against their resume. The gap analysis was evaluated and shown to the user."
             )
+            gap_analysis = self.llm_gap_analysis(job_point=job_points[0], stream=stream)
+            self.summarise_user_query(user_query=gap_analysis_done_message)
             return gap_analysis
         self.summarise_user_query(
             user_query="computer response: The user asked for a gap analysis between their resume and a job, "
@@ -295,23 +665,196 @@ class ChatbotOrchestrator:
 
     def llm_gap_analysis(
         self,
-        job_description: str,
-    ) -> str:
-        resume = self.resume_parser.resume_in_text
-        user_prompt = user_prompt_to_do_gap_analysis.format(
-            job_description=job_description, resume_text=resume
+        job_point: Any,
+        stream: bool = False,
+        skill_diff: SkillDiff | None = None,
+    ) -> str | Iterator[str]:
+        """Gap analysis of the resume against a stored job. Analyses are cached per
+        resume and job, so a cached one is returned as a string even when streaming."""
+        cache_key = (resume_hash(self.resume_parser.resume_in_text or ""), job_point.id)
+        cached_gap_analysis = self.gap_analysis_cache.get(*cache_key)
+        if cached_gap_analysis is not None:
+            return cached_gap_analysis
+        user_prompt = self.gap_analysis_prompt(
+            job_payload=job_point.payload, skill_diff=skill_diff
         )
-        return self.llm_client.ask_llm(
+        if stream:
+            return self.stream_then(
+                chunks=self.llm_client.stream_llm(
+                    system_prompt=system_prompt_to_do_gap_analysis,
+                    user_prompt=user_prompt,
+                    prompt_name="gap_analysis",
+                ),
+                on_complete=lambda gap_analysis: self.gap_analysis_cache.set(
+                    *cache_key, gap_analysis
+                ),
+            )
+        gap_analysis = self.llm_client.ask_llm(
             system_prompt=system_prompt_to_do_gap_analysis,
             user_prompt=user_prompt,
             response_type="text",
+            prompt_name="gap_analysis",
+        )
+        self.gap_analysis_cache.set(*cache_key, gap_analysis)
+        return gap_analysis
+
+    def batch_gap_analysis(self, job_key_details: dict) -> BatchGapAnalysis | None:
+        """Analyses the gap_analysis_top_n jobs ranked highest by a hybrid search on
+        the job position"""
+        try:
+            job_points = self.vector_storage.retrieve_docs_based_on_query(
+                collection_name=PARSED_JOB_TOPIC,
+                query=job_key_details["job_position"],
+                limit=gap_analysis_top_n,
+            )
+        except Exception as e:
+            logging.warning(f"Could not rank jobs for the gap analysis: {e}")
+            return None
+        if not job_points:
+            return None
+        self.summarise_user_query(
+            user_query=f"computer response: The user requested a gap analysis of their resume against "
+            f"the top {len(job_points)} jobs matching {job_key_details}. A ranked fit table was shown."
+        )
+        return BatchGapAnalysis(
+            rows=self.gap_analysis_rows(job_points=job_points), total=len(job_points)
         )
 
-    def suggest_jobs_by_resume(self):
-        top_n_jobs = self.vector_storage.retrieve_docs_based_on_query(
-            query=self.resume_parser.resume_in_text, collection_name=PARSED_JOB_TOPIC
+    def gap_analysis_rows(self, job_points: list) -> Iterator[dict]:
+        """Analyses the jobs on the shared executor, at most gap_analysis_max_concurrency
+        at a time, yielding each row as soon as it is done"""
+        jobs_to_analyse = list(enumerate(job_points))
+        running = set()
+        while jobs_to_analyse or running:
+            while jobs_to_analyse and len(running) < gap_analysis_max_concurrency:
+                match_rank, job_point = jobs_to_analyse.pop(0)
+                running.add(
+                    self.executor.submit(self.gap_analysis_row, job_point, match_rank)
+                )
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def gap_analysis_row(self, job_point: Any, match_rank: int = 0) -> dict:
+        skill_diff = compute_skill_diff(
+            job_payload=job_point.payload,
+            resume_details=self.resume_details or {},
+            skill_vocabulary=self.skill_vocabulary,
+            resume_text=self.resume_parser.resume_in_text,
+        )
+        try:
+            gap_analysis = self.llm_gap_analysis(
+                job_point=job_point, skill_diff=skill_diff
+            )
+        except Exception as e:
+            logging.warning(f"Gap analysis of job {job_point.id} failed: {e}")
+            gap_analysis = "The gap analysis for this job could not be generated."
+        return {
+            "job_position": job_point.payload.get("job_position"),
+            "company_name": job_point.payload.get("company_name"),
+            "url": job_point.payload.get("url"),
+            "fit_score": round(skill_diff.fit_score, 2),
+            # position in the search ranking, breaks ties between equal fit scores
+            "match_rank": match_rank,
+            "missing_skills": skill_diff.missing_required_skills,
+            "gap_analysis": gap_analysis,
+        }
+
+    def gap_analysis_prompt(
+        self, job_payload: dict, skill_diff: SkillDiff | None = None
+    ) -> str:
+        """The LLM gets a precomputed skill diff with short excerpts instead of the full
+        job description and resume, unless the resume details could not be extracted"""
+        resume = self.resume_parser.resume_in_text
+        if not self.resume_details:
+            return user_prompt_to_do_gap_analysis.format(
+                job_description=job_payload.get("description"), resume_text=resume
+            )
+        if skill_diff is None:
+            skill_diff = compute_skill_diff(
+                job_payload=job_payload,
+                resume_details=self.resume_details,
+                skill_vocabulary=self.skill_vocabulary,
+                resume_text=resume,
+            )
+        return user_prompt_to_do_gap_analysis_from_skill_diff.format(
+            skill_diff=skill_diff.to_prompt_text()
         )
-        for job in top_n_jobs:
-            url = job["url"]
-            job_position = job["job_position"]
-            suburb = job["suburb"]
+
+    @staticmethod
+    def stream_then(
+        chunks: Iterator[str], on_complete: Callable[[str], Any]
+    ) -> Iterator[str]:
+        """Yields a streamed answer, then runs bookkeeping on the full text once the
+        user has seen it"""
+        streamed_chunks = []
+        for chunk in chunks:
+            streamed_chunks.append(chunk)
+            yield chunk
+        on_complete("".join(streamed_chunks))
+
+    def suggest_jobs_by_resume(self, location: str | None = None) -> list:
+        """Hybrid search of recent jobs with the vectors stored for the resume, the
+        candidates reranked by how many of their required skills the resume covers"""
+        resume_point = self.get_resume_point()
+        if resume_point is None:
+            return []
+        try:
+            candidates = self.vector_storage.retrieve_docs_similar_to_point(
+                collection_name=PARSED_JOB_TOPIC,
+                point=resume_point,
+                query_filter=self.vector_storage.create_location_and_recency_filter(
+                    location=suburb_to_match(location),
+                    max_age_seconds=recent_posting_max_age_seconds,
+                ),
+                limit=resume_recommendation_candidates,
+            )
+        except Exception as e:
+            logging.warning(f"Resume based job search failed: {e}")
+            return []
+        if not candidates:
+            return []
+        resume_skill_ids = resume_point.payload.get(SKILL_IDS_KEY, [])
+        best_score = max(candidate.score for candidate in candidates) or 1.0
+
+        def rerank_score(candidate) -> float:
+            overlap = skill_overlap_score(
+                resume_skill_ids, candidate.payload.get(SKILL_IDS_KEY, [])
+            )
+            search_score = candidate.score / best_score
+            return (
+                1 - skill_overlap_weight
+            ) * search_score + skill_overlap_weight * overlap
+
+        ranked_jobs = sorted(candidates, key=rerank_score, reverse=True)
+        return self.format_jobs_to_display(
+            job_listings=[job.payload for job in ranked_jobs]
+        )[:resume_recommendations_to_show]
+
+    def get_resume_point(self):
+        """The stored resume point with its vectors, fetched once per uploaded resume"""
+        if self.resume_point is None and self.resume_point_id is not None:
+            try:
+                self.resume_point = self.vector_storage.retrieve_point(
+                    collection_name=RESUME_COLLECTION, point_id=self.resume_point_id
+                )
+            except Exception as e:
+                logging.warning(f"Could not retrieve the resume vectors: {e}")
+        return self.resume_point
+
+
+def suburb_to_match(location: str | None) -> str | None:
+    """Nationwide locations match jobs in every suburb, so they are not filtered on"""
+    if location and location.lower() in nationwide_locations:
+        return None
+    return location
+
+
+def clean_slot(value: Any) -> str | None:
+    """LLM slots are sometimes "null", "none" or empty strings instead of null"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if not value or value.lower() in ["null", "none", "n/a"]:
+        return None
+    return value
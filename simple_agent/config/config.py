@@ -1,3 +1,34 @@
+import os
+
 recent_postings = ["today", "yesterday", "less than a week ago"]
+# indexed jobs are recent when their posted_at timestamp is at most this old
+recent_posting_max_age_seconds = 7 * 24 * 60 * 60
 keys_to_display_jobs = ["job_position", "url", "company_name", "posted_date"]
 resume_collection = "uploaded_resumes"
+# runs independent LLM steps in parallel
+concurrent_execution = os.getenv("ORCHESTRATOR_CONCURRENT", "true").lower() == "true"
+# previously scraped searches are served from qdrant, and re-scraped in the background once stale
+scraped_jobs_ttl_seconds = int(os.getenv("SCRAPED_JOBS_TTL_SECONDS", str(6 * 60 * 60)))
+scraped_jobs_limit = 50
+# crawls run on a worker while the chat shows already indexed jobs and adds new ones as they are parsed
+background_scraping = (
+    os.getenv("ORCHESTRATOR_BACKGROUND_SCRAPING", "true").lower() == "true"
+)
+scrape_poll_seconds = 0.5
+# worker threads shared by every chat session in the process
+shared_step_workers = 8
+shared_scrape_workers = 4
+# recent messages kept verbatim, older ones are compacted into a summary past the token limit
+memory_max_tokens = 1000
+memory_recent_turns = 6
+# resume recommendations: hybrid search candidates reranked by skill overlap
+resume_recommendation_candidates = 30
+resume_recommendations_to_show = 10
+skill_overlap_weight = 0.5
+nationwide_locations = ["australia"]
+# gap analysis requests naming a job title but no company or url are run against the top matching jobs
+batch_gap_analysis = (
+    os.getenv("ORCHESTRATOR_BATCH_GAP_ANALYSIS", "true").lower() == "true"
+)
+gap_analysis_top_n = 5
+gap_analysis_max_concurrency = 3
@@ -0,0 +1,101 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from prompts.system_prompts import system_prompt_to_summarise_queries
+from prompts.user_prompts import get_user_prompt_for_summary
+from simple_agent.config.config import memory_max_tokens, memory_recent_turns
+from utils.llm_client.config import BACKGROUND_PRIORITY, CHARS_PER_TOKEN
+from utils.llm_client.llm_interaction import LLMInteraction
+
+
+class ConversationMemory:
+    """Rolling conversation memory. Recent messages are kept verbatim, and once they
+    exceed max_tokens the older ones are compacted into a summary by the LLM, in the
+    background so no response waits for it."""
+
+    def __init__(
+        self,
+        llm_client: LLMInteraction,
+        executor: ThreadPoolExecutor,
+        max_tokens: int = memory_max_tokens,
+        recent_turns: int = memory_recent_turns,
+    ):
+        self.llm_client = llm_client
+        self.executor = executor
+        self.max_tokens = max_tokens
+        self.recent_turns = recent_turns
+        self.summary = None
+        self.turns: list[str] = []
+        self.lock = threading.Lock()
+        self.compaction: Future | None = None
+        # bumped by clear, so a compaction started before it cannot touch the new turns
+        self.generation = 0
+
+    def add(self, message: str):
+        with self.lock:
+            self.turns.append(message)
+            should_compact = (
+                self.token_count() > self.max_tokens
+                and len(self.turns) > self.recent_turns
+                and (self.compaction is None or self.compaction.done())
+            )
+            if should_compact:
+                self.compaction = self.executor.submit(self.compact)
+
+    def token_count(self) -> int:
+        characters = len(self.summary or "") + sum(len(turn) for turn in self.turns)
+        return characters // CHARS_PER_TOKEN
+
+    def compact(self):
+        """Folds every turn but the most recent ones into the summary. When the LLM
+        call fails the turns are kept verbatim and compaction is retried on the next add.
+        """
+        with self.lock:
+            turns_to_compact = self.turns[: -self.recent_turns]
+            previous_summary = self.summary
+            generation = self.generation
+        if not turns_to_compact:
+            return
+        try:
+            summary = self.llm_client.ask_llm(
+                system_prompt=system_prompt_to_summarise_queries,
+                user_prompt=get_user_prompt_for_summary(
+                    previous_summary=previous_summary,
+                    latest_message="\n".join(turns_to_compact),
+                ),
+                response_type="text",
+                prompt_name="compact_conversation_memory",
+                use_cache=False,
+                priority=BACKGROUND_PRIORITY,
+            )
+        except Exception as e:
+            logging.warning(f"Conversation memory compaction failed: {e}")
+            return
+        with self.lock:
+            if self.generation != generation:
+                return
+            self.summary = summary
+            self.turns = self.turns[len(turns_to_compact) :]
+
+    def wait(self):
+        compaction = self.compaction
+        if compaction is not None:
+            compaction.result()
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.summary = None
+            self.turns = []
+
+    @property
+    def text(self) -> str | None:
+        """The summary followed by the recent messages, or None before the first message"""
+        with self.lock:
+            if self.summary is None and not self.turns:
+                return None
+            parts = [self.summary] if self.summary else []
+            if self.turns:
+                parts.append("Recent messages:\n" + "\n".join(self.turns))
+            return "\n".join(parts)
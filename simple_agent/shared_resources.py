@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from docling.document_converter import DocumentConverter
+
+from simple_agent.chat_orchestration import ChatbotOrchestrator
+from simple_agent.config.config import shared_step_workers, shared_scrape_workers
+from utils.feature_extractor.extract_job_details import JobRequirementsExtractor
+from utils.gap_analysis.skill_diff import GapAnalysisCache
+from utils.intent_classifier.intent_classifier import IntentClassifier
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.locanto_scraper.locanto_scraper import LocantoScraper
+from utils.locanto_scraper.scrape_history import ScrapeHistory
+from utils.resume_extractor.resume_parser import CVParser
+from utils.vector_storage.qdrant_storage import QdrantStorage
+
+
+@dataclass
+class SharedResources:
+    """Thread safe resources that are expensive to create, loaded once per process and
+    shared by every chat session: embedding models, qdrant and LLM clients, the docling
+    converter and the worker threads"""
+
+    vector_storage: QdrantStorage
+    llm_client: LLMInteraction
+    feature_extractor: JobRequirementsExtractor
+    document_converter: DocumentConverter
+    intent_classifier: IntentClassifier | None = None
+    gap_analysis_cache: GapAnalysisCache = field(default_factory=GapAnalysisCache)
+    scrape_history: ScrapeHistory = field(default_factory=ScrapeHistory)
+    executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(
+            max_workers=shared_step_workers, thread_name_prefix="orchestrator-step"
+        )
+    )
+    scrape_executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(
+            max_workers=shared_scrape_workers, thread_name_prefix="orchestrator-scrape"
+        )
+    )
+
+    @classmethod
+    def load(cls) -> "SharedResources":
+        llm_client = LLMInteraction()
+        vector_storage = QdrantStorage()
+        return cls(
+            vector_storage=vector_storage,
+            llm_client=llm_client,
+            feature_extractor=JobRequirementsExtractor(llm_client=llm_client),
+            document_converter=DocumentConverter(),
+            intent_classifier=IntentClassifier(encoder=vector_storage.encoder),
+        )
+
+    def new_session(self) -> ChatbotOrchestrator:
+        """Cheap per session conversation state on top of the shared resources"""
+        return ChatbotOrchestrator(
+            scraper=LocantoScraper(),
+            feature_extractor=self.feature_extractor,
+            vector_storage=self.vector_storage,
+            llm_client=self.llm_client,
+            resume_parser=CVParser(
+                llm_client=self.llm_client, converter=self.document_converter
+            ),
+            intent_classifier=self.intent_classifier,
+            executor=self.executor,
+            scrape_executor=self.scrape_executor,
+            gap_analysis_cache=self.gap_analysis_cache,
+            scrape_history=self.scrape_history,
+        )
@@ -0,0 +1,378 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from prompts.default_prompt_responses import default_response_for_scrape_in_progress
+from simple_agent.chat_orchestration import (
+    BatchGapAnalysis,
+    ChatbotOrchestrator,
+    JobSearchInProgress,
+    QueryDetails,
+)
+from utils.intent_classifier.intent_classifier import IntentClassifier
+from utils.intent_classifier.tests.test_intent_classifier import (
+    BagOfWordsEncoder,
+    load_held_out_queries,
+)
+from utils.llm_client.llm_backends import FakeBackend
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.llm_client.llm_metrics import InMemoryMetricsSink, REQUESTS_TOTAL
+from utils.locanto_scraper.locanto_scraper import LocantoScraper
+from utils.locanto_scraper.scrape_history import ScrapeHistory
+from utils.skill_vocabulary.config import SKILL_IDS_KEY
+from utils.vector_storage.qdrant_storage import QdrantStorage
+from utils.vector_storage.tests.hashing_encoders import DenseEncoder, SparseEncoder
+
+DAY = 24 * 60 * 60
+
+
+def job_payload(url: str, **fields) -> dict:
+    return {
+        "job_position": "data engineer",
+        "url": url,
+        "company_name": "Acme",
+        "posted_date": "today",
+        **fields,
+    }
+
+
+class StubVectorStorage:
+    def __init__(self, payloads=None, points=None, resume_point=None):
+        self.payloads = payloads or []
+        self.points = points or []
+        self.resume_point = resume_point
+
+    def retrieve_payloads_based_on_text_match(self, **kwargs):
+        return self.payloads
+
+    def retrieve_docs_based_on_query(self, **kwargs):
+        return self.points
+
+    def retrieve_docs_similar_to_point(self, **kwargs):
+        return self.points
+
+    def create_location_and_recency_filter(self, **kwargs):
+        return None
+
+    def retrieve_point(self, **kwargs):
+        return self.resume_point
+
+
+class RecordingExecutor:
+    """Records background scrapes instead of running them"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(kwargs)
+
+
+class BarrierLLMClient:
+    """Answers the single purpose prompts only once two of them are in flight"""
+
+    answers = {"identify_location": "Hobart", "identify_job_name": "nurse"}
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def ask_llm(self, prompt_name: str, **kwargs):
+        self.barrier.wait()
+        return self.answers[prompt_name]
+
+
+def make_orchestrator(tmp_path, vector_storage=None, **kwargs) -> ChatbotOrchestrator:
+    return ChatbotOrchestrator(
+        scraper=None,
+        feature_extractor=None,
+        vector_storage=vector_storage or StubVectorStorage(),
+        llm_client=kwargs.pop(
+            "llm_client",
+            LLMInteraction(
+                backends=[FakeBackend()], metrics_sink=InMemoryMetricsSink()
+            ),
+        ),
+        resume_parser=SimpleNamespace(
+            resume_uploaded=True, resume_in_text="Python developer"
+        ),
+        concurrent=kwargs.pop("concurrent", False),
+        executor=ThreadPoolExecutor(max_workers=4),
+        scrape_history=kwargs.pop(
+            "scrape_history", ScrapeHistory(str(tmp_path / "scrape_history.sqlite"))
+        ),
+        **kwargs,
+    )
+
+
+def test_query_details_take_one_llm_call(tmp_path):
+    metrics_sink = InMemoryMetricsSink()
+    orchestrator = make_orchestrator(
+        tmp_path,
+        llm_client=LLMInteraction(backends=[FakeBackend()], metrics_sink=metrics_sink),
+    )
+    query_details = orchestrator.extract_query_details("find nurse jobs in Hobart")
+    assert query_details.query_type == "job_search"
+    assert orchestrator.identify_location_and_job(query_details) == ("Hobart", "nurse")
+    assert metrics_sink.counter_total(REQUESTS_TOTAL) == 1
+
+
+def test_only_confident_greetings_skip_the_llm(tmp_path):
+    orchestrator = make_orchestrator(
+        tmp_path, intent_classifier=IntentClassifier(encoder=BagOfWordsEncoder())
+    )
+    assert orchestrator.classify_locally("hello there").query_type == "general_chat"
+    for text in load_held_out_queries()["borderline"]:
+        assert orchestrator.classify_locally(text) is None, text
+
+
+def test_location_and_job_are_asked_in_parallel(tmp_path):
+    orchestrator = make_orchestrator(
+        tmp_path, llm_client=BarrierLLMClient(), concurrent=True
+    )
+    query_details = QueryDetails(
+        summary="nurse jobs in Hobart", query_type="job_search"
+    )
+    assert orchestrator.identify_location_and_job(query_details) == ("Hobart", "nurse")
+
+
+def test_each_turn_sees_the_previous_ones(tmp_path):
+    orchestrator = make_orchestrator(tmp_path, concurrent=True)
+    orchestrator.extract_query_details("find nurse jobs in Hobart")
+    query_details = orchestrator.extract_query_details("what about Perth")
+    assert "find nurse jobs in Hobart" in query_details.summary
+    assert query_details.summary.endswith("user_query:what about Perth")
+
+
+@pytest.mark.parametrize(
+    "combined_response",
+    [
+        '{"query_type": "job_hunting", "location": "none"}',
+        '["not", "a", "json", "object"]',
+    ],
+)
+def test_query_details_fall_back_to_single_purpose_prompts(tmp_path, combined_response):
+    llm_client = LLMInteraction(
+        backends=[FakeBackend(fixtures={"Latest user message": combined_response})],
+        metrics_sink=InMemoryMetricsSink(),
+    )
+    orchestrator = make_orchestrator(tmp_path, llm_client=llm_client)
+    query_details = orchestrator.extract_query_details("find nurse jobs in Hobart")
+    assert query_details.query_type == "job_search"
+    assert query_details.summary.endswith("user_query:find nurse jobs in Hobart")
+    assert query_details.location is None and query_details.job_position is None
+    assert orchestrator.identify_location_and_job(query_details) == ("Hobart", "nurse")
+
+
+def test_stale_searches_are_rescraped_in_the_background(tmp_path):
+    orchestrator = make_orchestrator(
+        tmp_path,
+        vector_storage=StubVectorStorage(payloads=[job_payload("https://jobs/1")]),
+        scraped_jobs_ttl=60,
+        scrape_executor=RecordingExecutor(),
+    )
+    orchestrator.scrape_history.record_scrape(job_position="nurse", location="Hobart")
+    jobs = orchestrator.retrieve_scraped_jobs("nurse", "Hobart")
+    assert [job["url"] for job in jobs] == ["https://jobs/1"]
+    assert orchestrator.scrape_executor.submitted == []
+
+    with orchestrator.scrape_history.lock:
+        orchestrator.scrape_history.db.execute(
+            "UPDATE scrape_history SET scraped_at = ?", (time.time() - 120,)
+        )
+        orchestrator.scrape_history.db.commit()
+    assert orchestrator.retrieve_scraped_jobs("nurse", "Hobart") == jobs
+    assert orchestrator.scrape_executor.submitted == [
+        {"job_position": "nurse", "location": "Hobart"}
+    ]
+
+
+def test_indexed_jobs_are_filtered_on_recency_before_the_limit(tmp_path, monkeypatch):
+    collection_name = f"jobs{uuid.uuid4()}"
+    monkeypatch.setattr(
+        "simple_agent.chat_orchestration.PARSED_JOB_TOPIC", collection_name
+    )
+    monkeypatch.setattr("simple_agent.chat_orchestration.scraped_jobs_limit", 5)
+    vector_storage = QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+    )
+    vector_storage.create_collection(collection_name=collection_name)
+    now = time.time()
+    # labelled "today" when they were scraped a month ago
+    old_jobs = [
+        job_payload(
+            f"https://jobs/old{i}",
+            job_position="nurse",
+            suburb="Hobart",
+            description="nurse",
+            **LocantoScraper.posting_times("today", scraped_at=now - 30 * DAY),
+        )
+        for i in range(20)
+    ]
+    recent_jobs = [
+        job_payload(
+            f"https://jobs/{suburb}",
+            job_position="nurse",
+            suburb=suburb,
+            description="nurse",
+            **LocantoScraper.posting_times(posted_date, scraped_at=now),
+        )
+        for suburb, posted_date in [("Hobart", "yesterday"), ("Perth", "today")]
+    ]
+    jobs = old_jobs + recent_jobs
+    vector_storage.upload_points(
+        points=jobs,
+        key_to_encode="description",
+        collection_name=collection_name,
+        given_ids=[vector_storage.point_id_for_url(job["url"]) for job in jobs],
+    )
+    orchestrator = make_orchestrator(tmp_path, vector_storage=vector_storage)
+    jobs_in_hobart = orchestrator.retrieve_indexed_jobs("nurse", "Hobart")
+    assert [job["url"] for job in jobs_in_hobart] == ["https://jobs/Hobart"]
+    jobs_nationwide = orchestrator.retrieve_indexed_jobs("nurse", "Australia")
+    assert [job["url"] for job in jobs_nationwide] == [
+        "https://jobs/Perth",
+        "https://jobs/Hobart",
+    ]
+
+
+def test_resume_suggestions_are_reranked_by_skill_overlap(tmp_path):
+    candidates = [
+        SimpleNamespace(
+            score=1.0, payload=job_payload("https://jobs/close", **{SKILL_IDS_KEY: [7]})
+        ),
+        SimpleNamespace(
+            score=0.8,
+            payload=job_payload("https://jobs/skilled", **{SKILL_IDS_KEY: [1, 2]}),
+        ),
+    ]
+    resume_point = SimpleNamespace(payload={SKILL_IDS_KEY: [1, 2, 3]})
+    orchestrator = make_orchestrator(
+        tmp_path,
+        vector_storage=StubVectorStorage(points=candidates, resume_point=resume_point),
+    )
+    orchestrator.resume_point_id = "resume"
+    suggested_jobs = orchestrator.suggest_jobs_by_resume(location="Australia")
+    assert [job["url"] for job in suggested_jobs] == [
+        "https://jobs/skilled",
+        "https://jobs/close",
+    ]
+
+
+def test_batch_gap_analysis_rows_carry_their_search_rank(tmp_path):
+    job_points = [
+        SimpleNamespace(
+            id=rank,
+            payload=job_payload(f"https://jobs/{rank}", required_skills=skills),
+        )
+        for rank, skills in enumerate(
+            [["Python", "SQL"], ["Python"], ["Python", "SQL"], ["Kubernetes"]]
+        )
+    ]
+    orchestrator = make_orchestrator(
+        tmp_path, vector_storage=StubVectorStorage(points=job_points)
+    )
+    orchestrator.resume_details = {"CORE_SKILLS": ["Python"]}
+    batch = orchestrator.batch_gap_analysis(
+        job_key_details=QueryDetails(
+            summary="", query_type="job_gap_analysis", job_position="data engineer"
+        ).gap_analysis_filters()
+    )
+    assert isinstance(batch, BatchGapAnalysis) and batch.total == 4
+
+    rows = list(batch.rows)
+    assert sorted(row["match_rank"] for row in rows) == [0, 1, 2, 3]
+    for row in rows:
+        assert row["url"] == f"https://jobs/{row['match_rank']}"
+        assert row["gap_analysis"]
+    ranked = sorted(rows, key=lambda row: (-row["fit_score"], row["match_rank"]))
+    assert [row["url"] for row in ranked] == [
+        "https://jobs/1",
+        "https://jobs/0",
+        "https://jobs/2",
+        "https://jobs/3",
+    ]
+
+
+def test_stale_search_is_rescraped_once_across_sessions(tmp_path):
+    scrape_history = ScrapeHistory(str(tmp_path / "scrape_history.sqlite"))
+    storage = StubVectorStorage(payloads=[job_payload("https://jobs/1")])
+    sessions = [
+        make_orchestrator(
+            tmp_path,
+            vector_storage=storage,
+            scrape_history=scrape_history,
+            scraped_jobs_ttl=60,
+            scrape_executor=RecordingExecutor(),
+        )
+        for _ in range(2)
+    ]
+    scrape_history.record_scrape(job_position="nurse", location="Hobart")
+    with scrape_history.lock:
+        scrape_history.db.execute(
+            "UPDATE scrape_history SET scraped_at = ?", (time.time() - 120,)
+        )
+        scrape_history.db.commit()
+    for session in sessions:
+        assert session.retrieve_scraped_jobs("nurse", "Hobart")
+    assert [session.scrape_executor.submitted for session in sessions] == [
+        [{"job_position": "nurse", "location": "Hobart"}],
+        [],
+    ]
+
+
+def test_repeat_search_during_a_crawl_does_not_start_another(tmp_path):
+    scrape_history = ScrapeHistory(str(tmp_path / "scrape_history.sqlite"))
+    sessions = [
+        make_orchestrator(
+            tmp_path,
+            scrape_history=scrape_history,
+            scrape_in_background=True,
+            scrape_executor=RecordingExecutor(),
+        )
+        for _ in range(2)
+    ]
+    first_search = sessions[0].scrape_jobs_and_save_them("nurse", "Hobart")
+    assert isinstance(first_search, JobSearchInProgress)
+    repeat_search = sessions[1].scrape_jobs_and_save_them("nurse", "Hobart")
+    assert repeat_search == default_response_for_scrape_in_progress.format(
+        job_position="nurse", location="Hobart"
+    )
+    assert [len(session.scrape_executor.submitted) for session in sessions] == [1, 0]
+
+    scrape_history.release_claim(job_position="nurse", location="Hobart")
+    assert isinstance(
+        sessions[1].scrape_jobs_and_save_them("nurse", "Hobart"), JobSearchInProgress
+    )
+
+
+def test_background_search_adds_listings_as_the_crawl_parses_them(tmp_path):
+    orchestrator = make_orchestrator(
+        tmp_path,
+        vector_storage=StubVectorStorage(payloads=[job_payload("https://jobs/1")]),
+        scrape_in_background=True,
+        scrape_executor=RecordingExecutor(),
+    )
+    job_search = orchestrator.scrape_jobs_and_save_them("nurse", "Hobart")
+    assert isinstance(job_search, JobSearchInProgress)
+    assert [job["url"] for job in job_search.jobs()] == ["https://jobs/1"]
+    assert orchestrator.scrape_executor.submitted[0]["progress"] is job_search.progress
+
+    job_search.progress.add_ads(3)
+    for listing in [
+        job_payload("https://jobs/1"),
+        job_payload("https://jobs/2"),
+        job_payload("https://jobs/3", posted_date="2 weeks ago"),
+    ]:
+        job_search.progress.add_listing(listing)
+    assert [job["url"] for job in job_search.jobs()] == [
+        "https://jobs/1",
+        "https://jobs/2",
+    ]
+    assert job_search.progress.fraction == 1.0 and not job_search.progress.done
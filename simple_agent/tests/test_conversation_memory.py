@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from simple_agent.conversation_memory import ConversationMemory
+from utils.llm_client.llm_backends import FakeBackend
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.llm_client.llm_metrics import InMemoryMetricsSink
+
+
+def test_recent_turns_are_kept_verbatim():
+    memory = ConversationMemory(
+        llm_client=LLMInteraction(
+            backends=[FakeBackend()], metrics_sink=InMemoryMetricsSink()
+        ),
+        executor=ThreadPoolExecutor(max_workers=1),
+    )
+    assert memory.text is None
+    memory.add("user_query:find nurse jobs in Hobart")
+    memory.add("computer response: the jobs have been shown")
+    assert memory.text == (
+        "Recent messages:\n"
+        "user_query:find nurse jobs in Hobart\n"
+        "computer response: the jobs have been shown"
+    )
+    assert memory.compaction is None
+
+
+def test_compacts_past_the_token_limit():
+    memory = ConversationMemory(
+        llm_client=LLMInteraction(
+            backends=[FakeBackend(fixtures={"Previous summary": "compacted"})],
+            metrics_sink=InMemoryMetricsSink(),
+        ),
+        executor=ThreadPoolExecutor(max_workers=1),
+        max_tokens=10,
+        recent_turns=2,
+    )
+    for turn in range(4):
+        memory.add(f"user_query:message number {turn}")
+    memory.wait()
+    assert memory.summary == "compacted"
+    assert memory.turns[-1] == "user_query:message number 3"
+    assert len(memory.turns) <= 3
+    assert memory.text.startswith("compacted\nRecent messages:\n")
+
+
+class FailingLLMClient:
+    def ask_llm(self, **kwargs):
+        raise RuntimeError("rate limited")
+
+
+def test_failed_compaction_keeps_every_turn():
+    memory = ConversationMemory(
+        llm_client=FailingLLMClient(),
+        executor=ThreadPoolExecutor(max_workers=1),
+        max_tokens=10,
+        recent_turns=2,
+    )
+    for turn in range(4):
+        memory.add(f"user_query:message number {turn}")
+        memory.wait()
+    assert memory.summary is None
+    assert memory.turns == [f"user_query:message number {turn}" for turn in range(4)]
+
+
+def test_clear_during_compaction_discards_its_result():
+    class ClearingLLMClient:
+        def ask_llm(self, **kwargs):
+            memory.clear()
+            memory.add("user_query:after the clear")
+            return "stale summary"
+
+    memory = ConversationMemory(
+        llm_client=ClearingLLMClient(),
+        executor=ThreadPoolExecutor(max_workers=1),
+        recent_turns=1,
+    )
+    memory.turns = ["user_query:first", "user_query:second"]
+    memory.compact()
+    assert memory.summary is None
+    assert memory.turns == ["user_query:after the clear"]
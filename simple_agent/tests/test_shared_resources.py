@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from simple_agent.shared_resources import SharedResources
+from simple_agent.tests.test_chat_orchestration import StubVectorStorage
+from utils.llm_client.llm_backends import FakeBackend
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.llm_client.llm_metrics import InMemoryMetricsSink
+from utils.locanto_scraper.scrape_history import ScrapeHistory
+
+
+def make_shared_resources(tmp_path) -> SharedResources:
+    return SharedResources(
+        vector_storage=StubVectorStorage(),
+        llm_client=LLMInteraction(
+            backends=[FakeBackend()], metrics_sink=InMemoryMetricsSink()
+        ),
+        feature_extractor=None,
+        document_converter=object(),
+        scrape_history=ScrapeHistory(str(tmp_path / "scrape_history.sqlite")),
+    )
+
+
+def test_sessions_share_resources_but_not_conversation_state(tmp_path):
+    shared_resources = make_shared_resources(tmp_path)
+    first, second = shared_resources.new_session(), shared_resources.new_session()
+    for session in [first, second]:
+        assert session.vector_storage is shared_resources.vector_storage
+        assert session.llm_client is shared_resources.llm_client
+        assert session.executor is shared_resources.executor
+        assert session.scrape_history is shared_resources.scrape_history
+        assert session.resume_parser.converter is shared_resources.document_converter
+    assert first.resume_parser is not second.resume_parser
+    assert first.scraper is not second.scraper
+
+    first.resume_parser.resume_in_text = "Python developer"
+    first.extract_query_details("find nurse jobs in Hobart")
+    assert second.resume_parser.resume_in_text is None
+    assert not second.user_query_summary
+
+
+def test_concurrent_sessions_keep_their_own_conversations(tmp_path):
+    shared_resources = make_shared_resources(tmp_path)
+    sessions = {
+        city: shared_resources.new_session() for city in ["Hobart", "Perth", "Darwin"]
+    }
+
+    def chat(city: str):
+        for job in ["nurse", "chef", "plumber"]:
+            sessions[city].extract_query_details(f"find {job} jobs in {city}")
+
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        list(executor.map(chat, sessions))
+    for city, session in sessions.items():
+        other_cities = [other for other in sessions if other != city]
+        assert session.user_query_summary.count(city) == 3
+        assert not any(other in session.user_query_summary for other in other_cities)
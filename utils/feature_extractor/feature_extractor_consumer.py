@@ -1,4 +1,5 @@
 import json
+import uuid
 
 from kafka.consumer.fetcher import ConsumerRecord
 
@@ -20,9 +21,13 @@ class FeatureExtractorProcessor(AbstractMessageProcessor):
         super().__init__(topic_name=topic_name, consumer_id=consumer_id)
         self.job_requirements = job_requirements
         self.vector_storage = vector_storage
+        # created once when the processor starts, not probed for every message
+        self.vector_storage.create_collection(collection_name=self.topic_name)
 
     def handle_message(self, message: ConsumerRecord):
         job_data = json.loads(message.value)
+        if self.refresh_indexed_job(job_data=job_data):
+            return
         extracted_job_dict = self.job_requirements.extract_requirements(
             job_description=job_data.get("description"),
         )
@@ -32,6 +37,28 @@ class FeatureExtractorProcessor(AbstractMessageProcessor):
                 job_listings=[combined_job_details_dict],
             )
 
+    def refresh_indexed_job(self, job_data: dict) -> bool:
+        """Re-scraped ads already indexed with the same description only get their
+        scraped fields updated, without another LLM extraction or embedding"""
+        if not job_data.get("url"):
+            return False
+        indexed_job = self.vector_storage.retrieve_point(
+            collection_name=self.topic_name,
+            point_id=self.job_point_id(job_data),
+            with_vectors=False,
+        )
+        if indexed_job is None:
+            return False
+        if indexed_job.payload.get("description") != job_data.get("description"):
+            # the ad was edited, so its requirements are extracted again
+            return False
+        self.vector_storage.update_payload(
+            collection_name=self.topic_name,
+            point_id=indexed_job.id,
+            payload=job_data,
+        )
+        return True
+
     def save_to_qdrant(
         self,
         job_listings: list[dict],
@@ -41,4 +68,11 @@ class FeatureExtractorProcessor(AbstractMessageProcessor):
             points=job_listings,
             key_to_encode="description",
             collection_name=self.topic_name,
+            given_ids=[self.job_point_id(job) for job in job_listings],
         )
+
+    def job_point_id(self, job: dict) -> str:
+        """Ads are keyed on their url, so re-scraping one overwrites its point"""
+        if not job.get("url"):
+            return str(uuid.uuid4())
+        return self.vector_storage.point_id_for_url(job["url"])
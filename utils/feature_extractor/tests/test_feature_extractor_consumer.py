@@ -1,6 +1,8 @@
+import json
 import threading
 import time
 import uuid
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from kafka_producer_consumer.kafka_consumer import start_consumers
@@ -8,6 +10,8 @@ from kafka_producer_consumer.kafka_producer import produce_kafka_messages
 from utils.feature_extractor.extract_job_details import JobRequirementsExtractor
 from utils.feature_extractor.feature_extractor_consumer import FeatureExtractorProcessor
 from utils.vector_storage.qdrant_storage import QdrantStorage
+from utils.vector_storage.tests.hashing_encoders import DenseEncoder, SparseEncoder
+from utils.vector_storage.tests.spy_client import SpyClient
 
 
 @patch(
@@ -43,3 +47,79 @@ def test_feature_extractor_consumer(mock_method):
     assert vector_storage.client.collection_exists(collection_name=topic_name)
     assert vector_storage.client.count(collection_name=topic_name).count == 1
     vector_storage.client.delete_collection(collection_name=topic_name)
+
+
+class CountingExtractor:
+    def __init__(self):
+        self.calls = 0
+
+    def extract_requirements(self, job_description: str) -> dict:
+        self.calls += 1
+        return {"required_skills": ["Python"]}
+
+
+def test_rescraped_ads_update_their_point_without_another_extraction():
+    topic_name = f"test_topic{uuid.uuid4()}"
+    vector_storage = QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+    )
+    job_extractor = CountingExtractor()
+    processor = FeatureExtractorProcessor(
+        topic_name=topic_name,
+        consumer_id="test_consumer",
+        vector_storage=vector_storage,
+        job_requirements=job_extractor,
+    )
+    ad = {
+        "url": "https://www.locanto.com.au/ID_1",
+        "description": "python developer",
+        "posted_date": "today",
+    }
+    for posted_date in ["today", "yesterday"]:
+        processor.handle_message(
+            SimpleNamespace(value=json.dumps({**ad, "posted_date": posted_date}))
+        )
+    assert job_extractor.calls == 1
+    assert vector_storage.client.count(collection_name=topic_name).count == 1
+    point = vector_storage.retrieve_point(
+        collection_name=topic_name,
+        point_id=vector_storage.point_id_for_url(ad["url"]),
+        with_vectors=False,
+    )
+    assert point.payload["posted_date"] == "yesterday"
+    assert point.payload["required_skills"] == ["Python"]
+
+    processor.handle_message(
+        SimpleNamespace(value=json.dumps({**ad, "description": "senior python role"}))
+    )
+    assert job_extractor.calls == 2
+    assert vector_storage.client.count(collection_name=topic_name).count == 1
+
+
+def test_collection_is_set_up_once_when_the_processor_starts():
+    topic_name = f"test_topic{uuid.uuid4()}"
+    vector_storage = QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+    )
+    vector_storage.client = SpyClient(vector_storage.client)
+    processor = FeatureExtractorProcessor(
+        topic_name=topic_name,
+        consumer_id="test_consumer",
+        vector_storage=vector_storage,
+        job_requirements=CountingExtractor(),
+    )
+    for i in range(3):
+        processor.handle_message(
+            SimpleNamespace(
+                value=json.dumps({"url": f"https://jobs/{i}", "description": "chef"})
+            )
+        )
+    assert vector_storage.client.count(collection_name=topic_name).count == 3
+    assert vector_storage.client.calls["collection_exists"] == 1
+    assert vector_storage.client.calls["create_collection"] == 1
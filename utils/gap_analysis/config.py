@@ -0,0 +1,37 @@
+# job payload keys compared against the resume, from the job feature extraction prompt
+REQUIRED_SKILL_KEYS = ["required_skills", "technologies"]
+PREFERRED_SKILL_KEYS = ["preferred_skills", "soft_skills"]
+# resume keys from the resume extraction prompt
+RESUME_SKILL_KEYS = [
+    "CORE_SKILLS",
+    "SECONDARY_SKILLS",
+    "SOFT_SKILLS",
+    "TECHNOLOGIES_USED",
+]
+# skills whose names are at least this similar count as partially matched
+PARTIAL_MATCH_RATIO = 0.8
+# degree patterns ordered from lowest to highest level. Short abbreviations only match
+# in dotted form, as "ba", "be" or "ma" are also ordinary words.
+EDUCATION_LEVELS = [
+    [r"\bcertificate\b", r"\bcert\s+(?:i|ii|iii|iv)\b"],
+    [r"\bdiploma\b", r"\bassociate degree\b"],
+    [
+        r"\bbachelor",
+        r"\bb\.?\s?sc\b",
+        r"\bb\.a\.",
+        r"\bb\.e\.",
+        r"\bb\.?\s?tech\b",
+        r"\bundergraduate\b",
+    ],
+    [
+        r"\bmaster",
+        r"\bm\.?\s?sc\b",
+        r"\bm\.a\.",
+        r"\bm\.?b\.?a\b",
+        r"\bm\.?\s?tech\b",
+        r"\bpostgraduate\b",
+    ],
+    [r"\bph\.?\s?d\b", r"\bdoctorate\b", r"\bdoctoral\b"],
+]
+EXCERPT_CHARS = 500
+GAP_ANALYSIS_CACHE_SIZE = 512
@@ -0,0 +1,205 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+from utils.gap_analysis.config import (
+    REQUIRED_SKILL_KEYS,
+    PREFERRED_SKILL_KEYS,
+    RESUME_SKILL_KEYS,
+    PARTIAL_MATCH_RATIO,
+    EDUCATION_LEVELS,
+    EXCERPT_CHARS,
+    GAP_ANALYSIS_CACHE_SIZE,
+)
+from utils.skill_vocabulary.skill_vocabulary import SkillVocabulary
+
+YEARS_PATTERN = re.compile(r"(\d+)\s*\+?\s*(?:-\s*\d+\s*)?(?:years?|yrs?)", re.I)
+
+
+@dataclass
+class SkillDiff:
+    """Structured comparison of a job's extracted features with a resume"""
+
+    job_title: str
+    matched_skills: list[str] = field(default_factory=list)
+    partial_skills: list[tuple[str, str]] = field(default_factory=list)
+    missing_required_skills: list[str] = field(default_factory=list)
+    missing_preferred_skills: list[str] = field(default_factory=list)
+    required_experience: str | None = None
+    candidate_years: float | None = None
+    experience_met: bool | None = None
+    required_education: list[str] = field(default_factory=list)
+    candidate_education: list[str] = field(default_factory=list)
+    education_met: bool | None = None
+    job_excerpt: str = ""
+    resume_excerpt: str = ""
+
+    @property
+    def fit_score(self) -> float:
+        """Share of the job's skills found in the resume, partial matches counting half"""
+        skills_compared = (
+            len(self.matched_skills)
+            + len(self.partial_skills)
+            + len(self.missing_required_skills)
+            + len(self.missing_preferred_skills)
+        )
+        if not skills_compared:
+            return 0.0
+        return (
+            len(self.matched_skills) + 0.5 * len(self.partial_skills)
+        ) / skills_compared
+
+    def to_prompt_text(self) -> str:
+        """Compact text handed to the LLM instead of the full job and resume"""
+        partial = [f"{job} (resume: {resume})" for job, resume in self.partial_skills]
+        lines = [
+            f"Job: {self.job_title}",
+            f"Matched skills: {', '.join(self.matched_skills) or 'none'}",
+            f"Partially matched skills: {', '.join(partial) or 'none'}",
+            f"Missing required skills: {', '.join(self.missing_required_skills) or 'none'}",
+            f"Missing preferred skills: {', '.join(self.missing_preferred_skills) or 'none'}",
+            f"Experience: job asks for {self.required_experience or 'not stated'}, "
+            f"resume shows {self.candidate_years if self.candidate_years is not None else 'unknown'} years"
+            f"{describe_requirement_met(self.experience_met)}",
+            f"Education: job asks for {', '.join(self.required_education) or 'not stated'}, "
+            f"resume lists {', '.join(self.candidate_education) or 'nothing'}"
+            f"{describe_requirement_met(self.education_met)}",
+            f"Job excerpt: {self.job_excerpt}",
+            f"Resume excerpt: {self.resume_excerpt}",
+        ]
+        return "\n".join(lines)
+
+
+def describe_requirement_met(met: bool | None) -> str:
+    if met is None:
+        return ""
+    return " (met)" if met else " (not met)"
+
+
+def compute_skill_diff(
+    job_payload: dict,
+    resume_details: dict,
+    skill_vocabulary: SkillVocabulary,
+    resume_text: str | None = None,
+) -> SkillDiff:
+    """Matches the skills, experience and education extracted from a job against the
+    ones extracted from a resume, without calling the LLM"""
+    resume_skills = unique(
+        skill for key in RESUME_SKILL_KEYS for skill in resume_details.get(key, [])
+    )
+    resume_skill_ids = skill_vocabulary.skill_ids(resume_skills)
+    diff = SkillDiff(
+        job_title=" at ".join(
+            value
+            for value in [
+                job_payload.get("job_position"),
+                job_payload.get("company_name"),
+            ]
+            if value
+        )
+        or "unknown job",
+    )
+    for keys, missing in [
+        (REQUIRED_SKILL_KEYS, diff.missing_required_skills),
+        (PREFERRED_SKILL_KEYS, diff.missing_preferred_skills),
+    ]:
+        for skill in unique(
+            skill for key in keys for skill in job_payload.get(key, [])
+        ):
+            if skill_vocabulary.skill_id(skill) in resume_skill_ids:
+                diff.matched_skills.append(skill)
+                continue
+            similar_skill = most_similar_skill(skill, resume_skills, skill_vocabulary)
+            if similar_skill is not None:
+                diff.partial_skills.append((skill, similar_skill))
+            else:
+                missing.append(skill)
+
+    diff.required_experience = job_payload.get("experience_level") or None
+    diff.candidate_years = resume_details.get("YEARS_OF_EXPERIENCE")
+    required_years = YEARS_PATTERN.search(diff.required_experience or "")
+    if required_years and isinstance(diff.candidate_years, (int, float)):
+        diff.experience_met = diff.candidate_years >= int(required_years.group(1))
+
+    diff.required_education = list(job_payload.get("education", []))
+    diff.candidate_education = list(resume_details.get("EDUCATION", []))
+    required_level = education_level(diff.required_education, lowest=True)
+    candidate_level = education_level(diff.candidate_education, lowest=False)
+    if required_level is not None:
+        diff.education_met = candidate_level is not None and (
+            candidate_level >= required_level
+        )
+
+    diff.job_excerpt = excerpt(job_payload.get("description"))
+    diff.resume_excerpt = excerpt(resume_text or resume_details.get("RAW_TEXT"))
+    return diff
+
+
+def unique(items) -> list:
+    return list(dict.fromkeys(items))
+
+
+def most_similar_skill(
+    skill: str, candidate_skills: list[str], skill_vocabulary: SkillVocabulary
+) -> str | None:
+    """A resume skill whose name contains, or nearly equals, the job skill"""
+    skill_key = skill_vocabulary.alias_key(skill)
+    for candidate_skill in candidate_skills:
+        candidate_key = skill_vocabulary.alias_key(candidate_skill)
+        contained = re.search(rf"\b{re.escape(skill_key)}\b", candidate_key) or (
+            re.search(rf"\b{re.escape(candidate_key)}\b", skill_key)
+        )
+        similar = SequenceMatcher(None, skill_key, candidate_key).ratio()
+        if contained or similar >= PARTIAL_MATCH_RATIO:
+            return candidate_skill
+    return None
+
+
+def education_level(education: list[str], lowest: bool) -> int | None:
+    """Lowest or highest degree level mentioned, None when no degree is recognised"""
+    levels = [
+        level
+        for text in education
+        for level, patterns in enumerate(EDUCATION_LEVELS)
+        if any(re.search(pattern, text.lower()) for pattern in patterns)
+    ]
+    if not levels:
+        return None
+    return min(levels) if lowest else max(levels)
+
+
+def excerpt(text: str | None, max_chars: int = EXCERPT_CHARS) -> str:
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+def resume_hash(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+
+class GapAnalysisCache:
+    """LRU of gap analyses keyed on (resume hash, job id), shared between sessions"""
+
+    def __init__(self, max_size: int = GAP_ANALYSIS_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, resume_hash: str, job_id: str) -> str | None:
+        with self.lock:
+            analysis = self.entries.get((resume_hash, job_id))
+            if analysis is not None:
+                self.entries.move_to_end((resume_hash, job_id))
+            return analysis
+
+    def set(self, resume_hash: str, job_id: str, analysis: str):
+        with self.lock:
+            self.entries[(resume_hash, job_id)] = analysis
+            self.entries.move_to_end((resume_hash, job_id))
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
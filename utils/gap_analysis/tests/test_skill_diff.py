@@ -0,0 +1,70 @@
+from utils.gap_analysis.skill_diff import (
+    GapAnalysisCache,
+    compute_skill_diff,
+    education_level,
+    resume_hash,
+)
+from utils.skill_vocabulary.skill_vocabulary import SkillVocabulary
+
+
+def test_compute_skill_diff():
+    vocabulary = SkillVocabulary()
+    job_payload = vocabulary.clean_extracted_data(
+        {
+            "job_position": "Data Scientist",
+            "company_name": "Acme",
+            "required_skills": ["Python", "ML", "Amazon Web Services", "Kubernetes"],
+            "preferred_skills": ["Tableau"],
+            "technologies": ["PostgreSQL"],
+            "experience_level": "3-5 years",
+            "education": ["Bachelor's in Computer Science"],
+            "description": "We are hiring. " * 100,
+        }
+    )
+    resume_details = vocabulary.clean_extracted_data(
+        {
+            "CORE_SKILLS": ["python", "machine learning", "AWS"],
+            "TECHNOLOGIES_USED": ["Postgres SQL"],
+            "YEARS_OF_EXPERIENCE": 2,
+            "EDUCATION": ["Master of Data Science"],
+            "RAW_TEXT": "Data scientist with two years of experience.",
+        }
+    )
+    diff = compute_skill_diff(
+        job_payload=job_payload,
+        resume_details=resume_details,
+        skill_vocabulary=vocabulary,
+    )
+    assert diff.job_title == "Data Scientist at Acme"
+    assert diff.matched_skills == [
+        "Python",
+        "Machine Learning",
+        "Amazon Web Services",
+    ]
+    assert diff.partial_skills == [("PostgreSQL", "Postgres Sql")]
+    assert diff.missing_required_skills == ["Kubernetes"]
+    assert diff.missing_preferred_skills == ["Tableau"]
+    assert diff.experience_met is False
+    assert diff.education_met is True
+    assert diff.fit_score == 3.5 / 6
+    prompt_text = diff.to_prompt_text()
+    assert "Missing required skills: Kubernetes" in prompt_text
+    assert len(prompt_text) < len(job_payload["description"])
+
+
+def test_education_abbreviations_need_their_dotted_form():
+    assert education_level(["Must be able to work as a team"], lowest=True) is None
+    assert education_level(["Ma and pa grocery experience"], lowest=True) is None
+    assert education_level(["B.E. in Civil Engineering"], lowest=True) == 2
+    assert education_level(["M.A. English", "MBA"], lowest=False) == 3
+    assert education_level(["Cert IV in Aged Care", "PhD"], lowest=True) == 0
+
+
+def test_gap_analysis_cache():
+    cache = GapAnalysisCache(max_size=1)
+    first_resume = resume_hash("resume one")
+    cache.set(first_resume, "job-1", "analysis one")
+    assert cache.get(first_resume, "job-1") == "analysis one"
+    assert cache.get(resume_hash("resume two"), "job-1") is None
+    cache.set(first_resume, "job-2", "analysis two")
+    assert cache.get(first_resume, "job-1") is None
@@ -0,0 +1,6 @@
+import os
+
+INTENT_EXAMPLES_PATH = os.path.join(os.path.dirname(__file__), "intent_examples.json")
+# softmax over centroid cosine similarities, below this the LLM decides
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.7"))
+INTENT_SOFTMAX_TEMPERATURE = 20.0
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+
+import numpy as np
+from fastembed import TextEmbedding
+
+from utils.intent_classifier.config import (
+    INTENT_EXAMPLES_PATH,
+    INTENT_CONFIDENCE_THRESHOLD,
+    INTENT_SOFTMAX_TEMPERATURE,
+)
+
+
+def load_examples(path: str = INTENT_EXAMPLES_PATH) -> list[dict]:
+    """Labelled examples as a list of {"text": ..., "query_type": ...}"""
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+class IntentClassifier:
+    """Nearest-centroid query type classifier over sentence embeddings.
+    Confident predictions are answered locally, the rest are deferred to the LLM."""
+
+    def __init__(
+        self,
+        encoder: TextEmbedding,
+        examples_path: str | None = INTENT_EXAMPLES_PATH,
+        confidence_threshold: float = INTENT_CONFIDENCE_THRESHOLD,
+        temperature: float = INTENT_SOFTMAX_TEMPERATURE,
+    ):
+        self.encoder = encoder
+        self.confidence_threshold = confidence_threshold
+        self.temperature = temperature
+        self.labels: list[str] = []
+        self.centroids = None
+        self.lock = threading.Lock()
+        self.predictions = 0
+        self.deferrals = 0
+        self.total_seconds = 0.0
+        if examples_path:
+            self.train(load_examples(examples_path))
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.array(list(self.encoder.embed(texts)), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def train(self, examples: list[dict]):
+        self.labels = sorted({example["query_type"] for example in examples})
+        vectors = self.embed([example["text"] for example in examples])
+        example_labels = np.array([example["query_type"] for example in examples])
+        centroids = np.stack(
+            [vectors[example_labels == label].mean(axis=0) for label in self.labels]
+        )
+        self.centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Returns the closest query type and its softmax confidence"""
+        similarities = self.centroids @ self.embed([text])[0]
+        scores = np.exp(self.temperature * (similarities - similarities.max()))
+        probabilities = scores / scores.sum()
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+    def classify(self, text: str) -> str | None:
+        """Query type when confident, None when the LLM should decide"""
+        start = time.perf_counter()
+        query_type, confidence = self.predict(text)
+        confident = confidence >= self.confidence_threshold
+        with self.lock:
+            self.predictions += 1
+            self.deferrals += not confident
+            self.total_seconds += time.perf_counter() - start
+        return query_type if confident else None
+
+    def evaluate(self, examples: list[dict]) -> dict:
+        """Accuracy on held out examples, overall and on the confidently answered ones"""
+        answered = correct = answered_correct = 0
+        for example in examples:
+            query_type, confidence = self.predict(example["text"])
+            is_correct = query_type == example["query_type"]
+            correct += is_correct
+            if confidence >= self.confidence_threshold:
+                answered += 1
+                answered_correct += is_correct
+        return {
+            "accuracy": correct / len(examples),
+            "answered_accuracy": answered_correct / answered if answered else 0.0,
+            "deferral_rate": 1 - answered / len(examples),
+        }
+
+    @property
+    def deferral_rate(self) -> float:
+        return self.deferrals / self.predictions if self.predictions else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "predictions": self.predictions,
+            "deferrals": self.deferrals,
+            "deferral_rate": self.deferral_rate,
+            "mean_seconds": (
+                self.total_seconds / self.predictions if self.predictions else 0.0
+            ),
+        }
@@ -0,0 +1,85 @@
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+import pytest
+from fastembed import TextEmbedding
+
+from utils.intent_classifier.intent_classifier import IntentClassifier, load_examples
+
+HELD_OUT_QUERIES_PATH = os.path.join(os.path.dirname(__file__), "held_out_queries.json")
+
+
+class BagOfWordsEncoder:
+    """Stands in for the sentence transformer so the tests run without model downloads"""
+
+    def embed(self, texts: list[str]):
+        for text in texts:
+            vector = np.zeros(512, dtype=np.float32)
+            for word in re.findall(r"[a-z]+", text.lower()):
+                vector[zlib.crc32(word.encode()) % 512] += 1
+            yield vector
+
+
+def test_confident_predictions_and_deferrals():
+    classifier = IntentClassifier(
+        encoder=BagOfWordsEncoder(), confidence_threshold=0.5, temperature=10
+    )
+    assert classifier.classify("hello there") == "general_chat"
+    assert classifier.classify("suggest jobs based on my resume") == (
+        "suggest_jobs_by_resume"
+    )
+    assert classifier.classify("zebra quantum") is None
+    stats = classifier.stats()
+    assert stats["predictions"] == 3
+    assert stats["deferrals"] == 1
+    assert stats["deferral_rate"] == 1 / 3
+
+
+def test_evaluate_on_training_examples():
+    examples = load_examples()
+    classifier = IntentClassifier(
+        encoder=BagOfWordsEncoder(), confidence_threshold=0.0, temperature=10
+    )
+    report = classifier.evaluate(examples)
+    assert report["deferral_rate"] == 0.0
+    assert report["accuracy"] == report["answered_accuracy"]
+    assert report["accuracy"] > 0.7
+
+
+def load_held_out_queries() -> dict:
+    """Labelled queries the classifier is not trained on, and borderline ones mixing
+    a greeting with a request"""
+    with open(HELD_OUT_QUERIES_PATH, "r") as file:
+        return json.load(file)
+
+
+@pytest.fixture(scope="module")
+def sentence_encoder():
+    """The encoder the app classifies with, skipped when the model cannot be loaded"""
+    try:
+        return TextEmbedding("sentence-transformers/all-MiniLM-L6-v2")
+    except Exception as e:
+        pytest.skip(f"sentence transformer unavailable: {e}")
+
+
+def test_shipped_settings_on_held_out_queries(sentence_encoder):
+    classifier = IntentClassifier(encoder=sentence_encoder)
+    report = classifier.evaluate(load_held_out_queries()["labelled"])
+    assert report["answered_accuracy"] >= 0.9
+    assert report["deferral_rate"] <= 0.5
+
+
+@pytest.mark.parametrize("encoder_name", ["bag_of_words", "sentence_transformer"])
+def test_borderline_queries_fall_through_to_the_llm(request, encoder_name):
+    encoder = (
+        BagOfWordsEncoder()
+        if encoder_name == "bag_of_words"
+        else request.getfixturevalue("sentence_encoder")
+    )
+    classifier = IntentClassifier(encoder=encoder)
+    for text in load_held_out_queries()["borderline"]:
+        # only greetings are answered locally, every other query type goes to the LLM
+        assert classifier.classify(text) != "general_chat", text
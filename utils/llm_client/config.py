@@ -0,0 +1,67 @@
+import os
+
+# BACKENDS
+HOSTED_BACKEND = "groq"
+LOCAL_BACKEND = "ollama"
+FAKE_BACKEND = "fake"
+# Set LLM_BACKEND=fake to run the whole pipeline offline against FakeChatModel
+LLM_BACKEND = os.getenv("LLM_BACKEND", HOSTED_BACKEND)
+DEFAULT_GROQ_MODEL = "gemma2-9b-it"
+DEFAULT_OLLAMA_MODEL = "llama3.2"
+# The local backend is only used when an Ollama compatible endpoint is configured
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL")
+
+# ROUTING
+# Short classification prompts that a small local model answers well
+LOCAL_PROMPT_NAMES = [
+    "identify_query_type",
+    "identify_location",
+    "identify_job_name",
+]
+# Prompts longer than this always go to the hosted model
+LOCAL_MAX_PROMPT_CHARS = 4000
+RATE_LIMIT_STATUS_CODES = [429]
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+# Stream single key JSON answers and stop generating once the key's value is complete
+EARLY_RETURN_JSON = True
+# Prompts ask_llm_many keeps in flight at once
+LLM_MAX_CONCURRENCY = 4
+
+# RESPONSE CACHE
+RESPONSE_CACHE_MAX_SIZE = 2048
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Set to a sqlite file path to keep cached responses across restarts and processes
+RESPONSE_CACHE_PATH = os.getenv("LLM_RESPONSE_CACHE_PATH")
+
+# METRICS
+# An absolute default, so metrics never land in whichever directory the process started in
+LLM_METRICS_PATH = os.path.abspath(
+    os.getenv(
+        "LLM_METRICS_PATH",
+        os.path.join(
+            os.path.expanduser("~"), ".cache", "job_search_chatbot", "llm_metrics.jsonl"
+        ),
+    )
+)
+# Metrics are buffered and appended by a background thread at this interval, or sooner
+# once this many are waiting
+LLM_METRICS_FLUSH_SECONDS = 5.0
+LLM_METRICS_MAX_BUFFERED = 500
+# The metrics file is rotated to .1, .2 ... past this size, keeping this many old files
+LLM_METRICS_MAX_BYTES = 10 * 1024 * 1024
+LLM_METRICS_BACKUP_COUNT = 3
+# Rough chars per token, used when a backend does not report token usage
+CHARS_PER_TOKEN = 4
+
+# RATE LIMITS AND RETRIES
+INTERACTIVE_PRIORITY = "interactive"
+BACKGROUND_PRIORITY = "background"
+# Client side limits per backend, kept at or below the provider quota
+RATE_LIMITS_BY_BACKEND = {
+    HOSTED_BACKEND: {"requests_per_minute": 30, "tokens_per_minute": 15000},
+}
+# Completion size assumed when reserving tokens, corrected once the usage is known
+EXPECTED_OUTPUT_TOKENS = 256
+MAX_RETRIES = 3
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 30.0
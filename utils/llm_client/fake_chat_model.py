@@ -0,0 +1,325 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from prompts.system_prompts import (
+    system_prompt_to_identify_query_type,
+    system_prompt_to_identify_job,
+    system_prompt_to_identify_location,
+    system_prompt_to_summarise_queries,
+    system_prompt_to_extract_resume_details,
+    system_prompt_to_extract_job_features,
+    system_prompt_to_extract_job_details_for_gap_analysis,
+    system_prompt_to_do_gap_analysis,
+    system_prompt_to_extract_query_details,
+)
+from utils.llm_client.config import CHARS_PER_TOKEN
+from utils.locanto_scraper.config import DEFAULT_JOB_TO_SEARCH
+from utils.skill_vocabulary.config import SKILL_ALIASES
+
+FAKE_LOCATIONS = [
+    "sydney",
+    "melbourne",
+    "brisbane",
+    "perth",
+    "adelaide",
+    "hobart",
+    "darwin",
+    "canberra",
+    "gold coast",
+    "newcastle",
+]
+JOB_PATTERN = re.compile(
+    r"([a-z][a-z ]{2,40}?)\s+(?:jobs?|roles?|positions?|vacanc(?:y|ies)|openings?)\b"
+)
+URL_PATTERN = re.compile(r"https?://\S+")
+SKILL_PATTERNS = [
+    (canonical, re.compile(r"(?<!\w)" + re.escape(alias) + r"(?!\w)", re.IGNORECASE))
+    for canonical, aliases in SKILL_ALIASES.items()
+    for alias in [canonical, *aliases]
+    if len(alias) > 2
+]
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline chat model answering the prompts in prompts/ from rules or fixtures.
+    Latency, errors and token usage are simulated from a seeded random generator."""
+
+    # user prompt substring -> canonical response, checked before the rules
+    fixtures: dict[str, str] = {}
+    time_to_first_token_mean: float = 0.0
+    time_to_first_token_std: float = 0.0
+    seconds_per_token: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    chars_per_token: int = CHARS_PER_TOKEN
+    seed: int = 0
+    _random: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context: Any):
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def respond(self, messages: list[BaseMessage]) -> str:
+        system_prompt = " ".join(
+            m.content for m in messages if m.type == "system"
+        ).strip()
+        user_prompt = " ".join(m.content for m in messages if m.type == "human")
+        for fixture_key, fixture_response in self.fixtures.items():
+            if fixture_key in user_prompt:
+                return fixture_response
+        for prompt, rule in PROMPT_RULES:
+            if prompt.strip() in system_prompt:
+                return rule(user_prompt)
+        return "I am a fake model and have no rule for this prompt."
+
+    def sample_latency(self) -> tuple[float, float]:
+        """Returns the time to first token and the per token delay of one call"""
+        time_to_first_token = max(
+            0.0,
+            self._random.gauss(
+                self.time_to_first_token_mean, self.time_to_first_token_std
+            ),
+        )
+        return time_to_first_token, self.seconds_per_token
+
+    def maybe_fail(self):
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError("Simulated rate limit")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise RuntimeError("Simulated LLM failure")
+
+    def token_chunks(self, text: str) -> list[str]:
+        return re.findall(r"\s*\S+|\s+", text) or [""]
+
+    def usage(self, messages: list[BaseMessage], text: str) -> dict:
+        input_tokens = sum(len(m.content) for m in messages) // self.chars_per_token
+        output_tokens = len(text) // self.chars_per_token
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        chunks = list(self._stream(messages, stop=stop, run_manager=run_manager))
+        text = "".join(chunk.message.content for chunk in chunks)
+        message = AIMessage(content=text, usage_metadata=self.usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self.maybe_fail()
+        text = self.respond(messages)
+        time_to_first_token, seconds_per_token = self.sample_latency()
+        time.sleep(time_to_first_token)
+        token_chunks = self.token_chunks(text)
+        for i, token in enumerate(token_chunks):
+            if i:
+                time.sleep(seconds_per_token)
+            usage = self.usage(messages, text) if i == len(token_chunks) - 1 else None
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=token, usage_metadata=usage)
+            )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self.maybe_fail()
+        text = self.respond(messages)
+        time_to_first_token, seconds_per_token = self.sample_latency()
+        await asyncio.sleep(time_to_first_token)
+        token_chunks = self.token_chunks(text)
+        for i, token in enumerate(token_chunks):
+            if i:
+                await asyncio.sleep(seconds_per_token)
+            usage = self.usage(messages, text) if i == len(token_chunks) - 1 else None
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=token, usage_metadata=usage)
+            )
+
+
+def text_after(user_prompt: str, marker: str) -> str:
+    return user_prompt.rsplit(marker, 1)[-1].strip()
+
+
+def find_skills(text: str) -> list[str]:
+    return [canonical for canonical, pattern in SKILL_PATTERNS if pattern.search(text)]
+
+
+def fake_query_type(user_prompt: str) -> str:
+    query = text_after(user_prompt, "user query:").lower()
+    if "gap" in query or "http" in query:
+        query_type = "job_gap_analysis"
+    elif ("resume" in query or "cv" in query) and re.search(
+        r"suggest|match|recommend|suit", query
+    ):
+        query_type = "suggest_jobs_by_resume"
+    elif re.search(r"\bjobs?\b|\broles?\b|\bpositions?\b|hiring|vacanc", query):
+        query_type = "job_search"
+    else:
+        query_type = "general_chat"
+    return json.dumps({"query_type": query_type})
+
+
+def fake_job_name(user_prompt: str) -> str:
+    query = text_after(user_prompt, "user query:").lower()
+    match = JOB_PATTERN.search(query)
+    job_position = match.group(1).split(" for ")[-1] if match else DEFAULT_JOB_TO_SEARCH
+    job_position = re.sub(
+        r"^(?:(?:find|show|search|get|me|any|some|latest)\b\s*)+", "", job_position
+    )
+    return json.dumps({"job_position": job_position.strip() or DEFAULT_JOB_TO_SEARCH})
+
+
+def fake_location(user_prompt: str) -> str:
+    query = text_after(user_prompt, "user query:").lower()
+    location = next((city for city in FAKE_LOCATIONS if city in query), "Australia")
+    return json.dumps({"location": location.title()})
+
+
+def fake_summary(user_prompt: str) -> str:
+    match = re.search(
+        r'Latest user query or computer response: "(.*)"', user_prompt, re.S
+    )
+    return match.group(1).strip() if match else user_prompt.strip()
+
+
+def fake_resume_details(user_prompt: str) -> str:
+    resume_text = text_after(user_prompt, "CV:")
+    years = re.search(r"(\d+)\+?\s+years", resume_text)
+    return json.dumps(
+        {
+            "CORE_SKILLS": find_skills(resume_text),
+            "SECONDARY_SKILLS": [],
+            "SOFT_SKILLS": [],
+            "YEARS_OF_EXPERIENCE": int(years.group(1)) if years else 0,
+            "EDUCATION": [],
+            "TECHNOLOGIES_USED": [],
+            "LOCATION": "",
+            "MOBILITY": "",
+            "CERTIFICATIONS": [],
+            "RAW_TEXT": resume_text,
+        }
+    )
+
+
+def fake_job_features(user_prompt: str) -> str:
+    description = text_after(user_prompt, "Job Description:")
+    years = re.search(r"\d+\+?(?:\s*-\s*\d+)?\s+years", description)
+    return json.dumps(
+        {
+            "required_skills": find_skills(description),
+            "preferred_skills": [],
+            "experience_level": years.group(0) if years else "",
+            "education": [],
+            "technologies": [],
+            "soft_skills": [],
+            "salary_range": "",
+            "employment_type": "full-time",
+        }
+    )
+
+
+def fake_gap_analysis_job_details(user_prompt: str) -> str:
+    query = text_after(user_prompt, "Query:")
+    url = URL_PATTERN.search(query)
+    job = JOB_PATTERN.search(query.lower())
+    return json.dumps(
+        {
+            "job_position": job.group(1) if job else None,
+            "company_name": None,
+            "suburb": None,
+            "url": url.group(0) if url else None,
+        }
+    )
+
+
+def fake_gap_analysis(user_prompt: str) -> str:
+    if "Matched skills:" in user_prompt:
+        strengths = diff_line_items(user_prompt, "Matched skills:")
+        gaps = diff_line_items(user_prompt, "Missing required skills:")
+    else:
+        job_description, _, resume = user_prompt.partition("Here is my resume:")
+        job_skills = set(find_skills(job_description))
+        resume_skills = set(find_skills(resume))
+        strengths = sorted(job_skills & resume_skills)
+        gaps = sorted(job_skills - resume_skills)
+    strengths = strengths or ["General experience"]
+    gaps = gaps or ["No major gaps found"]
+    return (
+        "Strengths\n"
+        + "".join(f"- {skill}\n" for skill in strengths)
+        + "\nGaps\n"
+        + "".join(f"- {skill}\n" for skill in gaps)
+    )
+
+
+def fake_query_details(user_prompt: str) -> str:
+    match = re.search(r'Latest user message: "(.*)"', user_prompt, re.S)
+    message = match.group(1).strip() if match else user_prompt.strip()
+    query = f"user query: {message}"
+    query_type = json.loads(fake_query_type(query))["query_type"]
+    url = URL_PATTERN.search(message)
+    return json.dumps(
+        {
+            "query_type": query_type,
+            "job_position": json.loads(fake_job_name(query))["job_position"],
+            "location": json.loads(fake_location(query))["location"],
+            "company_name": None,
+            "url": url.group(0) if url else None,
+        }
+    )
+
+
+def diff_line_items(user_prompt: str, label: str) -> list[str]:
+    """Items of one line of a precomputed skill diff"""
+    line = text_after(user_prompt, label).splitlines()[0].strip()
+    return [] if line == "none" else [item.strip() for item in line.split(",")]
+
+
+PROMPT_RULES = [
+    (system_prompt_to_extract_query_details, fake_query_details),
+    (system_prompt_to_identify_query_type, fake_query_type),
+    (system_prompt_to_identify_job, fake_job_name),
+    (system_prompt_to_identify_location, fake_location),
+    (system_prompt_to_summarise_queries, fake_summary),
+    (system_prompt_to_extract_resume_details, fake_resume_details),
+    (system_prompt_to_extract_job_features, fake_job_features),
+    (
+        system_prompt_to_extract_job_details_for_gap_analysis,
+        fake_gap_analysis_job_details,
+    ),
+    (system_prompt_to_do_gap_analysis, fake_gap_analysis),
+]
@@ -1,5 +1,8 @@
+import asyncio
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
 
 
 def extract_json_from_response(response: str) -> dict:
@@ -23,3 +26,13 @@ def extract_json_from_response(response: str) -> dict:
         json_response = json.loads(response)
         return json_response
     return {}
+
+
+def run_coroutine_sync(coroutine: Coroutine) -> Any:
+    """Runs a coroutine from sync code, also when the calling thread already runs a loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
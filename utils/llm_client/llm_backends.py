@@ -0,0 +1,211 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessageChunk
+from langchain_groq import ChatGroq
+from langchain_ollama import ChatOllama
+
+from utils.llm_client.config import (
+    HOSTED_BACKEND,
+    LOCAL_BACKEND,
+    FAKE_BACKEND,
+    LLM_BACKEND,
+    DEFAULT_GROQ_MODEL,
+    DEFAULT_OLLAMA_MODEL,
+    OLLAMA_BASE_URL,
+    RATE_LIMIT_STATUS_CODES,
+    RETRYABLE_STATUS_CODES,
+    CHARS_PER_TOKEN,
+)
+from utils.llm_client.fake_chat_model import FakeChatModel
+from utils.llm_client.streaming_json import IncrementalJsonKeyParser
+
+
+@dataclass
+class BackendResponse:
+    content: str
+    input_tokens: int
+    output_tokens: int
+    time_to_first_token: float | None = None
+    stopped_early: bool = False
+    # set by LLMInteraction to the backend that produced the response
+    backend_name: str | None = None
+
+
+class LLMBackend(ABC):
+    """A named chat model that LLMInteraction can route prompts to"""
+
+    name: str
+
+    def __init__(self, model: str):
+        self.model = model
+        self.llm = self.build_chat_model()
+
+    @abstractmethod
+    def build_chat_model(self) -> BaseChatModel:
+        """Creates the langchain chat model used for this backend"""
+
+    def invoke(
+        self, messages: list, parser: IncrementalJsonKeyParser | None = None
+    ) -> BackendResponse:
+        """Streams the completion so the time to first token can be measured.
+        With a parser, the stream is closed as soon as the parser has its value."""
+        started_at = time.perf_counter()
+        time_to_first_token = None
+        message = None
+        stopped_early = False
+        stream = self.llm.stream(messages)
+        try:
+            for chunk in stream:
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - started_at
+                message = chunk if message is None else message + chunk
+                if parser is not None and parser.feed(chunk.content):
+                    stopped_early = True
+                    break
+        finally:
+            stream.close()
+        return self.to_backend_response(
+            messages=messages,
+            message=message,
+            time_to_first_token=time_to_first_token,
+            stopped_early=stopped_early,
+        )
+
+    def stream(self, messages: list) -> Iterator[BaseMessageChunk]:
+        """Yields raw message chunks, for answers streamed straight to the user"""
+        return self.llm.stream(messages)
+
+    async def ainvoke(
+        self, messages: list, parser: IncrementalJsonKeyParser | None = None
+    ) -> BackendResponse:
+        started_at = time.perf_counter()
+        time_to_first_token = None
+        message = None
+        stopped_early = False
+        stream = self.llm.astream(messages)
+        try:
+            async for chunk in stream:
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - started_at
+                message = chunk if message is None else message + chunk
+                if parser is not None and parser.feed(chunk.content):
+                    stopped_early = True
+                    break
+        finally:
+            await stream.aclose()
+        return self.to_backend_response(
+            messages=messages,
+            message=message,
+            time_to_first_token=time_to_first_token,
+            stopped_early=stopped_early,
+        )
+
+    @staticmethod
+    def to_backend_response(
+        messages: list,
+        message: Any,
+        time_to_first_token: float | None,
+        stopped_early: bool = False,
+    ) -> BackendResponse:
+        """Uses the token usage reported by the provider, estimating it when missing"""
+        content = message.content if message is not None else ""
+        usage = getattr(message, "usage_metadata", None) or {}
+        input_tokens = (
+            usage.get("input_tokens")
+            or sum(len(m.content) for m in messages) // CHARS_PER_TOKEN
+        )
+        output_tokens = usage.get("output_tokens") or len(content) // CHARS_PER_TOKEN
+        return BackendResponse(
+            content=content,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            time_to_first_token=time_to_first_token,
+            stopped_early=stopped_early,
+        )
+
+    @staticmethod
+    def error_status_code(error: Exception) -> int | None:
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        return status_code
+
+    @staticmethod
+    def is_connection_error(error: Exception) -> bool:
+        return isinstance(error, (ConnectionError, httpx.TransportError)) or (
+            type(error).__name__ == "APIConnectionError"
+        )
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        return self.error_status_code(error) in RATE_LIMIT_STATUS_CODES
+
+    def should_fail_over(self, error: Exception) -> bool:
+        """Rate limits and unreachable endpoints are handed to the next backend"""
+        return self.is_rate_limited(error) or self.is_connection_error(error)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Transient errors worth retrying on the same backend after a backoff"""
+        return self.error_status_code(
+            error
+        ) in RETRYABLE_STATUS_CODES or self.is_connection_error(error)
+
+
+class GroqBackend(LLMBackend):
+    name = HOSTED_BACKEND
+
+    def __init__(self, model: str = DEFAULT_GROQ_MODEL, api_key: str = None):
+        self.api_key = api_key
+        super().__init__(model=model)
+
+    def build_chat_model(self) -> BaseChatModel:
+        if self.api_key is None:
+            return ChatGroq(model=self.model, temperature=0)
+        return ChatGroq(model=self.model, temperature=0, api_key=self.api_key)
+
+
+class OllamaBackend(LLMBackend):
+    name = LOCAL_BACKEND
+
+    def __init__(
+        self,
+        model: str = DEFAULT_OLLAMA_MODEL,
+        base_url: str = OLLAMA_BASE_URL,
+    ):
+        self.base_url = base_url
+        super().__init__(model=model)
+
+    def build_chat_model(self) -> BaseChatModel:
+        return ChatOllama(model=self.model, base_url=self.base_url, temperature=0)
+
+
+class FakeBackend(LLMBackend):
+    """Offline backend for tests, benchmarks and load tests. It can take the name of
+    a real backend to exercise routing, rate limiting and failover."""
+
+    def __init__(
+        self,
+        name: str = FAKE_BACKEND,
+        model: str = "fake-chat-model",
+        **fake_model_settings,
+    ):
+        self.name = name
+        self.fake_model_settings = fake_model_settings
+        super().__init__(model=model)
+
+    def build_chat_model(self) -> BaseChatModel:
+        return FakeChatModel(**self.fake_model_settings)
+
+
+def default_backends(model: str = DEFAULT_GROQ_MODEL, api_key: str = None):
+    """Groq is always available, the local model only when OLLAMA_BASE_URL is set"""
+    if LLM_BACKEND == FAKE_BACKEND:
+        return [FakeBackend()]
+    backends = [GroqBackend(model=model, api_key=api_key)]
+    if OLLAMA_BASE_URL:
+        backends.append(OllamaBackend(base_url=OLLAMA_BASE_URL))
+    return backends
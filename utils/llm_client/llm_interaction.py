@@ -1,25 +1,80 @@
+import asyncio
 import json
 import logging
-from typing import Any
+import time
+from typing import Any, Iterator
 
 from dotenv import load_dotenv
 import os
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_groq import ChatGroq
 
-from utils.llm_client.helper_functions import extract_json_from_response
+from utils.llm_client.config import (
+    DEFAULT_GROQ_MODEL,
+    LLM_MAX_CONCURRENCY,
+    INTERACTIVE_PRIORITY,
+    EXPECTED_OUTPUT_TOKENS,
+    CHARS_PER_TOKEN,
+    EARLY_RETURN_JSON,
+    LLM_BACKEND,
+    FAKE_BACKEND,
+)
+from utils.llm_client.helper_functions import (
+    extract_json_from_response,
+    run_coroutine_sync,
+)
+from utils.llm_client.llm_backends import (
+    BackendResponse,
+    LLMBackend,
+    default_backends,
+)
+from utils.llm_client.llm_metrics import (
+    MetricsSink,
+    JsonLinesMetricsSink,
+    WALL_TIME_SECONDS,
+    TIME_TO_FIRST_TOKEN_SECONDS,
+    INPUT_TOKENS,
+    OUTPUT_TOKENS,
+    REQUESTS_TOTAL,
+    CACHE_HITS_TOTAL,
+    JSON_REPAIRS_TOTAL,
+    EARLY_RETURNS_TOTAL,
+    ERRORS_TOTAL,
+)
+from utils.llm_client.rate_limiter import RetryPolicy, get_shared_rate_limiter
+from utils.llm_client.response_cache import ResponseCache
+from utils.llm_client.streaming_json import IncrementalJsonKeyParser
+from utils.llm_client.routing_policy import RoutingPolicy
 
 load_dotenv()
 
 
 class LLMInteraction:
-    def __init__(self, model: str = "gemma2-9b-it", api_key: str = None):
-        if api_key is None:
-            try:
-                os.getenv("GROQ_API_KEY")
-            except KeyError:
+    def __init__(
+        self,
+        model: str = DEFAULT_GROQ_MODEL,
+        api_key: str = None,
+        backends: list[LLMBackend] = None,
+        routing_policy: RoutingPolicy = None,
+        response_cache: ResponseCache = None,
+        metrics_sink: MetricsSink = None,
+        retry_policy: RetryPolicy = None,
+        early_return_json: bool = EARLY_RETURN_JSON,
+    ):
+        if api_key is None and backends is None and LLM_BACKEND != FAKE_BACKEND:
+            if os.getenv("GROQ_API_KEY") is None:
                 logging.error("GROQ_API_KEY environment variable not set")
-        self.llm = ChatGroq(model=model, temperature=0)
+        if backends is None:
+            backends = default_backends(model=model, api_key=api_key)
+        self.backends = {backend.name: backend for backend in backends}
+        self.routing_policy = routing_policy or RoutingPolicy()
+        self.response_cache = response_cache or ResponseCache()
+        self.metrics_sink = metrics_sink or JsonLinesMetricsSink()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.early_return_json = early_return_json
+        self.rate_limiters = {
+            name: get_shared_rate_limiter(name) for name in self.backends
+        }
+        self.llm = backends[0].llm
 
     def ask_llm(
         self,
@@ -27,30 +82,549 @@ class LLMInteraction:
         user_prompt: str,
         json_key: str | None = None,
         response_type: str = "json",
+        prompt_name: str | None = None,
+        use_cache: bool = True,
+        priority: str = INTERACTIVE_PRIORITY,
+    ) -> Any:
+        """Asks the routed backend, serving repeated identical prompts from the response cache"""
+        backend_names, cache_request = self.route_request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            json_key=json_key,
+            response_type=response_type,
+            prompt_name=prompt_name,
+            use_cache=use_cache,
+        )
+        cached_response = self.get_cached_response(
+            cache_key=self.cache_key(cache_request, backend_name=backend_names[0]),
+            prompt_name=prompt_name,
+        )
+        if cached_response is not None:
+            return self.parse_response(
+                response=cached_response,
+                json_key=json_key,
+                response_type=response_type,
+                prompt_name=prompt_name,
+            )
+
+        messages = self.build_messages(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_type=response_type,
+        )
+        parser = self.json_key_parser(json_key=json_key, response_type=response_type)
+        response = self.invoke_with_failover(
+            messages=messages,
+            backend_names=backend_names,
+            prompt_name=prompt_name,
+            priority=priority,
+            parser=parser,
+        )
+        return self.parse_and_cache_response(
+            response=response.content,
+            cache_key=self.cache_key(cache_request, backend_name=response.backend_name),
+            json_key=json_key,
+            response_type=response_type,
+            prompt_name=prompt_name,
+            parser=parser,
+        )
+
+    async def ask_llm_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_key: str | None = None,
+        response_type: str = "json",
+        prompt_name: str | None = None,
+        use_cache: bool = True,
+        priority: str = INTERACTIVE_PRIORITY,
     ) -> Any:
+        """Async version of ask_llm built on the chat model's ainvoke"""
+        backend_names, cache_request = self.route_request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            json_key=json_key,
+            response_type=response_type,
+            prompt_name=prompt_name,
+            use_cache=use_cache,
+        )
+        cached_response = self.get_cached_response(
+            cache_key=self.cache_key(cache_request, backend_name=backend_names[0]),
+            prompt_name=prompt_name,
+        )
+        if cached_response is not None:
+            return self.parse_response(
+                response=cached_response,
+                json_key=json_key,
+                response_type=response_type,
+                prompt_name=prompt_name,
+            )
+
+        messages = self.build_messages(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_type=response_type,
+        )
+        parser = self.json_key_parser(json_key=json_key, response_type=response_type)
+        response = await self.invoke_with_failover_async(
+            messages=messages,
+            backend_names=backend_names,
+            prompt_name=prompt_name,
+            priority=priority,
+            parser=parser,
+        )
+        return self.parse_and_cache_response(
+            response=response.content,
+            cache_key=self.cache_key(cache_request, backend_name=response.backend_name),
+            json_key=json_key,
+            response_type=response_type,
+            prompt_name=prompt_name,
+            parser=parser,
+        )
+
+    def stream_llm(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        prompt_name: str | None = None,
+        use_cache: bool = True,
+        priority: str = INTERACTIVE_PRIORITY,
+    ) -> Iterator[str]:
+        """Yields a text answer chunk by chunk as it is generated. Failover and retries
+        only happen before the first chunk; later errors are raised to the consumer."""
+        backend_names, cache_request = self.route_request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            json_key=None,
+            response_type="text",
+            prompt_name=prompt_name,
+            use_cache=use_cache,
+        )
+        cached_response = self.get_cached_response(
+            cache_key=self.cache_key(cache_request, backend_name=backend_names[0]),
+            prompt_name=prompt_name,
+        )
+        if cached_response is not None:
+            yield cached_response
+            return
+
+        messages = self.build_messages(
+            system_prompt=system_prompt, user_prompt=user_prompt, response_type="text"
+        )
+        started_at = time.perf_counter()
+        for i, backend_name in enumerate(backend_names):
+            is_last_backend = i == len(backend_names) - 1
+            backend = self.backends[backend_name]
+            rate_limiter = self.rate_limiters.get(backend_name)
+            estimated_tokens = self.estimate_tokens(messages)
+            attempt = 0
+            while True:
+                message = None
+                time_to_first_token = None
+                try:
+                    if rate_limiter is not None:
+                        rate_limiter.acquire(tokens=estimated_tokens, priority=priority)
+                    for chunk in backend.stream(messages):
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - started_at
+                        message = chunk if message is None else message + chunk
+                        yield chunk.content
+                except Exception as e:
+                    if message is not None:
+                        self.record_error(
+                            prompt_name=prompt_name,
+                            error=e,
+                            stage="stream",
+                            backend=backend_name,
+                        )
+                        raise
+                    delay = self.handle_backend_error(
+                        error=e,
+                        backend_name=backend_name,
+                        prompt_name=prompt_name,
+                        attempt=attempt,
+                        next_backend=None if is_last_backend else backend_names[i + 1],
+                    )
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+                    attempt += 1
+                else:
+                    response = backend.to_backend_response(
+                        messages=messages,
+                        message=message,
+                        time_to_first_token=time_to_first_token,
+                    )
+                    if rate_limiter is not None:
+                        rate_limiter.record_usage(
+                            estimated_tokens=estimated_tokens,
+                            actual_tokens=response.input_tokens
+                            + response.output_tokens,
+                        )
+                    self.record_backend_response(
+                        prompt_name=prompt_name,
+                        backend_name=backend_name,
+                        response=response,
+                        started_at=started_at,
+                    )
+                    if cache_request is not None:
+                        self.response_cache.set(
+                            self.cache_key(cache_request, backend_name=backend_name),
+                            response.content,
+                        )
+                    return
+
+    def ask_llm_many(
+        self, prompts: list[dict], max_concurrency: int = LLM_MAX_CONCURRENCY
+    ) -> list[Any]:
+        """Runs ask_llm for each dict of keyword arguments concurrently.
+        Results keep the order of prompts; a failed prompt returns its exception."""
+        return run_coroutine_sync(
+            self.ask_llm_many_async(prompts=prompts, max_concurrency=max_concurrency)
+        )
+
+    async def ask_llm_many_async(
+        self, prompts: list[dict], max_concurrency: int = LLM_MAX_CONCURRENCY
+    ) -> list[Any]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def ask_with_semaphore(prompt_kwargs: dict) -> Any:
+            async with semaphore:
+                return await self.ask_llm_async(**prompt_kwargs)
+
+        return await asyncio.gather(
+            *[ask_with_semaphore(prompt_kwargs) for prompt_kwargs in prompts],
+            return_exceptions=True,
+        )
+
+    def route_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        json_key: str | None,
+        response_type: str,
+        prompt_name: str | None,
+        use_cache: bool,
+    ) -> tuple[list[str], dict | None]:
+        """Returns the backends to try, in order, and the request fields of the cache
+        key, None when the response should not be cached"""
+        backend_names = self.routing_policy.route(
+            prompt_name=prompt_name,
+            prompt_chars=len(system_prompt) + len(user_prompt),
+            available_backends=list(self.backends),
+        )
+        if not use_cache:
+            return backend_names, None
+        cache_request = dict(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_type=response_type,
+            json_key=json_key,
+        )
+        return backend_names, cache_request
+
+    def cache_key(self, cache_request: dict | None, backend_name: str) -> str | None:
+        """Keys name the backend and model, so responses are stored under the backend
+        that actually answered and a failover answer is never served as the primary's"""
+        if cache_request is None:
+            return None
+        backend = self.backends[backend_name]
+        return self.response_cache.make_key(
+            model=f"{backend.name}:{backend.model}", **cache_request
+        )
+
+    def get_cached_response(
+        self, cache_key: str | None, prompt_name: str | None
+    ) -> str | None:
+        if cache_key is None:
+            return None
+        started_at = time.perf_counter()
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            labels = {"prompt_name": prompt_name or "unlabelled", "backend": "cache"}
+            self.metrics_sink.increment(CACHE_HITS_TOTAL, labels=labels)
+            self.metrics_sink.observe(
+                WALL_TIME_SECONDS, time.perf_counter() - started_at, labels=labels
+            )
+        return cached_response
+
+    def json_key_parser(
+        self, json_key: str | None, response_type: str
+    ) -> IncrementalJsonKeyParser | None:
+        """Single key JSON answers can return as soon as their value is streamed"""
+        if self.early_return_json and json_key is not None and response_type == "json":
+            return IncrementalJsonKeyParser(json_key=json_key)
+        return None
+
+    def parse_and_cache_response(
+        self,
+        response: str,
+        cache_key: str | None,
+        json_key: str | None,
+        response_type: str,
+        prompt_name: str | None = None,
+        parser: IncrementalJsonKeyParser | None = None,
+    ) -> Any:
+        """Responses are only cached once they parse"""
+        if parser is not None and parser.complete:
+            self.metrics_sink.increment(
+                EARLY_RETURNS_TOTAL, labels={"prompt_name": prompt_name or "unlabelled"}
+            )
+            if cache_key is not None:
+                self.response_cache.set(cache_key, json.dumps(parser.result()))
+            return parser.value
+        parsed_response = self.parse_response(
+            response=response,
+            json_key=json_key,
+            response_type=response_type,
+            prompt_name=prompt_name,
+        )
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        return parsed_response
+
+    @staticmethod
+    def build_messages(
+        system_prompt: str, user_prompt: str, response_type: str = "json"
+    ) -> list:
         enhanced_system_prompt = system_prompt
         if response_type == "json":
             enhanced_system_prompt = f"""
                     {system_prompt}
-                    
-    
+
+
                     Respond ONLY with the JSON object, no additional text.
                     """
 
-        messages = [
+        return [
             SystemMessage(content=enhanced_system_prompt),
             HumanMessage(content=user_prompt),
         ]
 
-        response = self.llm.invoke(messages).content
+    def invoke_with_failover(
+        self,
+        messages: list,
+        backend_names: list[str],
+        prompt_name: str | None,
+        priority: str = INTERACTIVE_PRIORITY,
+        parser: IncrementalJsonKeyParser | None = None,
+    ) -> BackendResponse:
+        """Sends the prompt to the routed backends in order. Rate limits move on to the
+        next backend; on the last one transient errors are retried with backoff."""
+        started_at = time.perf_counter()
+        for i, backend_name in enumerate(backend_names):
+            is_last_backend = i == len(backend_names) - 1
+            attempt = 0
+            while True:
+                try:
+                    response = self.invoke_backend(
+                        backend_name=backend_name,
+                        messages=messages,
+                        priority=priority,
+                        parser=parser,
+                    )
+                except Exception as e:
+                    delay = self.handle_backend_error(
+                        error=e,
+                        backend_name=backend_name,
+                        prompt_name=prompt_name,
+                        attempt=attempt,
+                        next_backend=None if is_last_backend else backend_names[i + 1],
+                    )
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+                    attempt += 1
+                else:
+                    self.record_backend_response(
+                        prompt_name=prompt_name,
+                        backend_name=backend_name,
+                        response=response,
+                        started_at=started_at,
+                    )
+                    return response
+
+    async def invoke_with_failover_async(
+        self,
+        messages: list,
+        backend_names: list[str],
+        prompt_name: str | None,
+        priority: str = INTERACTIVE_PRIORITY,
+        parser: IncrementalJsonKeyParser | None = None,
+    ) -> BackendResponse:
+        started_at = time.perf_counter()
+        for i, backend_name in enumerate(backend_names):
+            is_last_backend = i == len(backend_names) - 1
+            attempt = 0
+            while True:
+                try:
+                    response = await self.invoke_backend_async(
+                        backend_name=backend_name,
+                        messages=messages,
+                        priority=priority,
+                        parser=parser,
+                    )
+                except Exception as e:
+                    delay = self.handle_backend_error(
+                        error=e,
+                        backend_name=backend_name,
+                        prompt_name=prompt_name,
+                        attempt=attempt,
+                        next_backend=None if is_last_backend else backend_names[i + 1],
+                    )
+                    if delay is None:
+                        break
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                else:
+                    self.record_backend_response(
+                        prompt_name=prompt_name,
+                        backend_name=backend_name,
+                        response=response,
+                        started_at=started_at,
+                    )
+                    return response
+
+    def invoke_backend(
+        self,
+        backend_name: str,
+        messages: list,
+        priority: str,
+        parser: IncrementalJsonKeyParser | None = None,
+    ) -> BackendResponse:
+        """Waits for rate limiter capacity, then calls the backend"""
+        rate_limiter = self.rate_limiters.get(backend_name)
+        estimated_tokens = self.estimate_tokens(messages)
+        if rate_limiter is not None:
+            rate_limiter.acquire(tokens=estimated_tokens, priority=priority)
+        if parser is not None:
+            parser.reset()
+        response = self.backends[backend_name].invoke(messages, parser=parser)
+        response.backend_name = backend_name
+        if rate_limiter is not None:
+            rate_limiter.record_usage(
+                estimated_tokens=estimated_tokens,
+                actual_tokens=response.input_tokens + response.output_tokens,
+            )
+        return response
+
+    async def invoke_backend_async(
+        self,
+        backend_name: str,
+        messages: list,
+        priority: str,
+        parser: IncrementalJsonKeyParser | None = None,
+    ) -> BackendResponse:
+        rate_limiter = self.rate_limiters.get(backend_name)
+        estimated_tokens = self.estimate_tokens(messages)
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async(tokens=estimated_tokens, priority=priority)
+        if parser is not None:
+            parser.reset()
+        response = await self.backends[backend_name].ainvoke(messages, parser=parser)
+        response.backend_name = backend_name
+        if rate_limiter is not None:
+            rate_limiter.record_usage(
+                estimated_tokens=estimated_tokens,
+                actual_tokens=response.input_tokens + response.output_tokens,
+            )
+        return response
+
+    @staticmethod
+    def estimate_tokens(messages: list) -> int:
+        prompt_chars = sum(len(message.content) for message in messages)
+        return prompt_chars // CHARS_PER_TOKEN + EXPECTED_OUTPUT_TOKENS
+
+    def handle_backend_error(
+        self,
+        error: Exception,
+        backend_name: str,
+        prompt_name: str | None,
+        attempt: int,
+        next_backend: str | None,
+    ) -> float | None:
+        """Returns the delay before retrying the same backend, None to fail over
+        to next_backend, and re-raises when neither is possible"""
+        self.record_error(
+            prompt_name=prompt_name, error=error, stage="invoke", backend=backend_name
+        )
+        backend = self.backends[backend_name]
+        if next_backend is not None and backend.should_fail_over(error):
+            logging.warning(
+                f"LLM backend '{backend_name}' failed for prompt '{prompt_name}', "
+                f"failing over to '{next_backend}': {error}"
+            )
+            return None
+        if attempt >= self.retry_policy.max_retries or not backend.is_retryable(error):
+            raise error
+        delay = self.retry_policy.delay(attempt=attempt, error=error)
+        rate_limiter = self.rate_limiters.get(backend_name)
+        if rate_limiter is not None and backend.is_rate_limited(error):
+            # The limiter holds back every caller, including this retry
+            rate_limiter.pause(delay)
+            delay = 0.0
+        logging.warning(
+            f"LLM backend '{backend_name}' failed for prompt '{prompt_name}', "
+            f"retrying in {delay:.1f}s (attempt {attempt + 1}): {error}"
+        )
+        return delay
+
+    def record_backend_response(
+        self,
+        prompt_name: str | None,
+        backend_name: str,
+        response: BackendResponse,
+        started_at: float,
+    ):
+        labels = {"prompt_name": prompt_name or "unlabelled", "backend": backend_name}
+        self.metrics_sink.increment(REQUESTS_TOTAL, labels=labels)
+        self.metrics_sink.observe(
+            WALL_TIME_SECONDS, time.perf_counter() - started_at, labels=labels
+        )
+        if response.time_to_first_token is not None:
+            self.metrics_sink.observe(
+                TIME_TO_FIRST_TOKEN_SECONDS, response.time_to_first_token, labels=labels
+            )
+        self.metrics_sink.observe(INPUT_TOKENS, response.input_tokens, labels=labels)
+        self.metrics_sink.observe(OUTPUT_TOKENS, response.output_tokens, labels=labels)
+
+    def record_error(
+        self,
+        prompt_name: str | None,
+        error: Exception,
+        stage: str,
+        backend: str | None = None,
+    ):
+        labels = {
+            "prompt_name": prompt_name or "unlabelled",
+            "stage": stage,
+            "error_type": type(error).__name__,
+        }
+        if backend is not None:
+            labels["backend"] = backend
+        self.metrics_sink.increment(ERRORS_TOTAL, labels=labels)
+
+    def parse_response(
+        self,
+        response: str,
+        json_key: str | None = None,
+        response_type: str = "json",
+        prompt_name: str | None = None,
+    ) -> Any:
         if response_type != "json":
             return response
         try:
-            json_data = json.loads(response)
-            if json_key is None:
-                return json_data
-        except json.decoder.JSONDecodeError:
-            json_data = extract_json_from_response(response)
+            try:
+                json_data = json.loads(response)
+            except json.decoder.JSONDecodeError:
+                self.metrics_sink.increment(
+                    JSON_REPAIRS_TOTAL,
+                    labels={"prompt_name": prompt_name or "unlabelled"},
+                )
+                json_data = extract_json_from_response(response)
             if json_key is None:
                 return json_data
-        return json_data[json_key]
+            return json_data[json_key]
+        except Exception as e:
+            self.record_error(prompt_name=prompt_name, error=e, stage="parse")
+            raise
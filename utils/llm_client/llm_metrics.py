@@ -0,0 +1,176 @@
+import atexit
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from utils.llm_client.config import (
+    LLM_METRICS_BACKUP_COUNT,
+    LLM_METRICS_FLUSH_SECONDS,
+    LLM_METRICS_MAX_BUFFERED,
+    LLM_METRICS_MAX_BYTES,
+    LLM_METRICS_PATH,
+)
+
+# HISTOGRAMS
+WALL_TIME_SECONDS = "llm_wall_time_seconds"
+TIME_TO_FIRST_TOKEN_SECONDS = "llm_time_to_first_token_seconds"
+INPUT_TOKENS = "llm_input_tokens"
+OUTPUT_TOKENS = "llm_output_tokens"
+# COUNTERS
+REQUESTS_TOTAL = "llm_requests_total"
+CACHE_HITS_TOTAL = "llm_cache_hits_total"
+JSON_REPAIRS_TOTAL = "llm_json_repairs_total"
+EARLY_RETURNS_TOTAL = "llm_early_returns_total"
+ERRORS_TOTAL = "llm_errors_total"
+
+
+class MetricsSink(ABC):
+    """Receives LLM call metrics, labelled by prompt name and backend"""
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: dict):
+        """Records one histogram observation"""
+
+    @abstractmethod
+    def increment(self, name: str, labels: dict, value: float = 1):
+        """Increments a counter"""
+
+
+class NullMetricsSink(MetricsSink):
+    def observe(self, name: str, value: float, labels: dict):
+        pass
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        pass
+
+
+class JsonLinesMetricsSink(MetricsSink):
+    """Buffers observations in memory and appends them as JSON lines to a local file
+    from a background thread, so LLM calls never wait on the disk. The file is rotated
+    to path.1, path.2 ... once it grows past max_bytes."""
+
+    def __init__(
+        self,
+        path: str = LLM_METRICS_PATH,
+        flush_seconds: float = LLM_METRICS_FLUSH_SECONDS,
+        max_buffered: int = LLM_METRICS_MAX_BUFFERED,
+        max_bytes: int = LLM_METRICS_MAX_BYTES,
+        backup_count: int = LLM_METRICS_BACKUP_COUNT,
+    ):
+        self.path = os.path.abspath(path)
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max_buffered
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer: list[dict] = []
+        self.lock = threading.Lock()
+        self.file_lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        self.flush_thread = None
+        atexit.register(self.flush)
+
+    def observe(self, name: str, value: float, labels: dict):
+        self.write(metric_type="histogram", name=name, value=value, labels=labels)
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        self.write(metric_type="counter", name=name, value=value, labels=labels)
+
+    def write(self, metric_type: str, name: str, value: float, labels: dict):
+        record = {
+            "timestamp": time.time(),
+            "type": metric_type,
+            "name": name,
+            "value": value,
+            "labels": labels,
+        }
+        with self.lock:
+            self.buffer.append(record)
+            if self.flush_thread is None:
+                self.flush_thread = threading.Thread(
+                    target=self.flush_periodically, name="llm-metrics", daemon=True
+                )
+                self.flush_thread.start()
+            if len(self.buffer) >= self.max_buffered:
+                self.flush_requested.set()
+
+    def flush_periodically(self):
+        while True:
+            self.flush_requested.wait(self.flush_seconds)
+            self.flush_requested.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                logging.warning(f"Writing LLM metrics failed: {e}")
+
+    def flush(self):
+        """Appends every buffered observation in one write"""
+        with self.lock:
+            records, self.buffer = self.buffer, []
+        if not records:
+            return
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with self.file_lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.rotate_when_full()
+            with open(self.path, "a") as file:
+                file.write(lines)
+
+    def rotate_when_full(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.max_bytes:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """Aggregates metrics in memory, handy for benchmarks and tests"""
+
+    def __init__(self):
+        self.histograms = defaultdict(list)
+        self.counters = defaultdict(float)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def labels_key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    def observe(self, name: str, value: float, labels: dict):
+        with self.lock:
+            self.histograms[(name, self.labels_key(labels))].append(value)
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        with self.lock:
+            self.counters[(name, self.labels_key(labels))] += value
+
+    def counter_total(self, name: str, **labels) -> float:
+        """Sums a counter over every label set containing the given labels"""
+        return sum(
+            value
+            for (counter_name, labels_key), value in self.counters.items()
+            if counter_name == name and set(labels.items()) <= set(labels_key)
+        )
+
+    def summary(self, name: str) -> dict[tuple, dict]:
+        """Count, mean, p50 and p95 of a histogram per label set"""
+        summary = {}
+        for (histogram_name, labels_key), values in self.histograms.items():
+            if histogram_name != name:
+                continue
+            sorted_values = sorted(values)
+            summary[labels_key] = {
+                "count": len(values),
+                "mean": statistics.fmean(values),
+                "p50": sorted_values[int(0.5 * (len(values) - 1))],
+                "p95": sorted_values[int(0.95 * (len(values) - 1))],
+            }
+        return summary
@@ -0,0 +1,167 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from utils.llm_client.config import (
+    INTERACTIVE_PRIORITY,
+    BACKGROUND_PRIORITY,
+    RATE_LIMITS_BY_BACKEND,
+    MAX_RETRIES,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+PRIORITY_ORDER = {INTERACTIVE_PRIORITY: 0, BACKGROUND_PRIORITY: 1}
+# Async waiters poll, so they never sleep longer than this between checks
+MAX_ASYNC_POLL_SECONDS = 0.25
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.available = min(
+            self.capacity, self.available + elapsed * self.refill_per_second
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken. Amounts above capacity wait for a full bucket."""
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def take(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests/min and tokens/min buckets shared by every caller of a backend.
+    Waiting interactive callers are always served before background ones."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.condition = threading.Condition()
+        self.waiters = []
+        self.ticket_counter = itertools.count()
+        self.paused_until = 0.0
+
+    def enqueue(self, priority: str) -> tuple:
+        ticket = (PRIORITY_ORDER.get(priority, 1), next(self.ticket_counter))
+        with self.condition:
+            heapq.heappush(self.waiters, ticket)
+        return ticket
+
+    def try_acquire(self, ticket: tuple, tokens: int) -> float:
+        """Takes capacity if ticket is first in line, otherwise returns seconds to wait"""
+        with self.condition:
+            now = time.monotonic()
+            if self.waiters[0] != ticket:
+                return MAX_ASYNC_POLL_SECONDS
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait_time = max(
+                self.paused_until - now,
+                self.requests.wait_time(1),
+                self.tokens.wait_time(tokens),
+            )
+            if wait_time > 0:
+                return wait_time
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            heapq.heappop(self.waiters)
+            self.condition.notify_all()
+            return 0.0
+
+    def dequeue(self, ticket: tuple):
+        """Drops a waiter that gave up, e.g. a cancelled task"""
+        with self.condition:
+            if ticket in self.waiters:
+                self.waiters.remove(ticket)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+
+    def acquire(self, tokens: int, priority: str = INTERACTIVE_PRIORITY):
+        ticket = self.enqueue(priority)
+        try:
+            while (wait_time := self.try_acquire(ticket, tokens)) > 0:
+                with self.condition:
+                    self.condition.wait(timeout=wait_time)
+        except BaseException:
+            self.dequeue(ticket)
+            raise
+
+    async def acquire_async(self, tokens: int, priority: str = INTERACTIVE_PRIORITY):
+        ticket = self.enqueue(priority)
+        try:
+            while (wait_time := self.try_acquire(ticket, tokens)) > 0:
+                await asyncio.sleep(min(wait_time, MAX_ASYNC_POLL_SECONDS))
+        except BaseException:
+            self.dequeue(ticket)
+            raise
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Corrects the token bucket once the real usage of a request is known"""
+        with self.condition:
+            self.tokens.available -= actual_tokens - estimated_tokens
+
+    def pause(self, seconds: float):
+        """Holds every caller back, e.g. after the provider answered with Retry-After"""
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring the provider's Retry-After"""
+
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        base_delay: float = RETRY_BASE_DELAY_SECONDS,
+        max_delay: float = RETRY_MAX_DELAY_SECONDS,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Reads the Retry-After header of a provider error, if there is one"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+shared_rate_limiters = {}
+shared_rate_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(backend_name: str) -> RateLimiter | None:
+    """One limiter per backend for the whole process, None for unlimited backends"""
+    limits = RATE_LIMITS_BY_BACKEND.get(backend_name)
+    if limits is None:
+        return None
+    with shared_rate_limiters_lock:
+        if backend_name not in shared_rate_limiters:
+            shared_rate_limiters[backend_name] = RateLimiter(**limits)
+        return shared_rate_limiters[backend_name]
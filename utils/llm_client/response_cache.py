@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.llm_client.config import (
+    RESPONSE_CACHE_MAX_SIZE,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_PATH,
+)
+
+
+class ResponseCache:
+    """Exact match cache of raw LLM responses: an in-memory LRU backed by an optional sqlite file"""
+
+    def __init__(
+        self,
+        max_size: int = RESPONSE_CACHE_MAX_SIZE,
+        ttl_seconds: float | None = RESPONSE_CACHE_TTL_SECONDS,
+        disk_path: str | None = RESPONSE_CACHE_PATH,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk = None
+        if disk_path:
+            self.disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self.disk.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, response TEXT, expires_at REAL, last_used REAL)"
+            )
+            self.disk.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        response_type: str,
+        json_key: str | None = None,
+    ) -> str:
+        key_parts = json.dumps(
+            [model, system_prompt, user_prompt, response_type, json_key]
+        )
+        return hashlib.sha256(key_parts.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self.entries[key]
+            response = self.get_from_disk(key=key, now=now)
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return response
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        with self.lock:
+            self.store_in_memory(key=key, response=response, expires_at=expires_at)
+            if self.disk is not None:
+                self.disk.execute(
+                    "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                    (key, response, expires_at, now),
+                )
+                self.disk.execute(
+                    "DELETE FROM llm_responses WHERE key IN (SELECT key FROM llm_responses "
+                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_size,),
+                )
+                self.disk.commit()
+
+    def store_in_memory(self, key: str, response: str, expires_at: float | None):
+        self.entries[key] = (response, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_from_disk(self, key: str, now: float) -> str | None:
+        """Looks up the sqlite store, promoting hits into memory. Caller holds the lock."""
+        if self.disk is None:
+            return None
+        try:
+            row = self.disk.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self.disk.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self.disk.commit()
+                return None
+            self.disk.execute(
+                "UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self.disk.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"LLM response cache lookup failed: {e}")
+            return None
+        self.store_in_memory(key=key, response=response, expires_at=expires_at)
+        return response
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.disk is not None:
+                self.disk.execute("DELETE FROM llm_responses")
+                self.disk.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self.entries),
+        }
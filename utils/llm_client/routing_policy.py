@@ -0,0 +1,43 @@
+from utils.llm_client.config import (
+    HOSTED_BACKEND,
+    LOCAL_BACKEND,
+    LOCAL_PROMPT_NAMES,
+    LOCAL_MAX_PROMPT_CHARS,
+)
+
+
+class RoutingPolicy:
+    """Decides which backend answers a prompt, and in which order to fail over"""
+
+    def __init__(
+        self,
+        local_prompt_names: list[str] = None,
+        local_max_prompt_chars: int = LOCAL_MAX_PROMPT_CHARS,
+        hosted_backend: str = HOSTED_BACKEND,
+        local_backend: str = LOCAL_BACKEND,
+    ):
+        self.local_prompt_names = set(
+            LOCAL_PROMPT_NAMES if local_prompt_names is None else local_prompt_names
+        )
+        self.local_max_prompt_chars = local_max_prompt_chars
+        self.hosted_backend = hosted_backend
+        self.local_backend = local_backend
+
+    def route(
+        self,
+        prompt_name: str | None,
+        prompt_chars: int,
+        available_backends: list[str],
+    ) -> list[str]:
+        """Returns available backend names, preferred backend first"""
+        prefer_local = (
+            prompt_name in self.local_prompt_names
+            and prompt_chars <= self.local_max_prompt_chars
+        )
+        preferred_order = (
+            [self.local_backend, self.hosted_backend]
+            if prefer_local
+            else [self.hosted_backend, self.local_backend]
+        )
+        ordered = [name for name in preferred_order if name in available_backends]
+        return ordered + [name for name in available_backends if name not in ordered]
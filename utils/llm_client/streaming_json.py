@@ -0,0 +1,47 @@
+import json
+import re
+from typing import Any
+
+NUMBER_START = re.compile(r"[-0-9]")
+
+
+class IncrementalJsonKeyParser:
+    """Watches a streamed completion and detects when the value of json_key is complete,
+    so the rest of the generation can be cancelled"""
+
+    def __init__(self, json_key: str):
+        self.json_key = json_key
+        self.key_pattern = re.compile(r'"' + re.escape(json_key) + r'"\s*:\s*')
+        self.decoder = json.JSONDecoder()
+        self.reset()
+
+    def reset(self):
+        self.buffer = ""
+        self.value_start = None
+        self.complete = False
+        self.value = None
+
+    def feed(self, text: str) -> bool:
+        """Adds streamed text, returns True once the value is complete"""
+        if self.complete:
+            return True
+        self.buffer += text
+        if self.value_start is None:
+            key_match = self.key_pattern.search(self.buffer)
+            if key_match is None or key_match.end() == len(self.buffer):
+                return False
+            self.value_start = key_match.end()
+        try:
+            value, value_end = self.decoder.raw_decode(self.buffer, self.value_start)
+        except json.JSONDecodeError:
+            return False
+        # A number is only known to be complete once something follows it
+        is_number = NUMBER_START.match(self.buffer, self.value_start) is not None
+        if is_number and value_end == len(self.buffer):
+            return False
+        self.value = value
+        self.complete = True
+        return True
+
+    def result(self) -> dict[str, Any]:
+        return {self.json_key: self.value}
@@ -0,0 +1,69 @@
+import pytest
+
+from prompts.system_prompts import (
+    system_prompt_to_identify_query_type,
+    system_prompt_to_identify_location,
+    system_prompt_to_extract_job_features,
+    system_prompt_to_extract_query_details,
+)
+from prompts.user_prompts import (
+    user_prompt_to_identify_query_type,
+    user_prompt_to_identify_location,
+    user_prompt_to_extract_job_features,
+    get_user_prompt_for_query_details,
+)
+from utils.llm_client.llm_backends import FakeBackend
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.llm_client.llm_metrics import InMemoryMetricsSink
+
+
+def fake_llm_client(**fake_model_settings) -> LLMInteraction:
+    return LLMInteraction(
+        backends=[FakeBackend(**fake_model_settings)],
+        metrics_sink=InMemoryMetricsSink(),
+    )
+
+
+def test_fake_backend_answers_repo_prompts():
+    llm_client = fake_llm_client()
+    query = "user_query: find me data analyst jobs in Perth"
+    assert (
+        llm_client.ask_llm(
+            system_prompt=system_prompt_to_identify_query_type,
+            user_prompt=f"{user_prompt_to_identify_query_type}{query}",
+            json_key="query_type",
+        )
+        == "job_search"
+    )
+    assert (
+        llm_client.ask_llm(
+            system_prompt=system_prompt_to_identify_location,
+            user_prompt=f"{user_prompt_to_identify_location} {query}",
+            json_key="location",
+        )
+        == "Perth"
+    )
+    job_features = llm_client.ask_llm(
+        system_prompt=system_prompt_to_extract_job_features,
+        user_prompt=f"{user_prompt_to_extract_job_features}Strong Python and SQL, 3 years",
+    )
+    assert job_features["required_skills"] == ["Python", "SQL"]
+    query_details = llm_client.ask_llm(
+        system_prompt=system_prompt_to_extract_query_details,
+        user_prompt=get_user_prompt_for_query_details(
+            conversation=None, latest_message="find me data analyst jobs in Perth"
+        ),
+    )
+    assert query_details["query_type"] == "job_search"
+    assert query_details["job_position"] == "data analyst"
+    assert query_details["location"] == "Perth"
+
+
+def test_fake_backend_fixtures_and_errors():
+    llm_client = fake_llm_client(fixtures={"ping": '{"answer": "pong"}'})
+    assert llm_client.ask_llm(system_prompt="any", user_prompt="ping") == {
+        "answer": "pong"
+    }
+    failing_client = fake_llm_client(error_rate=1.0)
+    with pytest.raises(RuntimeError):
+        failing_client.ask_llm(system_prompt="any", user_prompt="ping")
@@ -0,0 +1,175 @@
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from utils.llm_client.llm_backends import BackendResponse, LLMBackend
+from utils.llm_client.llm_interaction import LLMInteraction
+from utils.llm_client.llm_metrics import (
+    InMemoryMetricsSink,
+    JSON_REPAIRS_TOTAL,
+    ERRORS_TOTAL,
+    WALL_TIME_SECONDS,
+    OUTPUT_TOKENS,
+)
+from utils.llm_client.routing_policy import RoutingPolicy
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class StubBackend(LLMBackend):
+    def __init__(self, name: str, responses: list[str], error: Exception = None):
+        self.name = name
+        self.responses = responses
+        self.error = error
+        self.calls = 0
+        super().__init__(model="stub")
+
+    def build_chat_model(self) -> BaseChatModel:
+        return FakeListChatModel(responses=self.responses)
+
+    def invoke(self, messages: list, parser=None) -> BackendResponse:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        self.last_response = super().invoke(messages, parser=parser)
+        return self.last_response
+
+    async def ainvoke(self, messages: list, parser=None) -> BackendResponse:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        self.last_response = await super().ainvoke(messages, parser=parser)
+        return self.last_response
+
+
+def test_routing_policy():
+    policy = RoutingPolicy()
+    assert policy.route("identify_location", 100, ["groq", "ollama"]) == [
+        "ollama",
+        "groq",
+    ]
+    assert policy.route("gap_analysis", 100, ["groq", "ollama"]) == ["groq", "ollama"]
+    assert policy.route("identify_location", 10**6, ["groq", "ollama"])[0] == "groq"
+    assert policy.route("identify_location", 100, ["groq"]) == ["groq"]
+
+
+def test_ask_llm_fails_over_on_rate_limit():
+    hosted = StubBackend("groq", ['{"location": "Sydney"}'], error=RateLimitError())
+    local = StubBackend("ollama", ['{"location": "Melbourne"}'])
+    llm_client = LLMInteraction(
+        backends=[hosted, local], metrics_sink=InMemoryMetricsSink()
+    )
+    location = llm_client.ask_llm(
+        system_prompt="system",
+        user_prompt="user",
+        json_key="location",
+        prompt_name="gap_analysis",
+    )
+    assert location == "Melbourne"
+    assert hosted.calls == 1 and local.calls == 1
+
+
+def test_ask_llm_caches_failover_answers_under_the_answering_backend():
+    hosted = StubBackend("groq", ['{"location": "Sydney"}'], error=RateLimitError())
+    local = StubBackend("ollama", ['{"location": "Melbourne"}'])
+    llm_client = LLMInteraction(
+        backends=[hosted, local], metrics_sink=InMemoryMetricsSink()
+    )
+    prompt = dict(
+        system_prompt="system",
+        user_prompt="user",
+        json_key="location",
+        prompt_name="gap_analysis",
+    )
+    assert llm_client.ask_llm(**prompt) == "Melbourne"
+    hosted.error = None
+    assert llm_client.ask_llm(**prompt) == "Sydney"
+    assert hosted.calls == 2 and local.calls == 1
+    assert llm_client.response_cache.hits == 0
+
+
+def test_ask_llm_raises_other_errors():
+    hosted = StubBackend("groq", ["{}"], error=ValueError("bad request"))
+    local = StubBackend("ollama", ["{}"])
+    llm_client = LLMInteraction(
+        backends=[hosted, local], metrics_sink=InMemoryMetricsSink()
+    )
+    with pytest.raises(ValueError):
+        llm_client.ask_llm(system_prompt="system", user_prompt="user")
+    assert local.calls == 0
+
+
+def test_ask_llm_serves_repeated_prompts_from_cache():
+    hosted = StubBackend("groq", ['{"query_type": "job_search"}'])
+    llm_client = LLMInteraction(backends=[hosted], metrics_sink=InMemoryMetricsSink())
+    for _ in range(2):
+        query_type = llm_client.ask_llm(
+            system_prompt="system", user_prompt="user", json_key="query_type"
+        )
+        assert query_type == "job_search"
+    llm_client.ask_llm(system_prompt="system", user_prompt="user", use_cache=False)
+    assert hosted.calls == 2
+    assert llm_client.response_cache.hits == 1
+
+
+def test_ask_llm_many_preserves_order_and_errors():
+    hosted = StubBackend("groq", ['{"job_position": "nurse"}', "not json"])
+    llm_client = LLMInteraction(backends=[hosted], metrics_sink=InMemoryMetricsSink())
+    prompt = {"system_prompt": "system", "json_key": "job_position"}
+    results = llm_client.ask_llm_many(
+        [
+            {**prompt, "user_prompt": "first"},
+            {**prompt, "user_prompt": "second"},
+            {**prompt, "user_prompt": "first"},
+        ],
+        max_concurrency=1,
+    )
+    assert results[0] == "nurse"
+    assert isinstance(results[1], Exception)
+    assert results[2] == "nurse"
+    assert hosted.calls == 2
+
+
+def test_ask_llm_records_metrics_per_prompt_name():
+    hosted = StubBackend("groq", ['"location": "Perth"'], error=None)
+    local = StubBackend("ollama", ["{}"], error=RateLimitError())
+    metrics_sink = InMemoryMetricsSink()
+    llm_client = LLMInteraction(backends=[hosted, local], metrics_sink=metrics_sink)
+    location = llm_client.ask_llm(
+        system_prompt="system", user_prompt="user", prompt_name="identify_location"
+    )
+    assert location == {"location": "Perth"}
+    assert metrics_sink.counter_total(
+        JSON_REPAIRS_TOTAL, prompt_name="identify_location"
+    )
+    assert metrics_sink.counter_total(ERRORS_TOTAL, backend="ollama") == 1
+    wall_times = metrics_sink.summary(WALL_TIME_SECONDS)
+    assert (("backend", "groq"), ("prompt_name", "identify_location")) in wall_times
+    assert metrics_sink.summary(OUTPUT_TOKENS)
+
+
+def test_ask_llm_stops_streaming_once_json_key_is_complete():
+    hosted = StubBackend(
+        "groq", ['{"query_type": "job_search", "reason": "' + "x" * 200 + '"}']
+    )
+    llm_client = LLMInteraction(backends=[hosted], metrics_sink=InMemoryMetricsSink())
+    query_type = llm_client.ask_llm(
+        system_prompt="system", user_prompt="user", json_key="query_type"
+    )
+    assert query_type == "job_search"
+    assert hosted.last_response.stopped_early
+    assert hosted.last_response.content.endswith('"job_search"')
+
+
+def test_stream_llm_yields_chunks_and_caches_full_text():
+    hosted = StubBackend("groq", ["Strengths: Python. Gaps: AWS."])
+    llm_client = LLMInteraction(backends=[hosted], metrics_sink=InMemoryMetricsSink())
+    chunks = list(llm_client.stream_llm(system_prompt="system", user_prompt="user"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Strengths: Python. Gaps: AWS."
+    cached_chunks = list(
+        llm_client.stream_llm(system_prompt="system", user_prompt="user")
+    )
+    assert cached_chunks == ["Strengths: Python. Gaps: AWS."]
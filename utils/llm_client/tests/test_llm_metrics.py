@@ -0,0 +1,43 @@
+import json
+import time
+
+from utils.llm_client.llm_metrics import JsonLinesMetricsSink, REQUESTS_TOTAL
+
+
+def read_lines(path) -> list[dict]:
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_metrics_are_buffered_until_flushed(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    sink = JsonLinesMetricsSink(path=str(path), flush_seconds=60)
+    sink.increment(REQUESTS_TOTAL, labels={"prompt_name": "a"})
+    sink.observe("latency", 0.5, labels={"prompt_name": "a"})
+    assert not path.exists()
+    sink.flush()
+    assert [line["name"] for line in read_lines(path)] == [REQUESTS_TOTAL, "latency"]
+
+
+def test_a_full_buffer_is_flushed_in_the_background(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    sink = JsonLinesMetricsSink(path=str(path), flush_seconds=60, max_buffered=3)
+    for _ in range(3):
+        sink.increment(REQUESTS_TOTAL, labels={})
+    deadline = time.time() + 5
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(read_lines(path)) == 3
+
+
+def test_metrics_file_is_rotated_past_its_size(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    sink = JsonLinesMetricsSink(
+        path=str(path), flush_seconds=60, max_bytes=1, backup_count=2
+    )
+    for value in range(4):
+        sink.increment(REQUESTS_TOTAL, labels={}, value=value)
+        sink.flush()
+    rotated = [read_lines(f"{path}{suffix}") for suffix in ["", ".1", ".2"]]
+    assert [lines[0]["value"] for lines in rotated] == [3, 2, 1]
+    assert not (tmp_path / "metrics.jsonl.3").exists()
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from utils.llm_client.config import BACKGROUND_PRIORITY, INTERACTIVE_PRIORITY
+from utils.llm_client.rate_limiter import RateLimiter, RetryPolicy
+
+
+class RetryAfterError(Exception):
+    class response:
+        status_code = 429
+        headers = {"retry-after": "2"}
+
+
+def test_requests_per_minute_limit():
+    rate_limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10**6)
+    rate_limiter.requests.available = 1
+    started_at = time.monotonic()
+    rate_limiter.acquire(tokens=10)
+    rate_limiter.acquire(tokens=10)
+    assert 0.05 <= time.monotonic() - started_at < 1
+
+
+def test_interactive_callers_go_first():
+    rate_limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10**6)
+    rate_limiter.requests.available = 0
+    served = []
+
+    def acquire(priority: str):
+        rate_limiter.acquire(tokens=1, priority=priority)
+        served.append(priority)
+
+    background = threading.Thread(target=acquire, args=(BACKGROUND_PRIORITY,))
+    background.start()
+    time.sleep(0.01)
+    interactive = threading.Thread(target=acquire, args=(INTERACTIVE_PRIORITY,))
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert served == [INTERACTIVE_PRIORITY, BACKGROUND_PRIORITY]
+
+
+def test_retry_policy_honours_retry_after():
+    retry_policy = RetryPolicy(base_delay=1, max_delay=30)
+    assert retry_policy.delay(attempt=0, error=RetryAfterError()) == 2
+    assert 0 <= retry_policy.delay(attempt=3, error=ValueError()) <= 8
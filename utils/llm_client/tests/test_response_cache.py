@@ -0,0 +1,28 @@
+import time
+
+from utils.llm_client.response_cache import ResponseCache
+
+
+def test_lru_eviction_and_stats():
+    cache = ResponseCache(max_size=2, disk_path=None)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 2}
+
+
+def test_ttl_expiry():
+    cache = ResponseCache(ttl_seconds=0.01, disk_path=None)
+    cache.set("a", "1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_disk_store_is_shared(tmp_path):
+    disk_path = str(tmp_path / "llm_cache.sqlite")
+    key = ResponseCache.make_key("groq:model", "system", "user", "json")
+    ResponseCache(disk_path=disk_path).set(key, '{"query_type": "job_search"}')
+    assert ResponseCache(disk_path=disk_path).get(key) == '{"query_type": "job_search"}'
@@ -0,0 +1,33 @@
+import pytest
+
+from utils.llm_client.streaming_json import IncrementalJsonKeyParser
+
+
+def feed_in_chunks(parser: IncrementalJsonKeyParser, text: str, chunk_size: int = 3):
+    for start in range(0, len(text), chunk_size):
+        if parser.feed(text[start : start + chunk_size]):
+            return start + chunk_size
+    return None
+
+
+@pytest.mark.parametrize(
+    "completion, expected",
+    [
+        ('```json\n{"location": "Sydney", "other": 1}```', "Sydney"),
+        ('{"location": "St \\"Kilda\\""}', 'St "Kilda"'),
+        ('{"location": ["Perth", "Darwin"], "x": 1}', ["Perth", "Darwin"]),
+        ('"location": null}', None),
+    ],
+)
+def test_value_is_detected_before_stream_ends(completion, expected):
+    parser = IncrementalJsonKeyParser(json_key="location")
+    assert feed_in_chunks(parser, completion) is not None
+    assert parser.value == expected
+
+
+def test_numbers_wait_for_terminator():
+    parser = IncrementalJsonKeyParser(json_key="years")
+    assert not parser.feed('{"years": 1')
+    assert not parser.feed("2")
+    assert parser.feed("}")
+    assert parser.value == 12
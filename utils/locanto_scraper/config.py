@@ -2,6 +2,8 @@
 Lists constants and mappings used in the parent folder - web_scraping
 """
 
+import os
+
 from utils.locanto_scraper.scraper_helper_functions import (
     find_by_id,
     find_by_class,
@@ -13,6 +15,26 @@ from utils.locanto_scraper.scraper_helper_functions import (
 WEBSITE_TO_SCRAPE = "https://www.locanto.com.au/"
 DEFAULT_JOB_TO_SEARCH = "data scientist"
 DEFAULT_LOCATION = "melbourne"
+# sqlite file shared by every app and scheduler process recording which searches were scraped
+# Age in days of the relative posted_date labels. The labels only hold when the ad is
+# scraped, so ads are stored with an absolute posted_at computed from them.
+# "less than a week ago" takes the oldest age it allows.
+POSTED_DATE_AGE_DAYS = {"today": 0, "yesterday": 1, "less than a week ago": 6}
+# Every app and scheduler process must point at the same file. The absolute default
+# keeps the history out of whichever directory a process started in.
+SCRAPE_HISTORY_PATH = os.path.abspath(
+    os.getenv(
+        "SCRAPE_HISTORY_PATH",
+        os.path.join(
+            os.path.expanduser("~"),
+            ".cache",
+            "job_search_chatbot",
+            "scrape_history.sqlite",
+        ),
+    )
+)
+# a claimed scrape that never recorded its result count can be claimed again after this
+SCRAPE_CLAIM_TIMEOUT_SECONDS = 15 * 60
 ITEMS_TO_SCRAPE = [
     "suburb",
     "id",
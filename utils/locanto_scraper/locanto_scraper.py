@@ -1,4 +1,6 @@
 import logging
+import threading
+import time
 from dataclasses import dataclass
 
 import cloudscraper
@@ -20,6 +22,7 @@ from utils.locanto_scraper.config import (
     ITEM_SEARCH_STRATEGY,
     SEARCH_STRATEGIES,
     ITEMS_NAMING_MAPPING,
+    POSTED_DATE_AGE_DAYS,
 )
 from utils.locanto_scraper.scraper_helper_functions import cleanup_html_tag
 
@@ -36,6 +39,44 @@ class Joblisting:
     url: str
 
 
+class ScrapeProgress:
+    """Progress of a scrape shared between the scraping worker and the UI"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.job_listings = []
+        self.ads_found = 0
+        self.ads_parsed = 0
+        self.done = False
+        self.error = None
+
+    def add_ads(self, count: int):
+        with self.lock:
+            self.ads_found += count
+
+    def add_listing(self, listing: dict):
+        """Counts a parsed ad, keeping it if it could be parsed"""
+        with self.lock:
+            self.ads_parsed += 1
+            if listing:
+                self.job_listings.append(listing)
+
+    def finish(self, error: str | None = None):
+        with self.lock:
+            self.done = True
+            self.error = error
+
+    def listings(self) -> list[dict]:
+        with self.lock:
+            return list(self.job_listings)
+
+    @property
+    def fraction(self) -> float:
+        if self.done:
+            return 1.0
+        return self.ads_parsed / self.ads_found if self.ads_found else 0.0
+
+
 class LocantoScraper:
     def __init__(
         self,
@@ -50,15 +91,25 @@ class LocantoScraper:
         self.job_listings = []
         self.bootstrap_servers = bootstrap_servers
 
-    def scrape(self):
+    def scrape(self, progress: ScrapeProgress | None = None):
+        """Scrapes the search, reporting every parsed ad to progress when given"""
         self.job_listings = []
         logging.info("Scraping locanto job listings...")
         url = f"{self.base_url}{self.location}/q/?query={self.job_to_search}"
-        for page_index in tqdm(
-            range(self.no_of_pages_to_scrape), desc="Scraping pages", ncols=100
-        ):
-            url = f"{url}&page={page_index}"
-            self.get_ads_from_a_single_page(url=url)
+        try:
+            for page_index in tqdm(
+                range(self.no_of_pages_to_scrape), desc="Scraping pages", ncols=100
+            ):
+                url = f"{url}&page={page_index}"
+                self.get_ads_from_a_single_page(url=url, progress=progress)
+        except Exception as e:
+            if progress is None:
+                raise
+            logging.warning(f"Scraping {url} failed: {e}")
+            progress.finish(error=str(e))
+            return
+        if progress is not None:
+            progress.finish()
 
     @staticmethod
     def get_soup(url: str) -> BeautifulSoup:
@@ -66,14 +117,20 @@ class LocantoScraper:
         res = scraper.get(url, timeout=60)
         return BeautifulSoup(res.content, "html.parser")
 
-    def get_ads_from_a_single_page(self, url: str):
+    def get_ads_from_a_single_page(
+        self, url: str, progress: ScrapeProgress | None = None
+    ):
         """Collects ad details from all listings on a single search result page."""
         logging.info(f"Collecting ad details of {url}")
         soup = self.get_soup(url=url)
         print(f"[+] Checking ads in: {url}")
         ad_html_list = self.get_individual_ads_html(soup=soup)
+        if progress is not None:
+            progress.add_ads(len(ad_html_list))
         for ad_html in ad_html_list:
             ad_detail_dict = self.parse_ad_detail(ad_html)
+            if progress is not None:
+                progress.add_listing(ad_detail_dict)
             if ad_detail_dict:
                 self.job_listings.append(ad_detail_dict)
                 produce_kafka_messages(
@@ -119,4 +176,15 @@ class LocantoScraper:
             except Exception as e:
                 print(f"[Not OK] {item}")
 
+        html_dict.update(self.posting_times(posted_date=html_dict.get("posted_date")))
         return html_dict
+
+    @staticmethod
+    def posting_times(posted_date: str | None, scraped_at: float | None = None) -> dict:
+        """Unix timestamps of the scrape and, for known labels, of the posting"""
+        scraped_at = int(scraped_at or time.time())
+        posting_times = {"scraped_at": scraped_at}
+        age_days = POSTED_DATE_AGE_DAYS.get(str(posted_date or "").strip().lower())
+        if age_days is not None:
+            posting_times["posted_at"] = scraped_at - age_days * 24 * 60 * 60
+        return posting_times
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from utils.locanto_scraper.config import (
+    SCRAPE_HISTORY_PATH,
+    SCRAPE_CLAIM_TIMEOUT_SECONDS,
+)
+
+
+@dataclass
+class ScrapeRecord:
+    scraped_at: float
+    # None while the scrape is still running
+    result_count: int | None
+
+
+class ScrapeHistory:
+    """Persistent record of scraped searches keyed on the normalised (job, location).
+    Backed by sqlite so every app and scheduler process on the host shares it."""
+
+    def __init__(self, path: str = SCRAPE_HISTORY_PATH):
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_history (job_position TEXT, location TEXT, "
+            "scraped_at REAL, result_count INTEGER, PRIMARY KEY (job_position, location))"
+        )
+        self.db.commit()
+
+    @staticmethod
+    def normalise(text: str) -> str:
+        return "_".join(text.lower().split())
+
+    def record_scrape(
+        self, job_position: str, location: str, result_count: int | None = None
+    ):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO scrape_history VALUES (?, ?, ?, ?)",
+                (
+                    self.normalise(job_position),
+                    self.normalise(location),
+                    time.time(),
+                    result_count,
+                ),
+            )
+            self.db.commit()
+
+    def record_result_count(self, job_position: str, location: str, result_count: int):
+        with self.lock:
+            self.db.execute(
+                "UPDATE scrape_history SET result_count = ? "
+                "WHERE job_position = ? AND location = ?",
+                (result_count, self.normalise(job_position), self.normalise(location)),
+            )
+            self.db.commit()
+
+    def last_scrape(self, job_position: str, location: str) -> ScrapeRecord | None:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT scraped_at, result_count FROM scrape_history "
+                "WHERE job_position = ? AND location = ?",
+                (self.normalise(job_position), self.normalise(location)),
+            ).fetchone()
+        return ScrapeRecord(*row) if row else None
+
+    def claim_stale(
+        self,
+        job_position: str,
+        location: str,
+        ttl_seconds: float,
+        claim_timeout_seconds: float = SCRAPE_CLAIM_TIMEOUT_SECONDS,
+    ) -> bool:
+        """Marks the search as being scraped now unless it was scraped within the ttl,
+        or another claim younger than claim_timeout_seconds is still scraping it.
+        Atomic across processes, so only the caller that gets True should crawl."""
+        now = time.time()
+        with self.lock:
+            cursor = self.db.execute(
+                "INSERT INTO scrape_history VALUES (?, ?, ?, NULL) "
+                "ON CONFLICT (job_position, location) DO UPDATE SET "
+                "scraped_at = excluded.scraped_at, result_count = NULL "
+                "WHERE scrape_history.scraped_at <= ? OR ("
+                "scrape_history.result_count IS NULL AND scrape_history.scraped_at <= ?)",
+                (
+                    self.normalise(job_position),
+                    self.normalise(location),
+                    now,
+                    now - ttl_seconds,
+                    now - claim_timeout_seconds,
+                ),
+            )
+            self.db.commit()
+            return cursor.rowcount == 1
+
+    def release_claim(self, job_position: str, location: str):
+        """Lets the next search claim a scrape that failed before recording its results"""
+        with self.lock:
+            self.db.execute(
+                "UPDATE scrape_history SET scraped_at = 0 "
+                "WHERE job_position = ? AND location = ? AND result_count IS NULL",
+                (self.normalise(job_position), self.normalise(location)),
+            )
+            self.db.commit()
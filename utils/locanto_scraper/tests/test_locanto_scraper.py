@@ -13,3 +13,14 @@ def test_locanto_scraper():
     job_listings = scraper.job_listings
     assert len(job_listings) > 10
     assert type(job_listings[0]) == dict
+
+
+def test_posting_times_date_the_relative_labels():
+    scraped_at = 1_700_000_000
+    assert LocantoScraper.posting_times(" Yesterday", scraped_at=scraped_at) == {
+        "scraped_at": scraped_at,
+        "posted_at": scraped_at - 24 * 60 * 60,
+    }
+    assert LocantoScraper.posting_times("no_date", scraped_at=scraped_at) == {
+        "scraped_at": scraped_at
+    }
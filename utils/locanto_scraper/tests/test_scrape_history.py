@@ -0,0 +1,50 @@
+import os
+
+from utils.locanto_scraper.config import SCRAPE_HISTORY_PATH
+from utils.locanto_scraper.scrape_history import ScrapeHistory
+
+
+def test_records_are_shared_and_normalised(tmp_path):
+    path = str(tmp_path / "scrape_history.sqlite")
+    ScrapeHistory(path=path).record_scrape("Data  Scientist", "Gold Coast")
+    history = ScrapeHistory(path=path)
+    record = history.last_scrape("data scientist", "gold coast")
+    assert record is not None
+    assert record.result_count is None
+    history.record_result_count("data scientist", "gold coast", 12)
+    assert history.last_scrape("Data Scientist", "Gold Coast").result_count == 12
+    assert history.last_scrape("data scientist", "sydney") is None
+
+
+def test_only_one_claim_per_ttl(tmp_path):
+    path = str(tmp_path / "scrape_history.sqlite")
+    first_process = ScrapeHistory(path=path)
+    second_process = ScrapeHistory(path=path)
+    assert first_process.claim_stale("nurse", "hobart", ttl_seconds=60)
+    assert not second_process.claim_stale("nurse", "hobart", ttl_seconds=60)
+    assert second_process.claim_stale("nurse", "hobart", ttl_seconds=0)
+
+
+def test_stuck_and_failed_claims_can_be_claimed_again(tmp_path):
+    history = ScrapeHistory(path=str(tmp_path / "scrape_history.sqlite"))
+    assert history.claim_stale("nurse", "hobart", ttl_seconds=60)
+    assert not history.claim_stale("nurse", "hobart", ttl_seconds=60)
+    # a crawl that died without recording its result count
+    assert history.claim_stale(
+        "nurse", "hobart", ttl_seconds=60, claim_timeout_seconds=0
+    )
+    history.record_result_count("nurse", "hobart", 0)
+    assert not history.claim_stale(
+        "nurse", "hobart", ttl_seconds=60, claim_timeout_seconds=0
+    )
+
+    assert history.claim_stale("chef", "perth", ttl_seconds=60)
+    history.release_claim("chef", "perth")
+    assert history.claim_stale("chef", "perth", ttl_seconds=60)
+    history.record_result_count("chef", "perth", 3)
+    history.release_claim("chef", "perth")
+    assert history.last_scrape("chef", "perth").scraped_at > 0
+
+
+def test_default_path_is_absolute():
+    assert os.path.isabs(SCRAPE_HISTORY_PATH)
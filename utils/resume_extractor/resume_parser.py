@@ -6,16 +6,23 @@ from docling.document_converter import DocumentConverter
 
 from prompts.system_prompts import system_prompt_to_extract_resume_details
 from prompts.user_prompts import user_prompt_to_extract_resume_details
+from utils.llm_client.config import INTERACTIVE_PRIORITY
 from utils.llm_client.llm_interaction import LLMInteraction
+from utils.skill_vocabulary.skill_vocabulary import SkillVocabulary
 
 
 class CVParser:
-    def __init__(self):
-        self.converter = DocumentConverter()
+    def __init__(
+        self,
+        llm_client: LLMInteraction = None,
+        converter: DocumentConverter = None,
+    ):
+        self.converter = converter or DocumentConverter()
         self.resume_uploaded = False
         self.parsed_uploaded_resume = False
         self.resume_in_text = None
-        self.llm = LLMInteraction()
+        self.llm = llm_client or LLMInteraction()
+        self.skill_vocabulary = SkillVocabulary()
 
     def parse_resume(self, resume_pdf: BinaryIO | str):
         """Parses the resume in text format but the syntax would be markdown"""
@@ -42,6 +49,9 @@ class CVParser:
         response = self.llm.ask_llm(
             system_prompt=system_prompt_to_extract_resume_details,
             user_prompt=f"{user_prompt_to_extract_resume_details}{self.resume_in_text}",
+            prompt_name="extract_resume_details",
+            # the user waits on the upload, so it must not queue behind ingestion
+            priority=INTERACTIVE_PRIORITY,
         )
         try:
             cleaned_data = self.clean_extracted_data(response)
@@ -52,35 +62,4 @@ class CVParser:
 
     def clean_extracted_data(self, data: dict) -> dict:
         """Clean and normalize extracted data"""
-        cleaned = {}
-        for key, value in data.items():
-            if isinstance(value, list):
-                cleaned_list = []
-                for item in value:
-                    if item:
-                        string_items = self.flatten_strings(item=item)
-                        for string_item in string_items:
-                            normalized_item = string_item.strip().title()
-                            if normalized_item and normalized_item not in cleaned_list:
-                                cleaned_list.append(normalized_item)
-                cleaned[key] = cleaned_list
-            else:
-                if value is not None and type(value) in [str]:
-                    cleaned[key] = value.strip()
-
-        return cleaned
-
-    def flatten_strings(self, item):
-        """Flatten nested structures and return only strings"""
-        strings = []
-
-        if isinstance(item, str):
-            strings.append(item)
-        elif isinstance(item, list):
-            for sub_item in item:
-                strings.extend(self.flatten_strings(sub_item))
-        elif isinstance(item, dict):
-            for value in item.values():
-                strings.extend(self.flatten_strings(value))
-
-        return strings
+        return self.skill_vocabulary.clean_extracted_data(data)
@@ -0,0 +1,75 @@
+"""
+Canonical skill names and the aliases that map onto them.
+The position of a skill in SKILL_ALIASES is its stable integer ID, so only append new entries.
+"""
+
+SKILL_ALIASES = {
+    "Python": ["python3", "py"],
+    "SQL": ["structured query language"],
+    "Machine Learning": ["ml", "machine-learning"],
+    "Deep Learning": ["dl", "deep-learning"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Large Language Models": ["llm", "llms"],
+    "Data Analysis": ["data analytics", "analytics"],
+    "Data Visualisation": ["data visualization", "visualisation", "visualization"],
+    "Statistics": ["statistical analysis", "stats"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud Platform": ["gcp", "google cloud"],
+    "Microsoft Azure": ["azure"],
+    "Docker": ["docker containers"],
+    "Kubernetes": ["k8s"],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery"],
+    "Git": ["github", "gitlab", "version control"],
+    "JavaScript": ["js", "javascript es6"],
+    "TypeScript": ["ts"],
+    "Java": [],
+    "C++": ["cpp"],
+    "C#": ["c sharp", "csharp"],
+    "React": ["react.js", "reactjs"],
+    "Node.js": ["node", "nodejs"],
+    "Power BI": ["powerbi"],
+    "Tableau": [],
+    "Excel": ["microsoft excel", "ms excel"],
+    "TensorFlow": ["tensorflow2"],
+    "PyTorch": ["torch"],
+    "Scikit-Learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": ["numpy"],
+    "Apache Spark": ["spark", "pyspark"],
+    "Apache Kafka": ["kafka"],
+    "PostgreSQL": ["postgres", "postgresql"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "REST APIs": ["rest", "rest api", "restful apis"],
+    "Linux": ["unix"],
+    "Agile": ["agile methodologies", "scrum"],
+    "Communication": ["communication skills", "verbal communication"],
+    "Teamwork": ["team work", "collaboration", "team player"],
+    "Problem Solving": ["problem-solving", "problem solving skills"],
+    "Leadership": ["team leadership"],
+    "Time Management": [],
+    "Customer Service": ["customer support"],
+    "Attention To Detail": [
+        "attention to detail",
+        "detail oriented",
+        "detail-oriented",
+    ],
+}
+
+# List valued keys, from both job and resume extraction, that hold skills
+SKILL_KEYS = [
+    "required_skills",
+    "preferred_skills",
+    "technologies",
+    "soft_skills",
+    "CORE_SKILLS",
+    "SECONDARY_SKILLS",
+    "SOFT_SKILLS",
+    "TECHNOLOGIES_USED",
+]
+# Payload key holding the union of all skill IDs of a job or resume
+SKILL_IDS_KEY = "skill_ids"
+# Skills missing from SKILL_ALIASES get a hashed ID above this offset
+UNKNOWN_SKILL_ID_OFFSET = 1_000_000
@@ -0,0 +1,119 @@
+import zlib
+from typing import Any, Iterable
+
+from utils.skill_vocabulary.config import (
+    SKILL_ALIASES,
+    SKILL_KEYS,
+    SKILL_IDS_KEY,
+    UNKNOWN_SKILL_ID_OFFSET,
+)
+
+
+class SkillVocabulary:
+    """Maps free text skills onto canonical names and interned integer IDs"""
+
+    def __init__(self, skill_aliases: dict[str, list[str]] = None):
+        skill_aliases = SKILL_ALIASES if skill_aliases is None else skill_aliases
+        self.canonical_by_alias = {}
+        self.ids_by_canonical = {}
+        for skill_id, (canonical, aliases) in enumerate(skill_aliases.items()):
+            self.ids_by_canonical[canonical] = skill_id
+            for alias in [canonical, *aliases]:
+                self.canonical_by_alias[self.alias_key(alias)] = canonical
+
+    @staticmethod
+    def alias_key(text: str) -> str:
+        """Lower cases and collapses whitespace so aliases match loosely"""
+        return " ".join(text.lower().split()).strip(" .,;:")
+
+    def canonical_name(self, skill: str) -> str:
+        """Returns the canonical name of a skill, title-casing unknown skills. Unknown
+        skills are not added to the table, which is shared by long running consumers."""
+        canonical = self.canonical_by_alias.get(self.alias_key(skill))
+        if canonical is None:
+            canonical = skill.strip().title()
+        return canonical
+
+    def skill_id(self, skill: str) -> int:
+        """Returns the interned ID of a skill. IDs are stable across processes."""
+        canonical = self.canonical_name(skill)
+        skill_id = self.ids_by_canonical.get(canonical)
+        if skill_id is None:
+            skill_id = UNKNOWN_SKILL_ID_OFFSET + zlib.crc32(
+                canonical.lower().encode("utf-8")
+            )
+        return skill_id
+
+    def skill_ids(self, skills: Iterable[str]) -> set[int]:
+        return {self.skill_id(skill) for skill in skills if skill and skill.strip()}
+
+    def clean_extracted_data(self, data: dict) -> dict:
+        """Clean and normalize extracted data, adding skill IDs next to skill lists"""
+        cleaned = {}
+        all_skill_ids = set()
+        for key, value in data.items():
+            if isinstance(value, list):
+                cleaned_list = []
+                seen = set()
+                for item in value:
+                    if item:
+                        for string_item in flatten_strings(item=item):
+                            normalized_item = self.canonical_name(string_item)
+                            if normalized_item and normalized_item not in seen:
+                                seen.add(normalized_item)
+                                cleaned_list.append(normalized_item)
+                cleaned[key] = cleaned_list
+                if key in SKILL_KEYS:
+                    key_skill_ids = sorted(self.skill_ids(cleaned_list))
+                    cleaned[skill_ids_key_for(key)] = key_skill_ids
+                    all_skill_ids.update(key_skill_ids)
+            else:
+                if value is not None and type(value) in [str]:
+                    cleaned[key] = value.strip()
+                elif type(value) in [int, float]:
+                    cleaned[key] = value
+        cleaned[SKILL_IDS_KEY] = sorted(all_skill_ids)
+        return cleaned
+
+
+def skill_ids_key_for(key: str) -> str:
+    """Payload key storing the IDs of a skill list, e.g. CORE_SKILLS -> CORE_SKILLS_IDS"""
+    return f"{key}_IDS" if key.isupper() else f"{key}_ids"
+
+
+def flatten_strings(item: Any) -> list[str]:
+    """Flatten nested structures and return only strings"""
+    strings = []
+
+    if isinstance(item, str):
+        strings.append(item)
+    elif isinstance(item, list):
+        for sub_item in item:
+            strings.extend(flatten_strings(sub_item))
+    elif isinstance(item, dict):
+        for value in item.values():
+            strings.extend(flatten_strings(value))
+
+    return strings
+
+
+def compare_skill_ids(
+    candidate_skill_ids: Iterable[int], required_skill_ids: Iterable[int]
+) -> tuple[set[int], set[int]]:
+    """Returns the matched and missing required skill IDs"""
+    candidate_skill_ids = set(candidate_skill_ids)
+    required_skill_ids = set(required_skill_ids)
+    return (
+        required_skill_ids & candidate_skill_ids,
+        required_skill_ids - candidate_skill_ids,
+    )
+
+
+def skill_overlap_score(
+    candidate_skill_ids: Iterable[int], required_skill_ids: Iterable[int]
+) -> float:
+    """Share of the required skills the candidate has, between 0 and 1"""
+    matched, missing = compare_skill_ids(candidate_skill_ids, required_skill_ids)
+    if not matched and not missing:
+        return 0.0
+    return len(matched) / (len(matched) + len(missing))
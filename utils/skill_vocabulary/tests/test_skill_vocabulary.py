@@ -0,0 +1,63 @@
+from utils.skill_vocabulary.config import SKILL_IDS_KEY
+from utils.skill_vocabulary.skill_vocabulary import (
+    SkillVocabulary,
+    compare_skill_ids,
+    skill_overlap_score,
+)
+
+
+def test_aliases_share_canonical_id():
+    vocabulary = SkillVocabulary()
+    assert vocabulary.canonical_name("Ml") == "Machine Learning"
+    assert (
+        vocabulary.skill_id("ML")
+        == vocabulary.skill_id("machine learning")
+        == vocabulary.skill_id("Machine Learning")
+    )
+    assert vocabulary.skill_id("Some Niche Tool") == SkillVocabulary().skill_id(
+        "some niche tool"
+    )
+
+
+def test_unknown_skills_do_not_grow_the_vocabulary():
+    vocabulary = SkillVocabulary()
+    known_aliases = len(vocabulary.canonical_by_alias)
+    known_ids = len(vocabulary.ids_by_canonical)
+    for number in range(100):
+        vocabulary.skill_id(f"niche tool {number}")
+    assert len(vocabulary.canonical_by_alias) == known_aliases
+    assert len(vocabulary.ids_by_canonical) == known_ids
+
+
+def test_clean_extracted_data():
+    vocabulary = SkillVocabulary()
+    cleaned = vocabulary.clean_extracted_data(
+        {
+            "required_skills": ["Ml", "Machine Learning", ["python"], {"a": "AWS"}],
+            "education": ["bachelor's in computer science", None],
+            "experience_level": " 3-5 years ",
+            "salary_range": None,
+        }
+    )
+    assert cleaned["required_skills"] == [
+        "Machine Learning",
+        "Python",
+        "Amazon Web Services",
+    ]
+    assert cleaned["education"] == ["Bachelor'S In Computer Science"]
+    assert cleaned["experience_level"] == "3-5 years"
+    assert "salary_range" not in cleaned
+    assert cleaned["required_skills_ids"] == sorted(
+        vocabulary.skill_ids(cleaned["required_skills"])
+    )
+    assert cleaned[SKILL_IDS_KEY] == cleaned["required_skills_ids"]
+
+
+def test_skill_overlap():
+    vocabulary = SkillVocabulary()
+    resume_ids = vocabulary.skill_ids(["python", "sql"])
+    job_ids = vocabulary.skill_ids(["Python", "aws"])
+    matched, missing = compare_skill_ids(resume_ids, job_ids)
+    assert matched == {vocabulary.skill_id("Python")}
+    assert missing == {vocabulary.skill_id("AWS")}
+    assert skill_overlap_score(resume_ids, job_ids) == 0.5
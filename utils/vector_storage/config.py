@@ -1,3 +1,7 @@
+import os
+
+from utils.skill_vocabulary.config import SKILL_IDS_KEY
+
 QdrantClientServer = "http://qdrant:6333"
 FILTER_CONDITIONS_BY_KEYS = {
     "must": ["url"],
@@ -7,3 +11,65 @@ FILTER_CONDITIONS_BY_KEYS = {
         "company_name",
     ],
 }
+# payload indexes of job collections, added to existing collections missing them
+JOB_PAYLOAD_INDEXES = [
+    ("job_position", "keyword"),
+    ("suburb", "keyword"),
+    (SKILL_IDS_KEY, "integer"),
+    # unix timestamp, filtered and ordered on by recency
+    ("posted_at", "integer"),
+]
+# texts embedded per onnx call when uploading points
+EMBEDDING_BATCH_SIZE = 256
+# Set to a directory to keep text embeddings across re-ingestion, replays and rebuilds
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+# cached texts per model, the dense file holds this many rows
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000
+# cache hits whose last use is written to the index in one transaction
+EMBEDDING_CACHE_LAST_USED_BATCH = 1_000
+
+# COLLECTION PROFILES
+# Storage and index settings a collection is created with. Quantized profiles search the
+# compressed vectors in RAM, then rescore the oversampled candidates with the originals.
+COLLECTION_PROFILES = {
+    # full precision vectors and payload in RAM, qdrant's default index
+    "default": {},
+    "memory-lean": {
+        "quantization": "scalar",
+        "rescore": True,
+        "oversampling": 2.0,
+        "on_disk_vectors": True,
+        "on_disk_payload": True,
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 100,
+        "hnsw_on_disk": True,
+    },
+    "binary": {
+        "quantization": "binary",
+        "rescore": True,
+        "oversampling": 3.0,
+        "on_disk_vectors": True,
+        "on_disk_payload": True,
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 100,
+    },
+    "low-latency": {
+        "quantization": "scalar",
+        "rescore": True,
+        "oversampling": 1.5,
+        "on_disk_vectors": False,
+        "on_disk_payload": False,
+        "hnsw_m": 32,
+        "hnsw_ef_construct": 256,
+    },
+}
+DEFAULT_COLLECTION_PROFILE = os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+# collection name -> profile, for collections not using DEFAULT_COLLECTION_PROFILE
+COLLECTION_PROFILE_BY_NAME = {
+    "parsed_job.topic": os.getenv("JOB_COLLECTION_PROFILE", DEFAULT_COLLECTION_PROFILE),
+}
+
+# CLIENT
+# Talk to qdrant over gRPC (port 6334) instead of JSON over HTTP
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = 6334
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from fastembed.sparse.sparse_embedding_base import SparseEmbedding
+
+from utils.vector_storage.config import (
+    EMBEDDING_CACHE_LAST_USED_BATCH,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def row_key(text_hash: str) -> int:
+    """Non-zero int64 written next to a dense row, naming the text it holds"""
+    return int(text_hash[:15], 16) + 1
+
+
+class EmbeddingCache:
+    """Disk cache of text embeddings keyed on (model name, text hash), LRU evicted past
+    max_entries per model. Dense vectors are rows of a memory-mapped .npy file per model
+    with a .keys.npy file naming the text each row holds, sparse vectors are stored as
+    uint32 index and float32 value blobs. The sqlite index lets every process share the
+    same directory.
+
+    Lookups only read the index, so they never wait on sqlite's write lock. Their use
+    is buffered and written in batches, and dense rows are gathered in one copy into the
+    caller's array rather than handed out as views: another process can evict a row and
+    rewrite it in place at any time, so the row keys are checked after the copy instead.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        last_used_batch: int = EMBEDDING_CACHE_LAST_USED_BATCH,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_entries = max_entries
+        self.last_used_batch = last_used_batch
+        self.lock = threading.Lock()
+        self.dense_files: dict[str, tuple[np.memmap, np.memmap]] = {}
+        self.last_used: dict[tuple[str, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(
+            os.path.join(directory, "embeddings.sqlite"),
+            check_same_thread=False,
+            timeout=30,
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (model TEXT, text_hash TEXT, "
+            "slot INTEGER, indices BLOB, vector_values BLOB, last_used REAL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self.db.commit()
+
+    def dense_file(self, model: str, size: int) -> tuple[np.memmap, np.memmap]:
+        """The model's dense rows and the key of the text each row holds"""
+        key = f"{model}:{size}"
+        with self.lock:
+            if key not in self.dense_files:
+                file_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model) + f"-{size}"
+                self.dense_files[key] = (
+                    self.open_rows(f"{file_name}.npy", np.float32, (size,)),
+                    # a missing keys file marks every row unknown, so it is refilled
+                    self.open_rows(f"{file_name}.keys.npy", np.int64, ()),
+                )
+            return self.dense_files[key]
+
+    def open_rows(self, file_name: str, dtype, row_shape: tuple) -> np.memmap:
+        path = os.path.join(self.directory, file_name)
+        if os.path.exists(path):
+            rows = np.load(path, mmap_mode="r+")
+            if rows.shape[0] != self.max_entries:
+                raise ValueError(
+                    f"{path} holds {rows.shape[0]} rows, delete the "
+                    f"cache directory to resize it to {self.max_entries}"
+                )
+            return rows
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=dtype, shape=(self.max_entries, *row_shape)
+        )
+
+    def lookup(self, model: str, hashes: list[str]) -> list[tuple | None]:
+        """Stored (slot, indices, values) per text hash, None for texts not cached"""
+        found = {}
+        with self.lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start : start + 500]
+                rows = self.db.execute(
+                    "SELECT text_hash, slot, indices, vector_values FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({', '.join('?' * len(chunk))})",
+                    [model, *chunk],
+                ).fetchall()
+                found.update({row[0]: row[1:] for row in rows})
+            now = time.time()
+            self.last_used.update({(model, found_hash): now for found_hash in found})
+            flush = len(self.last_used) >= self.last_used_batch
+        if flush:
+            self.flush_last_used()
+        return [found.get(text_hash) for text_hash in hashes]
+
+    def get_dense(
+        self, model: str, size: int, texts: list[str]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Cached vectors as one (texts, size) array and the mask of texts found. Rows
+        of texts not found are zero, for the caller to fill in place. Hits and misses
+        are counted here, once per text, as every upload looks its vectors up once."""
+        dense_file, row_keys = self.dense_file(model=model, size=size)
+        hashes = [text_hash(text) for text in texts]
+        slots = np.array(
+            [
+                entry[0] if entry is not None and entry[0] is not None else -1
+                for entry in self.lookup(model=model, hashes=hashes)
+            ],
+            dtype=np.intp,
+        )
+        vectors = np.take(dense_file, np.maximum(slots, 0), axis=0)
+        # read after the vectors, so a row rewritten during the copy no longer matches
+        keys = np.take(row_keys, np.maximum(slots, 0))
+        found = (slots >= 0) & (keys == [row_key(found_hash) for found_hash in hashes])
+        vectors[~found] = 0
+        with self.lock:
+            self.hits += int(found.sum())
+            self.misses += int((~found).sum())
+        return vectors, found
+
+    def get_sparse(self, model: str, texts: list[str]) -> list[SparseEmbedding | None]:
+        return [
+            (
+                SparseEmbedding(
+                    indices=np.frombuffer(entry[1], dtype=np.uint32),
+                    values=np.frombuffer(entry[2], dtype=np.float32),
+                )
+                if entry is not None and entry[1] is not None
+                else None
+            )
+            for entry in self.lookup(
+                model=model, hashes=[text_hash(text) for text in texts]
+            )
+        ]
+
+    def put_dense(self, model: str, texts: list[str], vectors: np.ndarray):
+        dense_file, row_keys = self.dense_file(model=model, size=vectors.shape[1])
+        with self.lock, self.transaction():
+            self.write_last_used()
+            for text, vector in zip(texts, vectors):
+                slot = self.free_slot(model=model, text_hash=text_hash(text))
+                # cleared first, so readers copying the row meanwhile see a miss
+                row_keys[slot] = 0
+                dense_file[slot] = vector
+                row_keys[slot] = row_key(text_hash(text))
+                self.db.execute(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, NULL, NULL, ?)",
+                    (model, text_hash(text), slot, time.time()),
+                )
+            dense_file.flush()
+            row_keys.flush()
+
+    def put_sparse(self, model: str, texts: list[str], embeddings: list):
+        with self.lock, self.transaction():
+            self.write_last_used()
+            self.db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, NULL, ?, ?, ?)",
+                [
+                    (
+                        model,
+                        text_hash(text),
+                        np.asarray(embedding.indices, dtype=np.uint32).tobytes(),
+                        np.asarray(embedding.values, dtype=np.float32).tobytes(),
+                        time.time(),
+                    )
+                    for text, embedding in zip(texts, embeddings)
+                ],
+            )
+            self.db.execute(
+                "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings "
+                "WHERE model = ? ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (model, self.max_entries),
+            )
+
+    def flush_last_used(self):
+        with self.lock, self.transaction():
+            self.write_last_used()
+
+    def write_last_used(self):
+        """Writes the buffered lookups' last use, before anything is evicted on them"""
+        if self.last_used:
+            self.db.executemany(
+                "UPDATE embeddings SET last_used = MAX(last_used, ?) "
+                "WHERE model = ? AND text_hash = ?",
+                [
+                    (used_at, model, used_hash)
+                    for (model, used_hash), used_at in self.last_used.items()
+                ],
+            )
+            self.last_used.clear()
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding sqlite's lock, so processes never hand out the
+        same slot twice"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.commit()
+
+    def free_slot(self, model: str, text_hash: str) -> int:
+        """Row of the dense file to write a text's vector to: its previous row, the
+        next unused one, or the least recently used one's"""
+        previous = self.db.execute(
+            "SELECT slot FROM embeddings WHERE model = ? AND text_hash = ?",
+            (model, text_hash),
+        ).fetchone()
+        if previous is not None and previous[0] is not None:
+            return previous[0]
+        next_slot = self.db.execute(
+            "SELECT COALESCE(MAX(slot) + 1, 0) FROM embeddings WHERE model = ?",
+            (model,),
+        ).fetchone()[0]
+        if next_slot < self.max_entries:
+            return next_slot
+        rowid, slot = self.db.execute(
+            "SELECT rowid, slot FROM embeddings WHERE model = ? "
+            "ORDER BY last_used LIMIT 1",
+            (model,),
+        ).fetchone()
+        self.db.execute("DELETE FROM embeddings WHERE rowid = ?", (rowid,))
+        return slot
@@ -1,11 +1,61 @@
+import asyncio
 import logging
+import threading
+import time
 import uuid
+import weakref
+from functools import lru_cache
 from typing import Optional, Any
 
+import numpy as np
 from fastembed import SparseTextEmbedding, TextEmbedding
-from qdrant_client import models, QdrantClient
+from qdrant_client import models, AsyncQdrantClient, QdrantClient
 
-from utils.vector_storage.config import QdrantClientServer, FILTER_CONDITIONS_BY_KEYS
+from utils.vector_storage.config import (
+    QdrantClientServer,
+    FILTER_CONDITIONS_BY_KEYS,
+    JOB_PAYLOAD_INDEXES,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_DIR,
+    COLLECTION_PROFILES,
+    DEFAULT_COLLECTION_PROFILE,
+    COLLECTION_PROFILE_BY_NAME,
+    QDRANT_PREFER_GRPC,
+    QDRANT_GRPC_PORT,
+)
+from utils.vector_storage.embedding_cache import EmbeddingCache
+
+# event loop -> (url, prefer_grpc) -> client, async clients cannot be shared across loops
+async_clients = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def shared_client(url: str, prefer_grpc: bool = QDRANT_PREFER_GRPC) -> QdrantClient:
+    """One pooled client per server and process, shared by every QdrantStorage.
+    The url may also be ":memory:" for a local in-memory instance."""
+    return QdrantClient(
+        location=url, prefer_grpc=prefer_grpc, grpc_port=QDRANT_GRPC_PORT
+    )
+
+
+def shared_async_client(
+    url: str, prefer_grpc: bool = QDRANT_PREFER_GRPC
+) -> AsyncQdrantClient:
+    """One pooled async client per server and event loop. Close them with
+    close_async_clients before the loop ends."""
+    clients = async_clients.setdefault(asyncio.get_running_loop(), {})
+    if (url, prefer_grpc) not in clients:
+        clients[(url, prefer_grpc)] = AsyncQdrantClient(
+            location=url, prefer_grpc=prefer_grpc, grpc_port=QDRANT_GRPC_PORT
+        )
+    return clients[(url, prefer_grpc)]
+
+
+async def close_async_clients(url: str | None = None):
+    """Closes the running loop's async clients, only those for url when one is given"""
+    clients = async_clients.get(asyncio.get_running_loop(), {})
+    for key in [key for key in clients if url is None or key[0] == url]:
+        await clients.pop(key).close()
 
 
 class QdrantStorage:
@@ -15,47 +65,213 @@ class QdrantStorage:
         sentence_transformer_model: str = "sentence-transformers/all-MiniLM-L6-v2",
         sparse_embedding_model: str = "Qdrant/bm25",
         client_server: str = QdrantClientServer,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        embedding_cache: EmbeddingCache | None = None,
+        prefer_grpc: bool = QDRANT_PREFER_GRPC,
+        encoder: TextEmbedding | None = None,
+        sparse_encoder: SparseTextEmbedding | None = None,
     ):
-        self.client = QdrantClient(url=client_server)
+        self.client_server = client_server
+        self.prefer_grpc = prefer_grpc
+        self.client = shared_client(url=client_server, prefer_grpc=prefer_grpc)
         self.distance = distance
-        self.encoder = TextEmbedding(sentence_transformer_model)
-        self.sparse_encoder = SparseTextEmbedding(sparse_embedding_model)
+        self.sentence_transformer_model = sentence_transformer_model
+        self.encoder = encoder or TextEmbedding(sentence_transformer_model)
+        self.sparse_embedding_model = sparse_embedding_model
+        self.sparse_encoder = sparse_encoder or SparseTextEmbedding(
+            sparse_embedding_model
+        )
+        self.batch_size = batch_size
+        self.embedding_cache = embedding_cache or (
+            EmbeddingCache(EMBEDDING_CACHE_DIR) if EMBEDDING_CACHE_DIR else None
+        )
+        self._vector_size = None
+        # collection name -> dense vector size, for collections known to exist
+        self.known_collections: dict[str, int] = {}
+        # collection name -> name of the profile it was created with
+        self.profile_names: dict[str, str] = {}
+        self.collections_lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Client for the *_async methods, must be used from inside an event loop"""
+        return shared_async_client(url=self.client_server, prefer_grpc=self.prefer_grpc)
+
+    async def aclose(self):
+        """Closes the running loop's async client for this server"""
+        await close_async_clients(url=self.client_server)
+
+    @property
+    def vector_size(self) -> int:
+        """Dense vector size from the model metadata, embedding a probe text only
+        for custom models fastembed has no metadata for"""
+        if self._vector_size is None:
+            try:
+                self._vector_size = TextEmbedding.get_embedding_size(
+                    self.sentence_transformer_model
+                )
+            except ValueError:
+                self._vector_size = len(
+                    next(iter(self.encoder.passage_embed(["test_embeddings"])))
+                )
+        return self._vector_size
 
     def create_collection(
         self,
         collection_name: str,
         create_indexes: bool = True,
+        profile: str | None = None,
     ):
-        dense_embeddings = list(self.encoder.passage_embed("test_embeddings"))
+        """Creates the collection unless it exists, with the storage and index settings
+        of the given profile, or the one configured for the collection. Only the first
+        call per collection reaches qdrant, later ones are answered from
+        known_collections."""
+        if collection_name in self.known_collections:
+            return
+        with self.collections_lock:
+            if collection_name in self.known_collections:
+                return
+            self.known_collections[collection_name] = self.ensure_collection(
+                collection_name=collection_name,
+                create_indexes=create_indexes,
+                profile=profile,
+            )
+
+    def ensure_collection(
+        self, collection_name: str, create_indexes: bool, profile: str | None = None
+    ) -> int:
+        """Returns the dense vector size of the collection, creating it if needed"""
         check_collection_exists = self.client.collection_exists(
             collection_name=collection_name
         )
         logging.info(f"Collection {collection_name} exists: {check_collection_exists}")
 
-        if not check_collection_exists:
-            logging.info(f"Creating collection {collection_name}")
-            self.client.create_collection(
-                collection_name=collection_name,
-                vectors_config={
-                    "all-MiniLM-L6-v2": models.VectorParams(
-                        size=len(dense_embeddings[0]),
-                        distance=models.Distance.COSINE,
-                    )
-                },
-                sparse_vectors_config={
-                    "bm25": models.SparseVectorParams(
-                        modifier=models.Modifier.IDF,
-                    )
-                },
-            )
+        if check_collection_exists:
+            collection = self.client.get_collection(collection_name=collection_name)
+            vector_size = collection.config.params.vectors["all-MiniLM-L6-v2"].size
+            if vector_size != self.vector_size:
+                logging.warning(
+                    f"Collection {collection_name} holds {vector_size} dimensional "
+                    f"vectors but the encoder produces {self.vector_size}"
+                )
             if create_indexes:
-                job_search_indexes = [
-                    ("job_position", "keyword"),
-                    ("suburb", "keyword"),
-                ]
                 self.create_payload_indexes(
-                    collection_name=collection_name, index_fields=job_search_indexes
+                    collection_name=collection_name,
+                    index_fields=[
+                        (field_name, field_type)
+                        for field_name, field_type in JOB_PAYLOAD_INDEXES
+                        if field_name not in collection.payload_schema
+                    ],
+                )
+            return vector_size
+
+        profile_settings = self.collection_profile(collection_name, profile)
+        logging.info(f"Creating collection {collection_name}")
+        self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config={
+                "all-MiniLM-L6-v2": models.VectorParams(
+                    size=self.vector_size,
+                    distance=models.Distance.COSINE,
+                    on_disk=profile_settings.get("on_disk_vectors"),
                 )
+            },
+            sparse_vectors_config={
+                "bm25": models.SparseVectorParams(
+                    modifier=models.Modifier.IDF,
+                )
+            },
+            on_disk_payload=profile_settings.get("on_disk_payload"),
+            hnsw_config=self.hnsw_config(profile_settings),
+            quantization_config=self.quantization_config(profile_settings),
+        )
+        if create_indexes:
+            self.create_payload_indexes(
+                collection_name=collection_name, index_fields=JOB_PAYLOAD_INDEXES
+            )
+        return self.vector_size
+
+    def collection_profile(
+        self, collection_name: str, profile: str | None = None
+    ) -> dict:
+        if profile is None:
+            profile = self.profile_names.get(
+                collection_name,
+                COLLECTION_PROFILE_BY_NAME.get(
+                    collection_name, DEFAULT_COLLECTION_PROFILE
+                ),
+            )
+        if profile not in COLLECTION_PROFILES:
+            raise ValueError(
+                f"Unknown collection profile {profile}, "
+                f"expected one of {list(COLLECTION_PROFILES)}"
+            )
+        self.profile_names[collection_name] = profile
+        return COLLECTION_PROFILES[profile]
+
+    @staticmethod
+    def hnsw_config(profile_settings: dict) -> models.HnswConfigDiff | None:
+        hnsw_settings = {
+            "m": profile_settings.get("hnsw_m"),
+            "ef_construct": profile_settings.get("hnsw_ef_construct"),
+            "on_disk": profile_settings.get("hnsw_on_disk"),
+        }
+        if all(value is None for value in hnsw_settings.values()):
+            return None
+        return models.HnswConfigDiff(**hnsw_settings)
+
+    @staticmethod
+    def quantization_config(profile_settings: dict):
+        """Quantized copies of the dense vectors, always kept in RAM"""
+        quantization = profile_settings.get("quantization")
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
+    def search_params(self, collection_name: str) -> models.SearchParams | None:
+        """Rescoring and oversampling for the dense search of quantized collections"""
+        profile_settings = self.collection_profile(collection_name)
+        if not profile_settings.get("quantization"):
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=profile_settings.get("rescore"),
+                oversampling=profile_settings.get("oversampling"),
+            )
+        )
+
+    def apply_collection_profile(self, collection_name: str, profile: str):
+        """Moves an existing collection to another profile. Qdrant rebuilds the
+        quantized vectors and index in the background."""
+        self.profile_names.pop(collection_name, None)
+        profile_settings = self.collection_profile(collection_name, profile)
+        self.client.update_collection(
+            collection_name=collection_name,
+            vectors_config={
+                "all-MiniLM-L6-v2": models.VectorParamsDiff(
+                    on_disk=profile_settings.get("on_disk_vectors"),
+                )
+            },
+            collection_params=models.CollectionParamsDiff(
+                on_disk_payload=profile_settings.get("on_disk_payload"),
+            ),
+            hnsw_config=self.hnsw_config(profile_settings),
+            quantization_config=self.quantization_config(profile_settings)
+            or models.Disabled.DISABLED,
+        )
+
+    def forget_collection(self, collection_name: str):
+        """Drops a deleted or recreated collection from known_collections"""
+        with self.collections_lock:
+            self.known_collections.pop(collection_name, None)
 
     def upload_points(
         self,
@@ -72,6 +288,25 @@ class QdrantStorage:
             points=vectorised_points,
         )
 
+    async def upload_points_async(
+        self,
+        points: list[dict],
+        key_to_encode: str,
+        collection_name: str,
+        given_ids: list = None,
+    ):
+        """upload_points for event loops, embedding on a worker thread"""
+        vectorised_points = await asyncio.to_thread(
+            self.structure_points,
+            points=points,
+            key_to_encode=key_to_encode,
+            given_ids=given_ids,
+        )
+        await self.async_client.upsert(
+            collection_name=collection_name,
+            points=vectorised_points,
+        )
+
     def structure_points(
         self,
         points: list[dict],
@@ -84,38 +319,144 @@ class QdrantStorage:
             else [str(uuid.uuid4()) for _ in points]
         )
         payloads = self.get_payloads(points=points)
+        dense_embeddings, sparse_embeddings = self.embed_passages(
+            [point[key_to_encode] for point in points]
+        )
         structured_points = []
-        for i, point in enumerate(points):
-            vector_encoded_point = list(
-                self.encoder.passage_embed(point[key_to_encode])
-            )
-            sparse_embeddings = list(
-                self.sparse_encoder.passage_embed(point[key_to_encode])
-            )
+        for i, (dense_embedding, sparse_embedding) in enumerate(
+            zip(dense_embeddings, sparse_embeddings)
+        ):
             updated_point = models.PointStruct(
                 id=ids[i],
                 vector={
-                    "all-MiniLM-L6-v2": vector_encoded_point[0].tolist(),
-                    "bm25": sparse_embeddings[0].as_object(),
+                    "all-MiniLM-L6-v2": dense_embedding,
+                    "bm25": sparse_embedding,
                 },
                 payload=payloads[i],
             )
             structured_points.append(updated_point)
         return structured_points
 
+    def embed_passages(
+        self, texts: list[str]
+    ) -> tuple[list[list[float]], list[models.SparseVector]]:
+        """Dense and sparse embeddings of all the texts, one batched call per encoder.
+        Each encoder's vectors become Python numbers in one go, not per text."""
+        if not texts:
+            return [], []
+        dense_embeddings = self.embed_dense_passages(texts)
+        sparse_embeddings = self.embed_sparse_passages(texts)
+        return dense_embeddings.tolist(), self.sparse_vectors(sparse_embeddings)
+
+    @staticmethod
+    def sparse_vectors(embeddings: list) -> list[models.SparseVector]:
+        """Concatenates the embeddings to convert them once, then splits them per text"""
+        offsets = np.cumsum([0, *(len(embedding.indices) for embedding in embeddings)])
+        indices = np.concatenate([embedding.indices for embedding in embeddings])
+        values = np.concatenate([embedding.values for embedding in embeddings])
+        indices, values = indices.tolist(), values.tolist()
+        return [
+            models.SparseVector(indices=indices[start:end], values=values[start:end])
+            for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+        ]
+
+    def embed_dense_passages(self, texts: list[str]) -> np.ndarray:
+        """Embeds only the texts missing from the embedding cache, when there is one"""
+        if self.embedding_cache is None:
+            return np.stack(
+                list(self.encoder.passage_embed(texts, batch_size=self.batch_size))
+            )
+        vectors, cached = self.embedding_cache.get_dense(
+            model=self.sentence_transformer_model, size=self.vector_size, texts=texts
+        )
+        missing = np.flatnonzero(~cached)
+        if len(missing):
+            missing_texts = [texts[i] for i in missing]
+            embedded = np.stack(
+                list(
+                    self.encoder.passage_embed(
+                        missing_texts, batch_size=self.batch_size
+                    )
+                )
+            )
+            self.embedding_cache.put_dense(
+                model=self.sentence_transformer_model,
+                texts=missing_texts,
+                vectors=embedded,
+            )
+            vectors[missing] = embedded
+        return vectors
+
+    def embed_sparse_passages(self, texts: list[str]) -> list:
+        if self.embedding_cache is None:
+            return list(
+                self.sparse_encoder.passage_embed(texts, batch_size=self.batch_size)
+            )
+        embeddings = self.embedding_cache.get_sparse(
+            model=self.sparse_embedding_model, texts=texts
+        )
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            embedded = list(
+                self.sparse_encoder.passage_embed(
+                    missing_texts, batch_size=self.batch_size
+                )
+            )
+            self.embedding_cache.put_sparse(
+                model=self.sparse_embedding_model,
+                texts=missing_texts,
+                embeddings=embedded,
+            )
+            for i, embedding in zip(missing, embedded):
+                embeddings[i] = embedding
+        return embeddings
+
     def retrieve_docs_based_on_query(
         self,
         collection_name: str,
         query: str,
-        filter: Optional[dict[str:dict]] = None,
+        filter: Optional[dict[str, dict]] = None,
+        limit: int = 3,
+    ):
+        return self.client.query_points(
+            **self.hybrid_query(
+                collection_name=collection_name, query=query, filter=filter, limit=limit
+            )
+        ).points
+
+    async def retrieve_docs_based_on_query_async(
+        self,
+        collection_name: str,
+        query: str,
+        filter: Optional[dict[str, dict]] = None,
         limit: int = 3,
     ):
+        query_arguments = await asyncio.to_thread(
+            self.hybrid_query,
+            collection_name=collection_name,
+            query=query,
+            filter=filter,
+            limit=limit,
+        )
+        response = await self.async_client.query_points(**query_arguments)
+        return response.points
+
+    def hybrid_query(
+        self,
+        collection_name: str,
+        query: str,
+        filter: Optional[dict[str, dict]] = None,
+        limit: int = 3,
+    ) -> dict:
+        """query_points arguments fusing dense and sparse searches for the query"""
         dense_query_vector = next(self.encoder.query_embed(query))
         sparse_query_vector = next(self.sparse_encoder.query_embed(query))
         prefetch = [
             models.Prefetch(
                 query=dense_query_vector,
                 using="all-MiniLM-L6-v2",
+                params=self.search_params(collection_name),
                 limit=limit,
             ),
             models.Prefetch(
@@ -125,17 +466,16 @@ class QdrantStorage:
             ),
         ]
         if not filter:
-            hits = self.client.query_points(
+            return dict(
                 collection_name=collection_name,
                 prefetch=prefetch,
                 query=models.FusionQuery(
                     fusion=models.Fusion.RRF,
                 ),
                 limit=limit,
-            ).points
-            return hits
+            )
         must_filter = self.create_filters(filter)
-        hits = self.client.query_points(
+        return dict(
             collection_name=collection_name,
             prefetch=prefetch,
             query=models.FusionQuery(
@@ -144,8 +484,109 @@ class QdrantStorage:
             query_filter=models.Filter(must=must_filter),
             limit=limit,
             using="all-MiniLM-L6-v2",
+        )
+
+    def retrieve_point(
+        self, collection_name: str, point_id: str, with_vectors: bool = True
+    ) -> models.Record | None:
+        """A stored point with its vectors, so it can be searched with without re-embedding"""
+        points = self.client.retrieve(
+            collection_name=collection_name,
+            ids=[point_id],
+            with_payload=True,
+            with_vectors=with_vectors,
+        )
+        return points[0] if points else None
+
+    def update_payload(self, collection_name: str, point_id: str, payload: dict):
+        """Overwrites the given payload keys of a stored point, keeping its vectors"""
+        self.client.set_payload(
+            collection_name=collection_name, payload=payload, points=[point_id]
+        )
+
+    async def retrieve_point_async(
+        self, collection_name: str, point_id: str
+    ) -> models.Record | None:
+        points = await self.async_client.retrieve(
+            collection_name=collection_name,
+            ids=[point_id],
+            with_payload=True,
+            with_vectors=True,
+        )
+        return points[0] if points else None
+
+    def retrieve_docs_similar_to_point(
+        self,
+        collection_name: str,
+        point: models.Record,
+        query_filter: Optional[models.Filter] = None,
+        limit: int = 3,
+    ):
+        """Hybrid search reusing the dense and sparse vectors stored with a point"""
+        return self.client.query_points(
+            **self.similar_to_point_query(
+                collection_name=collection_name,
+                point=point,
+                query_filter=query_filter,
+                limit=limit,
+            )
         ).points
-        return hits
+
+    async def retrieve_docs_similar_to_point_async(
+        self,
+        collection_name: str,
+        point: models.Record,
+        query_filter: Optional[models.Filter] = None,
+        limit: int = 3,
+    ):
+        response = await self.async_client.query_points(
+            **self.similar_to_point_query(
+                collection_name=collection_name,
+                point=point,
+                query_filter=query_filter,
+                limit=limit,
+            )
+        )
+        return response.points
+
+    def similar_to_point_query(
+        self,
+        collection_name: str,
+        point: models.Record,
+        query_filter: Optional[models.Filter] = None,
+        limit: int = 3,
+    ) -> dict:
+        sparse_vector = point.vector["bm25"]
+        if isinstance(sparse_vector, dict):
+            sparse_vector = models.SparseVector(**sparse_vector)
+        prefetch = [
+            models.Prefetch(
+                query=point.vector["all-MiniLM-L6-v2"],
+                using="all-MiniLM-L6-v2",
+                filter=query_filter,
+                params=self.search_params(collection_name),
+                limit=limit,
+            ),
+            models.Prefetch(
+                query=sparse_vector,
+                using="bm25",
+                filter=query_filter,
+                limit=limit,
+            ),
+        ]
+        return dict(
+            collection_name=collection_name,
+            prefetch=prefetch,
+            query=models.FusionQuery(
+                fusion=models.Fusion.RRF,
+            ),
+            limit=limit,
+        )
+
+    @staticmethod
+    def point_id_for_url(url: str) -> str:
+        """Deterministic point id, so a document uploaded again overwrites its point"""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, url))
 
     @staticmethod
     def get_payloads(points: list[dict]) -> list[dict]:
@@ -172,7 +613,7 @@ class QdrantStorage:
                 logging.warning(f"Failed to create index for field '{field_name}': {e}")
 
     @staticmethod
-    def create_filters(filters: Optional[dict[str:dict]]):
+    def create_filters(filters: Optional[dict[str, dict]]):
         if "must" in filters:
             must_filters = []
             for key, value in filters["must"].items():
@@ -207,6 +648,83 @@ class QdrantStorage:
             combined_filters[filter_type] = filter_list
         return combined_filters
 
+    def retrieve_payloads_based_on_text_match(
+        self,
+        collection_name: str,
+        text_filters: dict[str, str],
+        limit: int = 50,
+        query_filter: Optional[models.Filter] = None,
+        order_by: Optional[str] = None,
+    ) -> list[dict]:
+        """Payloads of the points whose fields contain all the given texts and that
+        match query_filter, without vector search. Points are in id order unless
+        order_by names an indexed numeric key, whose largest values come first."""
+        points, _ = self.client.scroll(
+            collection_name=collection_name,
+            scroll_filter=self.create_text_match_filter(text_filters, query_filter),
+            order_by=self.descending(order_by),
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [point.payload for point in points]
+
+    async def retrieve_payloads_based_on_text_match_async(
+        self,
+        collection_name: str,
+        text_filters: dict[str, str],
+        limit: int = 50,
+        query_filter: Optional[models.Filter] = None,
+        order_by: Optional[str] = None,
+    ) -> list[dict]:
+        points, _ = await self.async_client.scroll(
+            collection_name=collection_name,
+            scroll_filter=self.create_text_match_filter(text_filters, query_filter),
+            order_by=self.descending(order_by),
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [point.payload for point in points]
+
+    @staticmethod
+    def descending(key: Optional[str]) -> models.OrderBy | None:
+        if key is None:
+            return None
+        return models.OrderBy(key=key, direction=models.Direction.DESC)
+
+    @staticmethod
+    def create_text_match_filter(
+        text_filters: dict[str, str], query_filter: Optional[models.Filter] = None
+    ) -> models.Filter:
+        must = [
+            models.FieldCondition(key=key, match=models.MatchText(text=value))
+            for key, value in text_filters.items()
+            if value
+        ]
+        if query_filter is not None:
+            must.append(query_filter)
+        return models.Filter(must=must)
+
+    @staticmethod
+    def create_location_and_recency_filter(
+        location: Optional[str], max_age_seconds: float
+    ) -> models.Filter:
+        """Jobs posted within max_age_seconds, in location when one is given"""
+        must = [
+            models.FieldCondition(
+                key="posted_at",
+                range=models.Range(gte=int(time.time() - max_age_seconds)),
+            )
+        ]
+        if location:
+            must.append(
+                models.FieldCondition(
+                    key="suburb", match=models.MatchText(text=location)
+                )
+            )
+        return models.Filter(must=must)
+
     def encode_sparse(self, text: str):
         """
         Encode text into sparse vector using SentenceTransformers
@@ -217,9 +735,23 @@ class QdrantStorage:
     def retrieve_docs_based_on_keyword_filters(
         self,
         collection_name: str,
-        keyword_filters: dict[str:dict],
+        keyword_filters: dict[str, dict],
         limit: int = 3,
     ) -> str:
+        result = self.retrieve_points_based_on_keyword_filters(
+            collection_name=collection_name,
+            keyword_filters=keyword_filters,
+            limit=limit,
+        )
+        interested_job_description = result[0].payload.get("description")
+        return interested_job_description
+
+    def retrieve_points_based_on_keyword_filters(
+        self,
+        collection_name: str,
+        keyword_filters: dict[str, dict],
+        limit: int = 3,
+    ) -> list[models.Record]:
         filters = self.create_filters_by_must_should_keywords(keyword_filters)
         result = self.client.scroll(
             collection_name=collection_name,
@@ -229,5 +761,4 @@ class QdrantStorage:
             ),
             limit=limit,
         )
-        interested_job_description = result[0][0].payload.get("description")
-        return interested_job_description
+        return result[0]
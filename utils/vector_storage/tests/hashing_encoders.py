@@ -0,0 +1,32 @@
+import zlib
+
+import numpy as np
+from fastembed.sparse.sparse_embedding_base import SparseEmbedding
+
+
+class HashingEncoder:
+    """Stands in for the fastembed models so tests run without model downloads"""
+
+    def __init__(self):
+        self.passage_embed_calls = 0
+
+    def passage_embed(self, texts: list[str], **kwargs):
+        self.passage_embed_calls += 1
+        return (self.embed(text) for text in texts)
+
+    def query_embed(self, text: str, **kwargs):
+        return iter([self.embed(text)])
+
+
+class DenseEncoder(HashingEncoder):
+    def embed(self, text: str):
+        vector = np.zeros(384, dtype=np.float32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % 384] += 1
+        return vector
+
+
+class SparseEncoder(HashingEncoder):
+    def embed(self, text: str):
+        indices = sorted({zlib.crc32(word.encode()) for word in text.lower().split()})
+        return SparseEmbedding(values=np.ones(len(indices)), indices=np.array(indices))
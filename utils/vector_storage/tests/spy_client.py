@@ -0,0 +1,22 @@
+from collections import Counter
+
+
+class SpyClient:
+    """Wraps a qdrant client, counting and recording the calls made through it"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = Counter()
+        self.arguments = {}
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            self.arguments[name] = kwargs
+            return attribute(*args, **kwargs)
+
+        return call
@@ -0,0 +1,46 @@
+import asyncio
+
+from qdrant_client import models
+
+from utils.vector_storage.qdrant_storage import QdrantStorage, async_clients
+from utils.vector_storage.tests.hashing_encoders import DenseEncoder, SparseEncoder
+
+
+def test_async_upload_and_retrieval_against_in_memory_qdrant():
+    storage = QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+    )
+    jobs = [
+        {"job_position": "nurse", "suburb": "hobart", "description": "aged care nurse"},
+        {"job_position": "chef", "suburb": "perth", "description": "head chef kitchen"},
+    ]
+
+    async def upload_and_search():
+        await storage.async_client.create_collection(
+            collection_name="jobs",
+            vectors_config={
+                "all-MiniLM-L6-v2": models.VectorParams(
+                    size=384, distance=models.Distance.COSINE
+                )
+            },
+            sparse_vectors_config={"bm25": models.SparseVectorParams()},
+        )
+        await storage.upload_points_async(
+            points=jobs, key_to_encode="description", collection_name="jobs"
+        )
+        hits = await storage.retrieve_docs_based_on_query_async(
+            collection_name="jobs", query="head chef", limit=1
+        )
+        payloads = await storage.retrieve_payloads_based_on_text_match_async(
+            collection_name="jobs", text_filters={"suburb": "hobart"}
+        )
+        await storage.aclose()
+        assert not async_clients[asyncio.get_running_loop()]
+        return hits, payloads
+
+    hits, payloads = asyncio.run(upload_and_search())
+    assert hits[0].payload["job_position"] == "chef"
+    assert [payload["job_position"] for payload in payloads] == ["nurse"]
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from qdrant_client import models
+
+from utils.vector_storage.config import COLLECTION_PROFILES
+from utils.vector_storage.qdrant_storage import QdrantStorage
+from utils.vector_storage.tests.test_collection_setup import make_storage
+
+
+def test_default_profile_keeps_qdrant_defaults():
+    assert QdrantStorage.hnsw_config(COLLECTION_PROFILES["default"]) is None
+    assert QdrantStorage.quantization_config(COLLECTION_PROFILES["default"]) is None
+
+
+def test_memory_lean_profile_quantizes_and_tunes_the_index():
+    settings = COLLECTION_PROFILES["memory-lean"]
+    quantization = QdrantStorage.quantization_config(settings)
+    assert isinstance(quantization, models.ScalarQuantization)
+    assert quantization.scalar.always_ram
+    hnsw = QdrantStorage.hnsw_config(settings)
+    assert (hnsw.m, hnsw.ef_construct, hnsw.on_disk) == (16, 100, True)
+    assert isinstance(
+        QdrantStorage.quantization_config(COLLECTION_PROFILES["binary"]),
+        models.BinaryQuantization,
+    )
+
+
+def test_collection_is_created_with_its_profile_and_searched_with_rescoring():
+    collection_name = f"jobs{uuid.uuid4()}"
+    storage = make_storage()
+    storage.create_collection(collection_name=collection_name, profile="memory-lean")
+    created = storage.client.arguments["create_collection"]
+    assert created["vectors_config"]["all-MiniLM-L6-v2"].on_disk
+    assert created["on_disk_payload"]
+    assert created["hnsw_config"].m == 16
+    assert isinstance(created["quantization_config"], models.ScalarQuantization)
+
+    storage.upload_points(
+        points=[{"description": text} for text in ["python developer", "chef"]],
+        key_to_encode="description",
+        collection_name=collection_name,
+    )
+    query = storage.hybrid_query(collection_name=collection_name, query="chef")
+    dense_prefetch = query["prefetch"][0]
+    assert dense_prefetch.params.quantization.rescore
+    assert dense_prefetch.params.quantization.oversampling == 2.0
+    points = storage.retrieve_docs_based_on_query(
+        collection_name=collection_name, query="chef", limit=1
+    )
+    assert points[0].payload["description"] == "chef"
+
+
+def test_applying_another_profile_updates_the_collection_and_its_searches():
+    collection_name = f"jobs{uuid.uuid4()}"
+    storage = make_storage()
+    storage.create_collection(collection_name=collection_name, profile="low-latency")
+    storage.apply_collection_profile(collection_name=collection_name, profile="default")
+    updated = storage.client.arguments["update_collection"]
+    assert updated["quantization_config"] == models.Disabled.DISABLED
+    assert updated["hnsw_config"] is None
+    query = storage.hybrid_query(collection_name=collection_name, query="chef")
+    assert query["prefetch"][0].params is None
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match="Unknown collection profile"):
+        make_storage().create_collection(
+            collection_name=f"jobs{uuid.uuid4()}", profile="tiny"
+        )
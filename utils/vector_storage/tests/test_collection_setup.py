@@ -0,0 +1,42 @@
+import uuid
+
+from utils.vector_storage.qdrant_storage import QdrantStorage
+from utils.vector_storage.tests.hashing_encoders import DenseEncoder, SparseEncoder
+from utils.vector_storage.tests.spy_client import SpyClient
+
+
+def make_storage() -> QdrantStorage:
+    storage = QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+    )
+    storage.client = SpyClient(storage.client)
+    return storage
+
+
+def test_collection_is_probed_once_and_sized_from_model_metadata():
+    collection_name = f"jobs{uuid.uuid4()}"
+    storage = make_storage()
+    for _ in range(3):
+        storage.create_collection(collection_name=collection_name)
+    assert storage.client.calls["collection_exists"] == 1
+    assert storage.client.calls["create_collection"] == 1
+    assert storage.known_collections == {collection_name: 384}
+    assert storage.encoder.passage_embed_calls == 0
+
+
+def test_existing_collection_is_sized_from_its_config():
+    collection_name = f"jobs{uuid.uuid4()}"
+    make_storage().create_collection(collection_name=collection_name)
+    storage = make_storage()
+    storage.create_collection(collection_name=collection_name)
+    storage.upload_points(
+        points=[{"description": "python developer"}],
+        key_to_encode="description",
+        collection_name=collection_name,
+    )
+    assert storage.client.calls["create_collection"] == 0
+    assert storage.known_collections == {collection_name: 384}
+    assert storage.encoder.passage_embed_calls == 1
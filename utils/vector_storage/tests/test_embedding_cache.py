@@ -0,0 +1,94 @@
+import os
+import sqlite3
+
+import numpy as np
+from fastembed.sparse.sparse_embedding_base import SparseEmbedding
+
+from utils.vector_storage.embedding_cache import EmbeddingCache
+
+
+def test_dense_vectors_are_read_from_the_shared_files(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=4)
+    vectors = np.arange(6, dtype=np.float32).reshape(2, 3)
+    cache.put_dense(model="dense", texts=["a", "b"], vectors=vectors)
+    cached, found = EmbeddingCache(str(tmp_path), max_entries=4).get_dense(
+        model="dense", size=3, texts=["b", "c", "a"]
+    )
+    assert found.tolist() == [True, False, True]
+    assert cached.tolist() == [vectors[1].tolist(), [0, 0, 0], vectors[0].tolist()]
+
+
+def test_cached_vectors_survive_eviction_of_their_row(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=1)
+    cache.put_dense(model="dense", texts=["a"], vectors=np.ones((1, 3)))
+    cached, _ = cache.get_dense(model="dense", size=3, texts=["a"])
+    cache.put_dense(model="dense", texts=["b"], vectors=np.full((1, 3), 5.0))
+    assert cached.tolist() == [[1, 1, 1]]
+    assert cache.get_sparse(model="dense", texts=["a"]) == [None]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_rows_rewritten_during_a_lookup_are_misses(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=2)
+    cache.put_dense(model="dense", texts=["a", "b"], vectors=np.eye(2, 3))
+    _, row_keys = cache.dense_file(model="dense", size=3)
+    # another process half way through overwriting a's row
+    row_keys[0] = 0
+    _, found = cache.get_dense(model="dense", size=3, texts=["a", "b"])
+    assert found.tolist() == [False, True]
+
+
+def test_lookups_do_not_wait_for_the_write_lock(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=2)
+    cache.put_dense(model="dense", texts=["a"], vectors=np.ones((1, 3)))
+    writer = sqlite3.connect(os.path.join(tmp_path, "embeddings.sqlite"))
+    writer.execute("BEGIN IMMEDIATE")
+    cache.db.execute("PRAGMA busy_timeout = 0")
+    try:
+        _, found = cache.get_dense(model="dense", size=3, texts=["a"])
+    finally:
+        writer.rollback()
+    assert found.tolist() == [True]
+    assert cache.last_used
+
+
+def test_least_recently_used_dense_vector_is_evicted(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=2)
+    cache.put_dense(model="dense", texts=["a", "b"], vectors=np.eye(2, 3))
+    cache.get_dense(model="dense", size=3, texts=["a"])
+    cache.put_dense(model="dense", texts=["c"], vectors=np.full((1, 3), 7.0))
+    cached, found = cache.get_dense(model="dense", size=3, texts=["a", "b", "c"])
+    assert found.tolist() == [True, False, True]
+    assert cached[0].tolist() == [1, 0, 0]
+    assert cached[2].tolist() == [7, 7, 7]
+
+
+def test_last_use_is_written_in_batches(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=4, last_used_batch=2)
+    cache.put_dense(model="dense", texts=["a", "b"], vectors=np.eye(2, 3))
+    cache.db.execute("UPDATE embeddings SET last_used = 0")
+    cache.db.commit()
+    cache.get_dense(model="dense", size=3, texts=["a"])
+    assert len(cache.last_used) == 1
+    cache.get_dense(model="dense", size=3, texts=["b"])
+    assert cache.last_used == {}
+    last_used = cache.db.execute("SELECT MIN(last_used) FROM embeddings").fetchone()
+    assert last_used[0] > 0
+
+
+def test_sparse_vectors_round_trip(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=1)
+    cache.put_sparse(
+        model="sparse",
+        texts=["a", "b"],
+        embeddings=[
+            SparseEmbedding(values=np.array([0.5]), indices=np.array([3])),
+            SparseEmbedding(
+                values=np.array([1.5, 2.5]), indices=np.array([1, 2**32 - 1])
+            ),
+        ],
+    )
+    a, b = cache.get_sparse(model="sparse", texts=["a", "b"])
+    assert a is None
+    assert b.indices.tolist() == [1, 2**32 - 1]
+    assert b.values.tolist() == [1.5, 2.5]
@@ -0,0 +1,42 @@
+from utils.vector_storage.embedding_cache import EmbeddingCache
+from utils.vector_storage.qdrant_storage import QdrantStorage
+from utils.vector_storage.tests.hashing_encoders import DenseEncoder, SparseEncoder
+
+DESCRIPTIONS = ["python developer", "registered nurse in hobart", "", "chef"]
+
+
+def make_storage(embedding_cache=None) -> QdrantStorage:
+    return QdrantStorage(
+        client_server=":memory:",
+        prefer_grpc=False,
+        encoder=DenseEncoder(),
+        sparse_encoder=SparseEncoder(),
+        embedding_cache=embedding_cache,
+    )
+
+
+def test_points_are_embedded_in_one_batch_per_encoder():
+    storage = make_storage()
+    points = storage.structure_points(
+        points=[{"description": text} for text in DESCRIPTIONS],
+        key_to_encode="description",
+        given_ids=list(range(len(DESCRIPTIONS))),
+    )
+    assert storage.encoder.passage_embed_calls == 1
+    assert storage.sparse_encoder.passage_embed_calls == 1
+    for point, text in zip(points, DESCRIPTIONS):
+        sparse_embedding = storage.sparse_encoder.embed(text)
+        assert point.vector["bm25"].indices == sparse_embedding.indices.tolist()
+        assert point.vector["bm25"].values == sparse_embedding.values.tolist()
+        assert point.vector["all-MiniLM-L6-v2"] == storage.encoder.embed(text).tolist()
+
+
+def test_cached_points_match_freshly_embedded_ones(tmp_path):
+    storage = make_storage(embedding_cache=EmbeddingCache(str(tmp_path)))
+    points = [{"description": text} for text in DESCRIPTIONS]
+    storage.structure_points(points=points[:2], key_to_encode="description")
+    embedded = storage.structure_points(points=points, key_to_encode="description")
+    assert storage.encoder.passage_embed_calls == 2
+    assert storage.embedding_cache.hits == 2
+    fresh = make_storage().structure_points(points=points, key_to_encode="description")
+    assert [point.vector for point in embedded] == [point.vector for point in fresh]